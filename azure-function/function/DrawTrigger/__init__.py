@@ -12,6 +12,17 @@ import cloudnetdraw.azure_client as azure_client
 from cloudnetdraw.config import Config
 from cloudnetdraw.diagram_generator import generate_mld_diagram, generate_hld_diagram
 
+# Default configuration, loaded on first use and reused by later invocations on a warm worker
+_config = None
+
+
+def _get_config() -> Config:
+    """Return the default configuration, loading it on first use."""
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
+
 
 def main(mytimer: func.TimerRequest) -> None:
     """Azure Function entrypoint for generating network diagrams.
@@ -67,7 +78,7 @@ def main(mytimer: func.TimerRequest) -> None:
     diagram_file_path_hld = f"/tmp/{diagram_file_name_hld}"
 
     # Load default configuration for diagram styling and thresholds
-    config = Config()
+    config = _get_config()
 
     # Generate diagrams using CloudNetDraw
     try:
@@ -11,6 +11,7 @@ import logging
 import sys
 import os
 import re
+from itertools import chain
 
 # Global credentials
 _credentials: Optional[Union[ClientSecretCredential, AzureCliCredential]] = None
@@ -46,12 +47,15 @@ def get_credentials() -> Union[ClientSecretCredential, AzureCliCredential]:
     return _credentials
 
 
+# Azure subscription ID pattern: 8-4-4-4-12 hexadecimal digits
+_UUID_RE = re.compile(r'\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z')
+
+
 def is_subscription_id(subscription_string: str) -> bool:
     """Check if a subscription string is in UUID format (ID) or name format"""
     if subscription_string is None:
         return False
-    uuid_pattern = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
-    return re.match(uuid_pattern, subscription_string) is not None
+    return _UUID_RE.match(subscription_string) is not None
 
 
 def read_subscriptions_from_file(file_path: str) -> List[str]:
@@ -645,18 +649,22 @@ def query_command(args: argparse.Namespace) -> None:
             sys.exit(1)
 
         all_subscriptions = set()
+        subscription_names = []
         for vnet_identifier in vnet_identifiers:
             try:
                 subscription_id, resource_group, vnet_name = parse_vnet_identifier(vnet_identifier)
                 if is_subscription_id(subscription_id):
                     all_subscriptions.add(subscription_id)
-                else:
-                    resolved_subs = resolve_subscription_names_to_ids([subscription_id])
-                    all_subscriptions.update(resolved_subs)
+                elif subscription_id not in subscription_names:
+                    subscription_names.append(subscription_id)
             except ValueError as e:
                 logging.error(f"Invalid VNet identifier format '{vnet_identifier}': {e}")
                 sys.exit(1)
 
+        # Resolve all subscription names with a single subscription listing
+        if subscription_names:
+            all_subscriptions.update(resolve_subscription_names_to_ids(subscription_names))
+
         selected_subscriptions = list(all_subscriptions)
         logging.info(f"Filtering topology for hub VNets: {args.vnets}")
         topology = get_filtered_vnets_topology(vnet_identifiers, selected_subscriptions)
@@ -797,6 +805,15 @@ def generate_hierarchical_id(vnet_data: Dict[str, Any], element_type: str, suffi
             return f"{base_id}.{element_type}"
 
 
+def _main_id(vnet_data: Dict[str, Any]) -> str:
+    """Return the hierarchical 'main' ID for a VNet, memoized on the VNet dict"""
+    main_id = vnet_data.get('_main_id')
+    if main_id is None:
+        main_id = generate_hierarchical_id(vnet_data, 'main')
+        vnet_data['_main_id'] = main_id
+    return main_id
+
+
 def create_vnet_id_mapping(vnets: List[Dict[str, Any]], zones: List[Dict[str, Any]], all_non_peered: List[Dict[str, Any]]) -> Dict[str, str]:
     """Create bidirectional mapping between VNet resource IDs and diagram IDs for multi-zone layout"""
     mapping: Dict[str, str] = {}
@@ -809,19 +826,19 @@ def create_vnet_id_mapping(vnets: List[Dict[str, Any]], zones: List[Dict[str, An
     if has_azure_metadata:
         for zone in zones:
             if 'resource_id' in zone['hub']:
-                main_id = generate_hierarchical_id(zone['hub'], 'main')
+                main_id = _main_id(zone['hub'])
                 mapping[zone['hub']['resource_id']] = main_id
 
         for zone_index, zone in enumerate(zones):
             peered_spokes = zone['spokes']
             for spoke in peered_spokes:
                 if 'resource_id' in spoke:
-                    main_id = generate_hierarchical_id(spoke, 'main')
+                    main_id = _main_id(spoke)
                     mapping[spoke['resource_id']] = main_id
 
         for nonpeered in all_non_peered:
             if 'resource_id' in nonpeered:
-                main_id = generate_hierarchical_id(nonpeered, 'main')
+                main_id = _main_id(nonpeered)
                 mapping[nonpeered['resource_id']] = main_id
     else:
         for zone in zones:
@@ -872,12 +889,30 @@ def _load_and_validate_topology(topology_file: str) -> List[Dict[str, Any]]:
         logging.error("No VNets found in topology file. Cannot generate diagram.")
         sys.exit(1)
 
+    _intern_resource_ids(vnets)
+
     return vnets
 
 
+def _intern_resource_ids(vnets: List[Dict[str, Any]]) -> None:
+    """Intern resource IDs in place so the many dict/set lookups keyed on them hash and compare faster"""
+    intern = sys.intern
+    for vnet in vnets:
+        resource_id = vnet.get('resource_id')
+        if isinstance(resource_id, str):
+            vnet['resource_id'] = intern(resource_id)
+        peering_resource_ids = vnet.get('peering_resource_ids')
+        if peering_resource_ids:
+            vnet['peering_resource_ids'] = [intern(p) if isinstance(p, str) else p for p in peering_resource_ids]
+
+
 def _classify_and_sort_vnets(vnets: List[Dict[str, Any]], config: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Extract common VNet classification and sorting logic"""
-    hub_vnets = [vnet for vnet in vnets if vnet.get("peerings_count", 0) >= config.hub_threshold or vnet.get("is_explicit_hub", False)]
+    hub_threshold = config.hub_threshold
+    hub_vnets, spoke_vnets = [], []
+    for vnet in vnets:
+        is_hub = vnet.get("peerings_count", 0) >= hub_threshold or vnet.get("is_explicit_hub", False)
+        (hub_vnets if is_hub else spoke_vnets).append(vnet)
 
     if not hub_vnets and vnets:
         resource_id_to_vnet = {vnet.get('resource_id'): vnet for vnet in vnets if vnet.get('resource_id')}
@@ -926,8 +961,10 @@ def _classify_and_sort_vnets(vnets: List[Dict[str, Any]], config: Any) -> Tuple[
             hub_vnets = [vnets[0]]
             logging.info(f"Using first VNet as fallback hub: {hub_vnets[0].get('name')}")
 
+        hub_identities = {id(hub) for hub in hub_vnets}
+        spoke_vnets = [vnet for vnet in vnets if id(vnet) not in hub_identities]
+
     hub_vnets.sort(key=lambda x: x.get('name', ''))
-    spoke_vnets = [vnet for vnet in vnets if vnet not in hub_vnets]
 
     logging.info(f"Found {len(hub_vnets)} hub VNet(s) and {len(spoke_vnets)} spoke VNet(s)")
 
@@ -957,9 +994,10 @@ def _classify_spoke_vnets(vnets: List[Dict[str, Any]], hub_vnets: List[Dict[str,
     """Extract common spoke VNet classification logic"""
     spoke_vnets_classified = []
     unpeered_vnets = []
+    hub_identities = {id(hub) for hub in hub_vnets}
 
     for vnet in vnets:
-        if vnet in hub_vnets:
+        if id(vnet) in hub_identities:
             continue
         elif vnet.get("peering_resource_ids"):
             spoke_vnets_classified.append(vnet)
@@ -1031,7 +1069,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
 
     default_style = config.get_vnet_style_string('hub') if show_subnets else "shape=rectangle;rounded=0;whiteSpace=wrap;html=1;strokeColor=#0078D4;fontColor=#004578;fillColor=#E6F1FB;align=left"
 
-    main_id = generate_hierarchical_id(vnet_data, 'main')
+    main_id = _main_id(vnet_data)
 
     vnet_attrs = {
         "id": main_id,
@@ -1110,42 +1148,25 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
     vnet_icons_to_render = []
 
     vnet_icon_width, vnet_icon_height = config.get_icon_size('vnet')
-    vnet_icons_to_render.append({
-        'type': 'vnet',
-        'width': vnet_icon_width,
-        'height': vnet_icon_height
-    })
+    vnet_icons_to_render.append(('vnet', vnet_icon_width, vnet_icon_height))
 
     if vnet_data.get("expressroute", "").lower() == "yes":
         express_width, express_height = config.get_icon_size('expressroute')
-        vnet_icons_to_render.append({
-            'type': 'expressroute',
-            'width': express_width,
-            'height': express_height
-        })
+        vnet_icons_to_render.append(('expressroute', express_width, express_height))
 
     if vnet_data.get("firewall", "").lower() == "yes":
         firewall_width, firewall_height = config.get_icon_size('firewall')
-        vnet_icons_to_render.append({
-            'type': 'firewall',
-            'width': firewall_width,
-            'height': firewall_height
-        })
+        vnet_icons_to_render.append(('firewall', firewall_width, firewall_height))
 
     if vnet_data.get("vpn_gateway", "").lower() == "yes":
         vpn_width, vpn_height = config.get_icon_size('vpn_gateway')
-        vnet_icons_to_render.append({
-            'type': 'vpn_gateway',
-            'width': vpn_width,
-            'height': vpn_height
-        })
+        vnet_icons_to_render.append(('vpn_gateway', vpn_width, vpn_height))
 
     current_x = vnet_width - right_margin
-    for icon in vnet_icons_to_render:
-        current_x -= icon['width']
-        icon['x'] = current_x
+    for icon_type, icon_width, icon_height in vnet_icons_to_render:
+        current_x -= icon_width
 
-        if icon['type'] == 'vnet':
+        if icon_type == 'vnet':
             icon_id = generate_hierarchical_id(vnet_data, 'icon', 'vnet')
             icon_element = etree.SubElement(
                 root,
@@ -1155,7 +1176,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                 vertex="1",
                 parent=main_id,
             )
-        elif icon['type'] == 'expressroute':
+        elif icon_type == 'expressroute':
             icon_id = generate_hierarchical_id(vnet_data, 'icon', 'expressroute')
             icon_element = etree.SubElement(
                 root,
@@ -1165,7 +1186,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                 vertex="1",
                 parent=main_id,
             )
-        elif icon['type'] == 'firewall':
+        elif icon_type == 'firewall':
             icon_id = generate_hierarchical_id(vnet_data, 'icon', 'firewall')
             icon_element = etree.SubElement(
                 root,
@@ -1175,7 +1196,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                 vertex="1",
                 parent=main_id,
             )
-        elif icon['type'] == 'vpn_gateway':
+        elif icon_type == 'vpn_gateway':
             icon_id = generate_hierarchical_id(vnet_data, 'icon', 'vpn')
             icon_element = etree.SubElement(
                 root,
@@ -1190,10 +1211,10 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
             icon_element,
             "mxGeometry",
             attrib={
-                "x": str(icon['x']),
+                "x": str(current_x),
                 "y": str(y_off),
-                "width": str(icon['width']),
-                "height": str(icon['height']),
+                "width": str(icon_width),
+                "height": str(icon_height),
                 "as": "geometry"
             },
         )
@@ -1201,23 +1222,28 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
         current_x -= icon_gap
 
     if show_subnets and vnet_data.get("type") != "virtual_hub":
+        subnet_layout = config.layout['subnet']
+        subnet_x = str(subnet_layout['padding_x'])
+        subnet_geometry_width = str(subnet_layout['width'])
+        subnet_geometry_height = str(subnet_layout['height'])
+        subnet_style = config.get_subnet_style_string()
         for subnet_index, subnet in enumerate(vnet_data.get("subnets", [])):
             subnet_id = generate_hierarchical_id(vnet_data, 'subnet', str(subnet_index))
             subnet_cell = etree.SubElement(
                 root,
                 "mxCell",
                 id=subnet_id,
-                style=config.get_subnet_style_string(),
+                style=subnet_style,
                 vertex="1",
                 parent=main_id,
             )
             subnet_cell.set("value", f"{subnet['name']} {subnet['address']}")
-            y_offset_subnet = config.layout['subnet']['padding_y'] + subnet_index * config.layout['subnet']['spacing_y']
+            y_offset_subnet = subnet_layout['padding_y'] + subnet_index * subnet_layout['spacing_y']
             etree.SubElement(subnet_cell, "mxGeometry", attrib={
-                "x": str(config.layout['subnet']['padding_x']),
+                "x": subnet_x,
                 "y": str(y_offset_subnet),
-                "width": str(config.layout['subnet']['width']),
-                "height": str(config.layout['subnet']['height']),
+                "width": subnet_geometry_width,
+                "height": subnet_geometry_height,
                 "as": "geometry"
             })
 
@@ -1226,39 +1252,26 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
 
             icons_to_render = []
             subnet_width, subnet_height = config.get_icon_size('subnet')
-            icons_to_render.append({
-                'type': 'subnet',
-                'width': subnet_width,
-                'height': subnet_height,
-                'y_offset': config.icon_positioning['subnet_icons']['subnet_icon_y_offset']
-            })
+            icons_to_render.append(('subnet', subnet_width, subnet_height,
+                                    config.icon_positioning['subnet_icons']['subnet_icon_y_offset']))
 
             if subnet.get("udr", "").lower() == "yes":
                 udr_width, udr_height = config.get_icon_size('route_table')
-                icons_to_render.append({
-                    'type': 'udr',
-                    'width': udr_width,
-                    'height': udr_height,
-                    'y_offset': config.icon_positioning['subnet_icons']['icon_y_offset']
-                })
+                icons_to_render.append(('udr', udr_width, udr_height,
+                                        config.icon_positioning['subnet_icons']['icon_y_offset']))
 
             if subnet.get("nsg", "").lower() == "yes":
                 nsg_width, nsg_height = config.get_icon_size('nsg')
-                icons_to_render.append({
-                    'type': 'nsg',
-                    'width': nsg_width,
-                    'height': nsg_height,
-                    'y_offset': config.icon_positioning['subnet_icons']['icon_y_offset']
-                })
+                icons_to_render.append(('nsg', nsg_width, nsg_height,
+                                        config.icon_positioning['subnet_icons']['icon_y_offset']))
 
             current_x = subnet_right_edge
-            for icon in icons_to_render:
-                current_x -= icon['width']
-                icon['x'] = current_x
+            for icon_type, icon_width, icon_height, icon_y_offset in icons_to_render:
+                current_x -= icon_width
 
-                icon_y = y_offset_subnet + icon['y_offset']
+                icon_y = y_offset_subnet + icon_y_offset
 
-                if icon['type'] == 'subnet':
+                if icon_type == 'subnet':
                     subnet_icon_id = generate_hierarchical_id(vnet_data, 'icon', f'subnet_{subnet_index}')
                     icon_element = etree.SubElement(
                         root,
@@ -1268,7 +1281,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                         vertex="1",
                         parent=main_id,
                     )
-                elif icon['type'] == 'udr':
+                elif icon_type == 'udr':
                     udr_icon_id = generate_hierarchical_id(vnet_data, 'icon', f'udr_{subnet_index}')
                     icon_element = etree.SubElement(
                         root,
@@ -1278,7 +1291,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                         vertex="1",
                         parent=main_id,
                     )
-                elif icon['type'] == 'nsg':
+                elif icon_type == 'nsg':
                     nsg_icon_id = generate_hierarchical_id(vnet_data, 'icon', f'nsg_{subnet_index}')
                     icon_element = etree.SubElement(
                         root,
@@ -1293,10 +1306,10 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                     icon_element,
                     "mxGeometry",
                     attrib={
-                        "x": str(icon['x']),
+                        "x": str(current_x),
                         "y": str(icon_y),
-                        "width": str(icon['width']),
-                        "height": str(icon['height']),
+                        "width": str(icon_width),
+                        "height": str(icon_height),
                         "as": "geometry"
                     },
                 )
@@ -1328,6 +1341,8 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
 
     spacing = 20 if show_subnets else 100
 
+    group_extra_height = config.drawio['group']['extra_height']
+
     base_left_x = canvas_padding
     base_hub_x = canvas_padding + config.vnet_spacing_x
     base_right_x = canvas_padding + config.vnet_spacing_x + config.vnet_width + 50
@@ -1339,7 +1354,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
         zone_offset_x = zone_index * (zone_width + zone_spacing)
 
         hub_x = base_hub_x + zone_offset_x
-        hub_main_id = generate_hierarchical_id(hub_vnet, 'main')
+        hub_main_id = _main_id(hub_vnet)
         hub_actual_height = _add_vnet_with_optional_subnets(hub_vnet, hub_x, hub_y, root, config, show_subnets=show_subnets)
 
         spokes = zone_spokes[zone_index]
@@ -1354,8 +1369,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
             right_spokes = spokes
 
         if show_subnets:
-            num_subnets = len(hub_vnet.get("subnets", []))
-            hub_vnet_height = config.layout['hub']['height'] if hub_vnet.get("type") == "virtual_hub" else config.layout['subnet']['padding_y'] + (num_subnets * config.layout['subnet']['spacing_y'])
+            hub_vnet_height = hub_actual_height - group_extra_height
             current_y_right = hub_y + hub_vnet_height
             current_y_left = hub_y + hub_vnet_height
         else:
@@ -1363,63 +1377,13 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
             current_y_right = hub_y + hub_height
             current_y_left = hub_y + hub_height
 
-        for index, spoke in enumerate(right_spokes):
-            y_position = current_y_right if show_subnets else hub_y + 50 + index * spacing
-            x_position = base_right_x + zone_offset_x
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
-
-            spoke_style = config.get_vnet_style_string('spoke')
-            vnet_height = _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style)
-
-            hub_resource_id = hub_vnet.get('resource_id')
-            spoke_peering_ids = spoke.get('peering_resource_ids', [])
-
-            if hub_resource_id in spoke_peering_ids:
-                edge_id = f"edge_right_{zone_index}_{index}_{spoke['name']}"
-                edge = etree.SubElement(
-                    root, "mxCell", id=edge_id, edge="1",
-                    source=hub_main_id, target=spoke_main_id,
-                    style=config.get_hub_spoke_edge_style(),
-                    parent="1"
-                )
-                edge_geometry = etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
-                edge_points = etree.SubElement(edge_geometry, "Array", attrib={"as": "points"})
-
-                if y_position != hub_y:
-                    hub_center_x = base_hub_x + 200 + zone_offset_x
-                    etree.SubElement(edge_points, "mxPoint", attrib={"x": str(hub_center_x + 100), "y": str(y_position + 25)})
-
-            if show_subnets:
-                current_y_right += vnet_height + spacing
-
-        for index, spoke in enumerate(left_spokes):
-            y_position = current_y_left if show_subnets else hub_y + 50 + index * spacing
-            x_position = base_left_x + zone_offset_x
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
-
-            spoke_style = config.get_vnet_style_string('spoke')
-            vnet_height = _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style)
-
-            hub_resource_id = hub_vnet.get('resource_id')
-            spoke_peering_ids = spoke.get('peering_resource_ids', [])
-
-            if hub_resource_id in spoke_peering_ids:
-                edge_id = f"edge_left_{zone_index}_{index}_{spoke['name']}"
-                edge = etree.SubElement(
-                    root, "mxCell", id=edge_id, edge="1",
-                    source=hub_main_id, target=spoke_main_id,
-                    style=config.get_hub_spoke_edge_style(),
-                    parent="1"
-                )
-                edge_geometry = etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
-                edge_points = etree.SubElement(edge_geometry, "Array", attrib={"as": "points"})
-
-                if y_position != hub_y:
-                    hub_center_x = base_hub_x + 200 + zone_offset_x
-                    etree.SubElement(edge_points, "mxPoint", attrib={"x": str(hub_center_x - 100), "y": str(y_position + 25)})
-
-            if show_subnets:
-                current_y_left += vnet_height + spacing
+        hub_center_x = base_hub_x + 200 + zone_offset_x
+        current_y_right = _emit_spoke_column('right', right_spokes, base_right_x + zone_offset_x, hub_center_x + 100,
+                                             current_y_right, root, config, hub_vnet, hub_main_id, zone_index,
+                                             hub_y, spacing, show_subnets)
+        current_y_left = _emit_spoke_column('left', left_spokes, base_left_x + zone_offset_x, hub_center_x - 100,
+                                            current_y_left, root, config, hub_vnet, hub_main_id, zone_index,
+                                            hub_y, spacing, show_subnets)
 
         if show_subnets:
             zone_bottom = hub_y + hub_vnet_height
@@ -1456,7 +1420,6 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
 
             x_position = base_left_x + (position_in_row * unpeered_spacing)
             y_position = unpeered_y + (row_number * row_height)
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
 
             nonpeered_style = config.get_vnet_style_string('non_peered')
             _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=nonpeered_style)
@@ -1472,8 +1435,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
 
     vnet_mapping = create_vnet_id_mapping(vnets, zones, unpeered_vnets)
 
-    vnets_with_edges = hub_vnets + spoke_vnets_classified
-    add_peering_edges(vnets_with_edges, vnet_mapping, root, config, hub_vnets=hub_vnets)
+    add_peering_edges(chain(hub_vnets, spoke_vnets_classified), vnet_mapping, root, config, hub_vnets=hub_vnets)
 
     add_cross_zone_connectivity_edges(zones, hub_vnets, vnet_mapping, root, config)
 
@@ -1485,6 +1447,53 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
     logging.info(f"Draw.io diagram generated and saved to {filename}")
 
 
+def _emit_spoke_column(side: str, spokes: List[Dict[str, Any]], x_position: int, edge_point_x: int, initial_y: int,
+                       root: Any, config: Any, hub_vnet: Dict[str, Any], hub_main_id: str, zone_index: int,
+                       hub_y: int, spacing: int, show_subnets: bool) -> int:
+    """Render one column ('left' or 'right') of spokes around a hub plus their hub-to-spoke edges.
+
+    Returns the y position below the last spoke (only advanced in MLD mode).
+    """
+    from lxml import etree
+
+    current_y = initial_y
+    hub_resource_id = hub_vnet.get('resource_id')
+    spoke_style = config.get_vnet_style_string('spoke')
+    hub_spoke_edge_style = config.get_hub_spoke_edge_style()
+    edge_point_x_str = str(edge_point_x)
+
+    first_spoke_y = hub_y + 50
+
+    for index, spoke in enumerate(spokes):
+        # Unpack per-spoke fields once so the rest of the iteration works on locals
+        spoke_name = spoke['name']
+        spoke_peering_ids = spoke.get('peering_resource_ids', ())
+
+        y_position = current_y if show_subnets else first_spoke_y + index * spacing
+
+        vnet_height = _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style)
+
+        if hub_resource_id in spoke_peering_ids:
+            spoke_main_id = _main_id(spoke)
+            edge_id = f"edge_{side}_{zone_index}_{index}_{spoke_name}"
+            edge = etree.SubElement(
+                root, "mxCell", id=edge_id, edge="1",
+                source=hub_main_id, target=spoke_main_id,
+                style=hub_spoke_edge_style,
+                parent="1"
+            )
+            edge_geometry = etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
+            edge_points = etree.SubElement(edge_geometry, "Array", attrib={"as": "points"})
+
+            if y_position != hub_y:
+                etree.SubElement(edge_points, "mxPoint", attrib={"x": edge_point_x_str, "y": str(y_position + 25)})
+
+        if show_subnets:
+            current_y += vnet_height + spacing
+
+    return current_y
+
+
 def generate_hld_diagram(filename: str, topology_file: str, config: Any) -> None:
     """Generate high-level diagram (VNets only) from topology JSON"""
     generate_diagram(filename, topology_file, config, render_mode='hld')
@@ -1497,6 +1506,15 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
 
     edge_counter = 3000
 
+    # Index hubs by resource ID once instead of rescanning the hub list for every spoke;
+    # a hub listed more than once keeps every index, as the full scan did
+    hub_index_map = {}
+    for hub_index, hub in enumerate(hub_vnets):
+        if hub.get('resource_id'):
+            hub_index_map.setdefault(hub['resource_id'], []).append(hub_index)
+    # Per-edge log records are only built when INFO is enabled
+    log_info = logging.getLogger().isEnabledFor(logging.INFO)
+
     logging.info("Adding cross-zone connectivity edges for multi-hub spokes...")
 
     for zone in zones:
@@ -1508,8 +1526,13 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
             spoke_resource_id = spoke.get('resource_id')
             if not spoke_name or not spoke_resource_id:
                 continue
+            # Spokes that were never drawn can't carry a cross-zone edge
+            spoke_id = vnet_mapping.get(spoke_resource_id)
+            if not spoke_id:
+                continue
 
-            connected_hub_indices = get_hub_connections_for_spoke(spoke, hub_vnets)
+            connected_hub_indices = sorted({hub_index for peering_id in spoke.get('peering_resource_ids', [])
+                                            for hub_index in hub_index_map.get(peering_id, ())})
 
             for hub_index in connected_hub_indices:
                 target_hub = hub_vnets[hub_index]
@@ -1518,38 +1541,49 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
                 if hub_index == zone_hub_index or target_hub_resource_id == zone_hub_resource_id:
                     continue
 
-                target_hub_name = target_hub.get('name')
-                spoke_id = vnet_mapping.get(spoke_resource_id)
                 target_hub_id = vnet_mapping.get(target_hub_resource_id)
+                if not target_hub_id:
+                    continue
 
-                if spoke_id and target_hub_id:
-                    edge = etree.SubElement(
-                        root,
-                        "mxCell",
-                        id=f"cross_zone_edge_{edge_counter}",
-                        edge="1",
-                        source=spoke_id,
-                        target=target_hub_id,
-                        style=config.get_cross_zone_edge_style(),
-                        parent="1",
-                    )
+                target_hub_name = target_hub.get('name')
+                edge = etree.SubElement(
+                    root,
+                    "mxCell",
+                    id=f"cross_zone_edge_{edge_counter}",
+                    edge="1",
+                    source=spoke_id,
+                    target=target_hub_id,
+                    style=config.get_cross_zone_edge_style(),
+                    parent="1",
+                )
 
-                    etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
+                etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
 
-                    edge_counter += 1
-                    logging.info(f"Added cross-zone edge: {spoke_name} → {target_hub_name} (zone {zone_hub_index} → zone {hub_index})")
+                edge_counter += 1
+                if log_info:
+                    logging.info("Added cross-zone edge: %s → %s (zone %d → zone %d)", spoke_name, target_hub_name, zone_hub_index, hub_index)
 
 
 def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets=None):
     """Add edges for all VNet peerings using resource IDs with proper symmetry validation
-       Draws spoke-to-spoke and hub-to-hub (not hub-to-spoke which is already drawn)."""
+       Draws spoke-to-spoke and hub-to-hub (not hub-to-spoke which is already drawn).
+       `vnets` may be any iterable; it is consumed exactly once."""
     from lxml import etree
 
     edge_counter = 1000
     processed_peerings = set()
 
-    resource_id_to_name = {vnet['resource_id']: vnet['name'] for vnet in vnets if 'resource_id' in vnet}
-    vnet_name_to_resource_id = {vnet['name']: vnet['resource_id'] for vnet in vnets if 'name' in vnet and 'resource_id' in vnet}
+    # Accept any iterable of VNets and build the lookup maps in the same single pass
+    resource_id_to_name = {}
+    name_to_vnet = {}
+    vnet_list = []
+    for vnet in vnets:
+        vnet_list.append(vnet)
+        if 'resource_id' in vnet:
+            resource_id_to_name[vnet['resource_id']] = vnet['name']
+        if 'name' in vnet:
+            name_to_vnet.setdefault(vnet['name'], vnet)
+    vnets = vnet_list
 
     if hub_vnets is None:
         hub_vnets = [vnet for vnet in vnets if vnet.get("peerings_count", 0) >= config.hub_threshold or vnet.get("is_explicit_hub", False)]
@@ -1597,6 +1631,10 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets=None):
                 hub_vnets = [vnets[0]]
 
     hub_resource_ids = set(hub['resource_id'] for hub in hub_vnets if 'resource_id' in hub)
+    # Per-edge log records are only built when their level is enabled
+    root_logger = logging.getLogger()
+    log_info = root_logger.isEnabledFor(logging.INFO)
+    log_debug = root_logger.isEnabledFor(logging.DEBUG)
 
     for vnet in vnets:
         if 'resource_id' not in vnet:
@@ -1615,6 +1653,16 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets=None):
             if not target_vnet_name or target_vnet_name == source_vnet_name:
                 continue
 
+            # Order-independent key on resource IDs without a per-edge sorted() + list allocation;
+            # checked first so the reverse direction of a handled peering costs nothing more
+            if source_resource_id < peering_resource_id:
+                peering_key = (source_resource_id, peering_resource_id)
+            else:
+                peering_key = (peering_resource_id, source_resource_id)
+            if peering_key in processed_peerings:
+                continue
+            processed_peerings.add(peering_key)
+
             target_id = vnet_mapping.get(peering_resource_id)
             if not target_id:
                 continue
@@ -1626,18 +1674,12 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets=None):
                 # Skip hub-to-spoke; drawn elsewhere
                 continue
 
-            peering_key = tuple(sorted([source_vnet_name, target_vnet_name]))
-            if peering_key in processed_peerings:
-                continue
-
-            src_res_id = vnet_name_to_resource_id.get(source_vnet_name)
-            target_vnet = next((v for v in vnets if v.get('name') == target_vnet_name), None)
-            if target_vnet and src_res_id:
+            target_vnet = name_to_vnet.get(target_vnet_name)
+            if target_vnet:
                 target_peering_resource_ids = target_vnet.get('peering_resource_ids', [])
-                if src_res_id not in target_peering_resource_ids:
-                    logging.debug(f"Asymmetric peering detected: {source_vnet_name} peers to {target_vnet_name}, but reverse not found (Azure asymmetry is OK).")
-
-            processed_peerings.add(peering_key)
+                if log_debug and source_resource_id not in target_peering_resource_ids:
+                    logging.debug("Asymmetric peering detected: %s peers to %s, but reverse not found (Azure asymmetry is OK).",
+                                  source_vnet_name, target_vnet_name)
 
             edge_type = "hub-to-hub" if source_is_hub and target_is_hub else "spoke-to-spoke"
             edge = etree.SubElement(
@@ -1652,7 +1694,8 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets=None):
             )
             etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
             edge_counter += 1
-            logging.info(f"Added {edge_type} peering edge: {source_vnet_name} ({source_id}) ↔ {target_vnet_name} ({target_id})")
+            if log_info:
+                logging.info("Added %s peering edge: %s (%s) ↔ %s (%s)", edge_type, source_vnet_name, source_id, target_vnet_name, target_id)
 
 
 def _augment_virtual_hub_connections(network_client, subscription_client, vnet_candidates: List[Dict[str, Any]]) -> None:
@@ -1901,6 +1944,14 @@ def generate_mld_diagram(filename: str, topology_file: str, config: Any) -> None
 
 def _finalize_cross_subscription_vhub_mirroring(vnet_candidates: List[Dict[str, Any]]) -> None:
     by_id = {v["resource_id"]: v for v in vnet_candidates if "resource_id" in v}
+    # Track peering membership in a set per VNet so mirroring stays linear
+    seen_by_id = {}
+    for v in vnet_candidates:
+        if "peering_resource_ids" in v:
+            seen = set(v["peering_resource_ids"])
+            if len(seen) != len(v["peering_resource_ids"]):
+                v["peering_resource_ids"] = list(dict.fromkeys(v["peering_resource_ids"]))
+            seen_by_id[id(v)] = seen
     vhubs = [v for v in vnet_candidates if v.get("type") == "virtual_hub"]
     for vhub in vhubs:
         vhub_id = vhub.get("resource_id")
@@ -1909,11 +1960,12 @@ def _finalize_cross_subscription_vhub_mirroring(vnet_candidates: List[Dict[str,
             if not spoke:
                 continue
             spoke.setdefault("peering_resource_ids", [])
-            if vhub_id not in spoke["peering_resource_ids"]:
+            seen = seen_by_id.setdefault(id(spoke), set())
+            if vhub_id not in seen:
+                seen.add(vhub_id)
                 spoke["peering_resource_ids"].append(vhub_id)
     for v in vnet_candidates:
         if "peering_resource_ids" in v:
-            v["peering_resource_ids"] = list(dict.fromkeys(v["peering_resource_ids"]))
             v["peerings_count"] = len(v["peering_resource_ids"])
 
 
@@ -6,20 +6,58 @@ import os
 import re
 import sys
 import logging
-from typing import Dict, List, Any, Optional, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Any, Optional, Union, Tuple
 
 from azure.identity import AzureCliCredential, ClientSecretCredential
 from azure.mgmt.network import NetworkManagementClient
 from azure.mgmt.resource import SubscriptionClient
 from azure.mgmt.resourcegraph import ResourceGraphClient
-from azure.mgmt.resourcegraph.models import QueryRequest
-from azure.core.exceptions import ResourceNotFoundError
+from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+import requests
+from requests.adapters import HTTPAdapter
 
 from .utils import extract_resource_group, parse_vnet_identifier
 
 # Global credentials
 _credentials: Optional[Union[ClientSecretCredential, AzureCliCredential]] = None
 
+# Azure subscription ID pattern: 8-4-4-4-12 hexadecimal digits
+_UUID_RE = re.compile(r'\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z')
+
+# Maximum number of resource IDs sent in a single Resource Graph `in~` filter
+_RESOURCE_GRAPH_BATCH_SIZE = 1000
+
+# Concurrent ARM requests per fan-out; kept modest to stay well inside ARM read throttling
+_MAX_WORKERS = 16
+
+# Only the VNet fields the topology needs, instead of the whole properties blob
+_VNET_PROJECTION = (
+    "project id, name, resourceGroup, subscriptionId, "
+    "addressSpace = properties.addressSpace.addressPrefixes, "
+    "subnets = properties.subnets, peerings = properties.virtualNetworkPeerings"
+)
+
+# Shared HTTP connection pool: at most _MAX_WORKERS subscription workers plus the _MAX_WORKERS
+# threads of the shared peering executor run requests at once. The pool blocks when full,
+# so this is also a hard cap on concurrent ARM requests
+_HTTP_POOL_SIZE = 2 * _MAX_WORKERS
+
+# Fail faster than the SDK default (10 retries, 0.8s backoff) when ARM is unhealthy
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF_FACTOR = 0.5
+
+
+class VNetCollectionError(Exception):
+    """Raised when the VNets of a subscription cannot be collected
+    
+    Throttling and transient server errors are already retried by the SDK retry policy
+    (see _client_options), so this is only raised once those retries are exhausted.
+    """
+
 
 def get_sp_credentials() -> ClientSecretCredential:
     """Get Service Principal credentials from environment variables"""
@@ -41,6 +79,10 @@ def initialize_credentials(use_service_principal: bool = False) -> None:
         _credentials = get_sp_credentials()
     else:
         _credentials = AzureCliCredential()
+    # Cached lookups belong to the previous identity
+    _cached_subscription_list.cache_clear()
+    _cached_subscription_info.cache_clear()
+    _cached_network_client.cache_clear()
 
 
 def get_credentials() -> Union[ClientSecretCredential, AzureCliCredential]:
@@ -51,13 +93,62 @@ def get_credentials() -> Union[ClientSecretCredential, AzureCliCredential]:
     return _credentials
 
 
+@lru_cache(maxsize=None)
+def _client_options() -> Dict[str, Any]:
+    """Keyword arguments for every Azure management client: one shared transport and tuned retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE, pool_block=True)
+    session.mount('https://', adapter)
+    transport = RequestsTransport(session=session, session_owner=False, connection_timeout=10, read_timeout=30)
+    return {
+        "transport": transport,
+        "retry_total": _RETRY_TOTAL,
+        "retry_backoff_factor": _RETRY_BACKOFF_FACTOR
+    }
+
+
+@lru_cache(maxsize=None)
+def _peering_executor() -> ThreadPoolExecutor:
+    """One shared pool for per-VNet peering calls, so concurrent subscriptions do not each start their own"""
+    return ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="peerings")
+
+
+@lru_cache(maxsize=None)
+def _cached_subscription_list(credentials: Any) -> Tuple[Any, ...]:
+    return tuple(SubscriptionClient(credentials, **_client_options()).subscriptions.list())
+
+
+@lru_cache(maxsize=None)
+def _cached_subscription_info(credentials: Any, subscription_id: str) -> Tuple[str, str]:
+    subscription = SubscriptionClient(credentials, **_client_options()).subscriptions.get(subscription_id)
+    return subscription.display_name, subscription.tenant_id
+
+
+@lru_cache(maxsize=None)
+def _cached_network_client(credentials: Any, subscription_id: str) -> NetworkManagementClient:
+    return NetworkManagementClient(credentials, subscription_id, **_client_options())
+
+
+def _list_all_subscriptions() -> Tuple[Any, ...]:
+    """List all subscriptions visible to the credentials, fetched once per run"""
+    return _cached_subscription_list(get_credentials())
+
+
+def _get_subscription_info(subscription_id: str) -> Tuple[str, str]:
+    """Get (display_name, tenant_id) for a subscription, fetched once per subscription"""
+    return _cached_subscription_info(get_credentials(), subscription_id)
+
+
+def _get_network_client(subscription_id: str) -> NetworkManagementClient:
+    """Get a NetworkManagementClient per subscription, reusing its HTTP connection pool across calls"""
+    return _cached_network_client(get_credentials(), subscription_id)
+
+
 def is_subscription_id(subscription_string: str) -> bool:
     """Check if a subscription string is in UUID format (ID) or name format"""
     if subscription_string is None:
         return False
-    # Azure subscription ID pattern: 8-4-4-4-12 hexadecimal digits
-    uuid_pattern = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
-    return re.match(uuid_pattern, subscription_string) is not None
+    return _UUID_RE.match(subscription_string) is not None
 
 
 def read_subscriptions_from_file(file_path: str) -> List[str]:
@@ -76,11 +167,12 @@ def read_subscriptions_from_file(file_path: str) -> List[str]:
 
 def resolve_subscription_names_to_ids(subscription_names: List[str]) -> List[str]:
     """Resolve subscription names to IDs using the Azure API"""
-    subscription_client = SubscriptionClient(get_credentials())
-    all_subscriptions = list(subscription_client.subscriptions.list())
+    all_subscriptions = _list_all_subscriptions()
     
-    # Create name-to-ID mapping
-    name_to_id = {sub.display_name: sub.subscription_id for sub in all_subscriptions}
+    # First subscription wins when several share a display name
+    name_to_id = {}
+    for sub in all_subscriptions:
+        name_to_id.setdefault(sub.display_name, sub.subscription_id)
     
     resolved_ids = []
     for name in subscription_names:
@@ -88,7 +180,7 @@ def resolve_subscription_names_to_ids(subscription_names: List[str]) -> List[str
             resolved_ids.append(name_to_id[name])
         else:
             logging.error(f"Subscription not found: {name}")
-            logging.info(f"Available subscriptions: {list(name_to_id.keys())}")
+            logging.info(f"Available subscriptions: {list(name_to_id)}")
             sys.exit(1)
     
     return resolved_ids
@@ -96,15 +188,64 @@ def resolve_subscription_names_to_ids(subscription_names: List[str]) -> List[str
 
 def get_all_subscription_ids() -> List[str]:
     """Get all subscription IDs from Azure API"""
-    subscription_client = SubscriptionClient(get_credentials())
-    all_subscriptions = list(subscription_client.subscriptions.list())
+    all_subscriptions = _list_all_subscriptions()
     subscription_ids = [sub.subscription_id for sub in all_subscriptions]
     logging.info(f"Found {len(subscription_ids)} subscriptions")
     return subscription_ids
 
 
-def find_hub_vnet_using_resource_graph(vnet_identifier: str) -> Dict[str, Any]:
-    """Find the specified hub VNet using Azure Resource Graph API for efficient search"""
+def _subnet_feature_flags(subnet_names: Iterable[str]) -> Dict[str, str]:
+    """Derive the gateway and firewall flags from a VNet's subnet names"""
+    subnet_names = frozenset(subnet_names)
+    has_gateway = "Yes" if "GatewaySubnet" in subnet_names else "No"
+    return {
+        "expressroute": has_gateway,
+        "vpn_gateway": has_gateway,
+        "firewall": "Yes" if "AzureFirewallSubnet" in subnet_names else "No"
+    }
+
+
+def _build_vnet_info_from_sdk(vnet: Any, subscription_id: str, subscription_name: str,
+                              tenant_id: str, resource_group: str) -> Dict[str, Any]:
+    """Build a VNet info dict from an SDK VirtualNetwork object (peerings are added by the caller)"""
+    subnet_infos = []
+    subnet_names = []
+    for subnet in vnet.subnets:
+        subnet_names.append(subnet.name)
+        subnet_infos.append({
+            "name": subnet.name,
+            "address": (
+                subnet.address_prefixes[0]
+                if hasattr(subnet, "address_prefixes") and subnet.address_prefixes
+                else subnet.address_prefix or "N/A"
+            ),
+            "nsg": 'Yes' if subnet.network_security_group else 'No',
+            "udr": 'Yes' if subnet.route_table else 'No'
+        })
+    
+    return {
+        "name": vnet.name,
+        "address_space": vnet.address_space.address_prefixes[0],
+        "subnets": subnet_infos,
+        
+        "resource_id": vnet.id,
+        "tenant_id": tenant_id,
+        "subscription_id": subscription_id,
+        "subscription_name": subscription_name,
+        "resourcegroup_id": f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}",
+        "resourcegroup_name": resource_group,
+        "azure_console_url": f"https://portal.azure.com/#@{tenant_id}/resource{vnet.id}",
+        **_subnet_feature_flags(subnet_names)
+    }
+
+
+def find_hub_vnet_using_resource_graph(vnet_identifier: str) -> Optional[Dict[str, Any]]:
+    """Find the specified hub VNet using Azure Resource Graph API for efficient search
+    
+    Returns:
+        VNet info dict, or None if an Azure API call failed. Throttled (429) calls are
+        retried by the client pipeline, which honours Retry-After, before that happens.
+    """
     target_subscription_id, target_resource_group, target_vnet_name = parse_vnet_identifier(vnet_identifier)
     
     # Must have resource group - either from subscription/resource_group/vnet_name format or from resource ID
@@ -113,7 +254,7 @@ def find_hub_vnet_using_resource_graph(vnet_identifier: str) -> Dict[str, Any]:
         sys.exit(1)
     
     # Create Resource Graph client
-    resource_graph_client = ResourceGraphClient(get_credentials())
+    resource_graph_client = ResourceGraphClient(get_credentials(), **_client_options())
     
     # Query by resource group and VNet name
     # If we have subscription ID from resource ID or path format, we can add it as additional filter
@@ -121,47 +262,51 @@ def find_hub_vnet_using_resource_graph(vnet_identifier: str) -> Dict[str, Any]:
         query = f"""
         Resources
         | where type =~ 'microsoft.network/virtualnetworks'
-        | where name =~ '{target_vnet_name}'
-        | where resourceGroup =~ '{target_resource_group}'
-        | where subscriptionId =~ '{target_subscription_id}'
-        | project name, type, location, resourceGroup, subscriptionId, id, properties
+        | where name =~ {_kql_string(target_vnet_name)}
+        | where resourceGroup =~ {_kql_string(target_resource_group)}
+        | where subscriptionId =~ {_kql_string(target_subscription_id)}
+        | {_VNET_PROJECTION}
         """
     else:
         query = f"""
         Resources
         | where type =~ 'microsoft.network/virtualnetworks'
-        | where name =~ '{target_vnet_name}'
-        | where resourceGroup =~ '{target_resource_group}'
-        | project name, type, location, resourceGroup, subscriptionId, id, properties
+        | where name =~ {_kql_string(target_vnet_name)}
+        | where resourceGroup =~ {_kql_string(target_resource_group)}
+        | {_VNET_PROJECTION}
         """
     
     try:
         # Execute the query
-        logging.info(f"Resource Graph query: {query}")
-        logging.info(f"Target values: name='{target_vnet_name}', resourceGroup='{target_resource_group}', subscriptionId='{target_subscription_id}'")
+        logging.debug("Resource Graph query: %s", query)
+        logging.debug("Target values: name='%s', resourceGroup='%s', subscriptionId='%s'",
+                      target_vnet_name, target_resource_group, target_subscription_id)
         
         query_request = QueryRequest(query=query)
         # Try to add subscription scopes for better access
         if not target_subscription_id:
-            subscription_client = SubscriptionClient(get_credentials())
-            all_subscriptions = list(subscription_client.subscriptions.list())
+            all_subscriptions = _list_all_subscriptions()
             subscription_ids = [sub.subscription_id for sub in all_subscriptions]
             logging.info(f"Available subscriptions for Resource Graph: {len(subscription_ids)}")
             query_request = QueryRequest(query=query, subscriptions=subscription_ids)
         
         response = resource_graph_client.resources(query_request)
         
-        # Debug: Let's also try a simpler query to see if we can find ANY VNets
-        debug_query = f"Resources | where type =~ 'microsoft.network/virtualnetworks' | where subscriptionId =~ '{target_subscription_id or 'a4007e29-3c9e-47b5-bdce-0c2a2e57c1c1'}' | project name, resourceGroup, subscriptionId"
-        logging.info(f"Debug query: {debug_query}")
-        debug_request = QueryRequest(query=debug_query)
-        debug_response = resource_graph_client.resources(debug_request)
-        logging.info(f"Debug response: {len(debug_response.data) if debug_response.data else 0} VNets found")
-        if debug_response.data:
-            for vnet in debug_response.data:
-                logging.info(f"Debug VNet found: name='{vnet.get('name')}', resourceGroup='{vnet.get('resourceGroup')}', subscriptionId='{vnet.get('subscriptionId')}'")
-        
         if not response.data:
+            # Only on a miss: run a broader query to list the VNets that do exist, to help correct the identifier
+            if target_subscription_id:
+                debug_query = f"Resources | where type =~ 'microsoft.network/virtualnetworks' | where subscriptionId =~ {_kql_string(target_subscription_id)} | project name, resourceGroup, subscriptionId"
+            else:
+                debug_query = f"Resources | where type =~ 'microsoft.network/virtualnetworks' | where resourceGroup =~ {_kql_string(target_resource_group)} | project name, resourceGroup, subscriptionId"
+            logging.debug("Debug query: %s", debug_query)
+            debug_request = QueryRequest(query=debug_query, subscriptions=query_request.subscriptions)
+            debug_response = resource_graph_client.resources(debug_request)
+            logging.debug("Debug response: %d VNets found", len(debug_response.data) if debug_response.data else 0)
+            if debug_response.data and logging.getLogger().isEnabledFor(logging.DEBUG):
+                for vnet in debug_response.data:
+                    logging.debug("Debug VNet found: name='%s', resourceGroup='%s', subscriptionId='%s'",
+                                  vnet.get('name'), vnet.get('resourceGroup'), vnet.get('subscriptionId'))
+            
             logging.error(f"No VNets found matching '{vnet_identifier}'. Please verify the VNet identifier format (subscription/resource_group/vnet_name) and ensure the VNet exists.")
             if debug_response.data:
                 logging.error("Available VNets in the target subscription/resource group:")
@@ -183,74 +328,221 @@ def find_hub_vnet_using_resource_graph(vnet_identifier: str) -> Dict[str, Any]:
         
         logging.info(f"Found VNet '{vnet_name}' in resource group '{resource_group}' in subscription '{subscription_id}'")
         
-        # Now get detailed information using the Network Management Client
-        network_client = NetworkManagementClient(get_credentials(), subscription_id)
-        subscription_client = SubscriptionClient(get_credentials())
-        
         # Get subscription name and tenant info
-        subscription = subscription_client.subscriptions.get(subscription_id)
-        subscription_name = subscription.display_name
-        tenant_id = subscription.tenant_id
+        subscription_name, tenant_id = _get_subscription_info(subscription_id)
+        
+        # The projected row already carries subnets and peerings, so no further API calls are needed
+        if vnet_result.get('addressSpace'):
+            vnet_info = _build_vnet_info_from_graph(vnet_result, subscription_id, subscription_name, tenant_id, resource_group)
+            vnet_info["is_explicit_hub"] = True
+            return vnet_info
+        
+        # Otherwise get detailed information using the Network Management Client
+        network_client = _get_network_client(subscription_id)
         
         # Get VNet details
         vnet = network_client.virtual_networks.get(resource_group, vnet_name)
-        subnet_names = [subnet.name for subnet in vnet.subnets]
+        vnet_info = _build_vnet_info_from_sdk(vnet, subscription_id, subscription_name, tenant_id, resource_group)
+        vnet_info["is_explicit_hub"] = True
         
-        # Construct resourcegroup_id from resource_id
-        resourcegroup_id = f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}"
+        # Get peerings for this VNet - store resource IDs instead of names
+        peerings = network_client.virtual_network_peerings.list(resource_group, vnet.name)
+        peering_resource_ids = _remote_vnet_ids(peerings)
         
-        # Construct Azure console hyperlink
-        azure_console_url = f"https://portal.azure.com/#@{tenant_id}/resource{vnet.id}"
+        vnet_info["peering_resource_ids"] = peering_resource_ids
         
-        vnet_info = {
-            "name": vnet.name,
-            "address_space": vnet.address_space.address_prefixes[0],
-            "subnets": [
-                {
-                    "name": subnet.name,
-                    "address": (
-                        subnet.address_prefixes[0]
-                        if hasattr(subnet, "address_prefixes") and subnet.address_prefixes
-                        else subnet.address_prefix or "N/A"
-                    ),
-                    "nsg": 'Yes' if subnet.network_security_group else 'No',
-                    "udr": 'Yes' if subnet.route_table else 'No'
-                }
-                for subnet in vnet.subnets
-            ],
-            
-            "resource_id": vnet.id,
-            "tenant_id": tenant_id,
-            "subscription_id": subscription_id,
-            "subscription_name": subscription_name,
-            "resourcegroup_id": resourcegroup_id,
-            "resourcegroup_name": resource_group,
-            "azure_console_url": azure_console_url,
-            "expressroute": "Yes" if "GatewaySubnet" in subnet_names else "No",
-            "vpn_gateway": "Yes" if "GatewaySubnet" in subnet_names else "No",
-            "firewall": "Yes" if "AzureFirewallSubnet" in subnet_names else "No",
-            "is_explicit_hub": True
-        }
+        vnet_info["peerings_count"] = len(peering_resource_ids)
+        return vnet_info
+        
+    except HttpResponseError as e:
+        if e.status_code == 429:
+            logging.error(f"Resource Graph is still throttling requests after {_RETRY_TOTAL} retries: {e}")
+        else:
+            logging.error(f"Error searching for VNet using Resource Graph: {e}")
+        return None
+
+
+def _remote_vnet_ids(peerings: Iterable[Any]) -> List[str]:
+    """Return the remote VNet resource IDs of SDK peering objects, skipping peerings without one"""
+    return [
+        peering.remote_virtual_network.id
+        for peering in peerings
+        if peering.remote_virtual_network and peering.remote_virtual_network.id
+    ]
+
+
+def _kql_string(value: str) -> str:
+    """Quote a value as a KQL string literal, escaping backslashes and single quotes"""
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _is_vnet_resource_id(resource_id: str) -> bool:
+    """Check that a resource ID has the /subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Network/virtualNetworks/{vnet} shape"""
+    parts = resource_id.split('/')
+    return len(parts) >= 9 and parts[5] == 'providers' and parts[6] == 'Microsoft.Network' and parts[7] == 'virtualNetworks'
+
+
+def _run_resource_graph_query(resource_graph_client: ResourceGraphClient, query: str,
+                              subscription_ids: List[str]) -> List[Dict[str, Any]]:
+    """Run a Resource Graph query, following $skipToken until every page has been returned"""
+    rows = []
+    skip_token = None
+    while True:
+        options = QueryRequestOptions(skip_token=skip_token) if skip_token else None
+        response = resource_graph_client.resources(
+            QueryRequest(query=query, subscriptions=subscription_ids, options=options)
+        )
+        rows.extend(response.data or [])
+        skip_token = response.skip_token
+        if not skip_token:
+            return rows
+
+
+def _query_vnets_by_resource_ids(resource_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch VNets by resource ID using batched Resource Graph queries
+    
+    Returns:
+        Dict of Resource Graph rows keyed by lower-cased resource ID. VNets that are
+        deleted or not readable are simply absent from the result.
+    """
+    resource_graph_client = ResourceGraphClient(get_credentials(), **_client_options())
+    subscription_ids = sorted({resource_id.split('/')[2] for resource_id in resource_ids})
+    rows_by_id = {}
+    
+    for start in range(0, len(resource_ids), _RESOURCE_GRAPH_BATCH_SIZE):
+        batch = resource_ids[start:start + _RESOURCE_GRAPH_BATCH_SIZE]
+        id_list = ", ".join(_kql_string(resource_id) for resource_id in batch)
+        query = f"""
+        Resources
+        | where type =~ 'microsoft.network/virtualnetworks'
+        | where id in~ ({id_list})
+        | {_VNET_PROJECTION}
+        """
+        for row in _run_resource_graph_query(resource_graph_client, query, subscription_ids):
+            rows_by_id[row['id'].lower()] = row
+    
+    return rows_by_id
+
+
+def _query_vnets_in_subscriptions(subscription_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch every VNet in the given subscriptions with a single (paged) Resource Graph query
+    
+    Returns:
+        Dict of Resource Graph rows grouped by lower-cased subscription ID
+    """
+    resource_graph_client = ResourceGraphClient(get_credentials(), **_client_options())
+    query = f"""
+    Resources
+    | where type =~ 'microsoft.network/virtualnetworks'
+    | {_VNET_PROJECTION}
+    | order by id asc
+    """
+    rows_by_subscription = {}
+    for row in _run_resource_graph_query(resource_graph_client, query, subscription_ids):
+        rows_by_subscription.setdefault(row['subscriptionId'].lower(), []).append(row)
+    return rows_by_subscription
+
+
+def _build_vnet_info_from_graph(row: Dict[str, Any], subscription_id: str, subscription_name: str,
+                                tenant_id: str, resource_group: str) -> Dict[str, Any]:
+    """Build a VNet info dict from a Resource Graph row projected with _VNET_PROJECTION, matching the SDK-based layout"""
+    subnets = row.get('subnets') or []
+    
+    subnet_infos = []
+    for subnet in subnets:
+        subnet_properties = subnet.get('properties') or {}
+        address_prefixes = subnet_properties.get('addressPrefixes')
+        subnet_infos.append({
+            "name": subnet.get('name'),
+            "address": (
+                address_prefixes[0]
+                if address_prefixes
+                else subnet_properties.get('addressPrefix') or "N/A"
+            ),
+            "nsg": 'Yes' if subnet_properties.get('networkSecurityGroup') else 'No',
+            "udr": 'Yes' if subnet_properties.get('routeTable') else 'No'
+        })
+    
+    peering_resource_ids = []
+    for peering in row.get('peerings') or []:
+        remote_vnet = (peering.get('properties') or {}).get('remoteVirtualNetwork') or {}
+        if remote_vnet.get('id'):
+            peering_resource_ids.append(remote_vnet['id'])
+    
+    return {
+        "name": row['name'],
+        "address_space": row['addressSpace'][0],
+        "subnets": subnet_infos,
+        
+        "resource_id": row['id'],
+        "tenant_id": tenant_id,
+        "subscription_id": subscription_id,
+        "subscription_name": subscription_name,
+        "resourcegroup_id": f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}",
+        "resourcegroup_name": resource_group,
+        "azure_console_url": f"https://portal.azure.com/#@{tenant_id}/resource{row['id']}",
+        **_subnet_feature_flags(subnet.get('name') for subnet in subnets),
+        "peering_resource_ids": peering_resource_ids,
+        "peerings_count": len(peering_resource_ids)
+    }
+
+
+def _fetch_peered_vnet(resource_id: str, graph_row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Resolve a single peered VNet, from its Resource Graph row when available
+    
+    Returns:
+        VNet info dict, or None if the VNet could not be retrieved
+    """
+    parts = resource_id.split('/')
+    subscription_id = parts[2]
+    resource_group = parts[4]
+    vnet_name = parts[8]
+    
+    try:
+        # Get subscription name and tenant info
+        subscription_name, tenant_id = _get_subscription_info(subscription_id)
+        
+        if graph_row is not None:
+            vnet_info = _build_vnet_info_from_graph(graph_row, subscription_id, subscription_name, tenant_id, resource_group)
+            logging.info("Found peered VNet '%s' in resource group '%s' in subscription '%s'", vnet_name, resource_group, subscription_name)
+            return vnet_info
+        
+        # Get detailed information using the Network Management Client
+        network_client = _get_network_client(subscription_id)
+        
+        # Get VNet details
+        vnet = network_client.virtual_networks.get(resource_group, vnet_name)
+        vnet_info = _build_vnet_info_from_sdk(vnet, subscription_id, subscription_name, tenant_id, resource_group)
         
         # Get peerings for this VNet - store resource IDs instead of names
         peerings = network_client.virtual_network_peerings.list(resource_group, vnet.name)
-        peering_resource_ids = []
-        for peering in peerings:
-            if peering.remote_virtual_network and peering.remote_virtual_network.id:
-                peering_resource_ids.append(peering.remote_virtual_network.id)
+        peering_resource_ids = _remote_vnet_ids(peerings)
         
         vnet_info["peering_resource_ids"] = peering_resource_ids
-        
         vnet_info["peerings_count"] = len(peering_resource_ids)
-        return vnet_info
         
+        logging.info("Found peered VNet '%s' in resource group '%s' in subscription '%s'", vnet_name, resource_group, subscription_name)
+        return vnet_info
+    
     except Exception as e:
-        logging.error(f"Error searching for VNet using Resource Graph: {e}")
+        # Check if this is a ResourceNotFound error (common when VNet was deleted but peering still exists)
+        if "ResourceNotFound" in str(e):
+            logging.warning("Skipping deleted VNet: %s in resource group '%s' (resource ID: %s)", vnet_name, resource_group, resource_id)
+            logging.warning("This is normal when a VNet has been deleted but peering relationships still reference it")
+        else:
+            # Clean up exception message - only show the main error without Azure SDK details
+            error_lines = str(e).split('\n')
+            main_error = error_lines[0] if error_lines else str(e)
+            # Remove Code: and Message: parts that Azure SDK adds
+            if 'Code:' in main_error:
+                main_error = main_error.split('Code:')[0].strip()
+            logging.warning("Error getting VNet details for resource ID %s: %s", resource_id, main_error)
         return None
 
 
 def find_peered_vnets(peering_resource_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
-    """Find peered VNets using direct API calls with resource IDs from peering objects
+    """Find peered VNets by the resource IDs from peering objects, batched through Resource Graph
     
     Returns:
         Tuple of (peered_vnets_list, accessible_resource_ids_list)
@@ -258,260 +550,244 @@ def find_peered_vnets(peering_resource_ids: List[str]) -> Tuple[List[Dict[str, A
     if not peering_resource_ids:
         return [], []
     
-    subscription_client = SubscriptionClient(get_credentials())
     peered_vnets = []
-    processed_vnets = set()  # Track processed VNets to avoid duplicates
     accessible_resource_ids = []  # Track successfully resolved resource IDs
     
-    for resource_id in peering_resource_ids:
-        try:
-            # Parse resource ID: /subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Network/virtualNetworks/{vnet}
-            parts = resource_id.split('/')
-            if len(parts) < 9 or parts[5] != 'providers' or parts[6] != 'Microsoft.Network' or parts[7] != 'virtualNetworks':
-                logging.error(f"Invalid VNet resource ID format: {resource_id}")
-                continue
-                
-            subscription_id = parts[2]
-            resource_group = parts[4]
-            vnet_name = parts[8]
-            
-            # Create unique key to avoid duplicates
-            vnet_key = f"{subscription_id}/{resource_group}/{vnet_name}"
-            if vnet_key in processed_vnets:
-                continue
-            processed_vnets.add(vnet_key)
-            
-            # Get detailed information using the Network Management Client
-            network_client = NetworkManagementClient(get_credentials(), subscription_id)
-            
-            # Get subscription name and tenant info
-            subscription = subscription_client.subscriptions.get(subscription_id)
-            subscription_name = subscription.display_name
-            tenant_id = subscription.tenant_id
-            
-            # Get VNet details
-            vnet = network_client.virtual_networks.get(resource_group, vnet_name)
-            subnet_names = [subnet.name for subnet in vnet.subnets]
-            
-            # Construct resourcegroup_id from resource_id
-            resourcegroup_id = f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}"
-            
-            # Construct Azure console hyperlink
-            azure_console_url = f"https://portal.azure.com/#@{tenant_id}/resource{vnet.id}"
-            
-            vnet_info = {
-                "name": vnet.name,
-                "address_space": vnet.address_space.address_prefixes[0],
-                "subnets": [
-                    {
-                        "name": subnet.name,
-                        "address": (
-                            subnet.address_prefixes[0]
-                            if hasattr(subnet, "address_prefixes") and subnet.address_prefixes
-                            else subnet.address_prefix or "N/A"
-                        ),
-                        "nsg": 'Yes' if subnet.network_security_group else 'No',
-                        "udr": 'Yes' if subnet.route_table else 'No'
-                    }
-                    for subnet in vnet.subnets
-                ],
-                
-                "resource_id": vnet.id,
-                "tenant_id": tenant_id,
-                "subscription_id": subscription_id,
-                "subscription_name": subscription_name,
-                "resourcegroup_id": resourcegroup_id,
-                "resourcegroup_name": resource_group,
-                "azure_console_url": azure_console_url,
-                "expressroute": "Yes" if "GatewaySubnet" in subnet_names else "No",
-                "vpn_gateway": "Yes" if "GatewaySubnet" in subnet_names else "No",
-                "firewall": "Yes" if "AzureFirewallSubnet" in subnet_names else "No"
-            }
-            
-            # Get peerings for this VNet - store resource IDs instead of names
-            peerings = network_client.virtual_network_peerings.list(resource_group, vnet.name)
-            peering_resource_ids = []
-            for peering in peerings:
-                if peering.remote_virtual_network and peering.remote_virtual_network.id:
-                    peering_resource_ids.append(peering.remote_virtual_network.id)
-            
-            vnet_info["peering_resource_ids"] = peering_resource_ids
-            vnet_info["peerings_count"] = len(peering_resource_ids)
+    # Dedupe (order-preserving) and validate up front so every VNet is fetched exactly once
+    unique_resource_ids = []
+    for resource_id in dict.fromkeys(peering_resource_ids):
+        # Parse resource ID: /subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Network/virtualNetworks/{vnet}
+        if not _is_vnet_resource_id(resource_id):
+            logging.error(f"Invalid VNet resource ID format: {resource_id}")
+            continue
+        unique_resource_ids.append(resource_id)
+    
+    if not unique_resource_ids:
+        return [], []
+    
+    # Resolve all VNets with one batched Resource Graph lookup; VNets it does not return
+    # (deleted, or not visible to Resource Graph) fall back to per-VNet API calls
+    graph_rows = {}
+    try:
+        graph_rows = _query_vnets_by_resource_ids(unique_resource_ids)
+    except Exception as e:
+        logging.warning(f"Resource Graph lookup of peered VNets failed, falling back to per-VNet API calls: {e}")
+    
+    # Rows Resource Graph returned only need the cached subscription lookup, so build them inline
+    results = {}
+    fallback_resource_ids = []
+    for resource_id in unique_resource_ids:
+        graph_row = graph_rows.get(resource_id.lower())
+        if graph_row is not None:
+            results[resource_id] = _fetch_peered_vnet(resource_id, graph_row)
+        else:
+            fallback_resource_ids.append(resource_id)
+    
+    # Per-VNet fallback lookups are latency-bound HTTP calls, so fan them out over a thread pool
+    if fallback_resource_ids:
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(fallback_resource_ids))) as executor:
+            fetched = executor.map(lambda resource_id: _fetch_peered_vnet(resource_id, None), fallback_resource_ids)
+            results.update(zip(fallback_resource_ids, fetched))
+    
+    for resource_id in unique_resource_ids:
+        vnet_info = results[resource_id]
+        if vnet_info is not None:
             peered_vnets.append(vnet_info)
             accessible_resource_ids.append(resource_id)  # Track this successful resolution
-            
-            logging.info(f"Found peered VNet '{vnet_name}' in resource group '{resource_group}' in subscription '{subscription_name}'")
-        
-        except Exception as e:
-            # Check if this is a ResourceNotFound error (common when VNet was deleted but peering still exists)
-            if "ResourceNotFound" in str(e):
-                logging.warning(f"Skipping deleted VNet: {vnet_name} in resource group '{resource_group}' (resource ID: {resource_id})")
-                logging.warning("This is normal when a VNet has been deleted but peering relationships still reference it")
-            else:
-                # Clean up exception message - only show the main error without Azure SDK details
-                error_lines = str(e).split('\n')
-                main_error = error_lines[0] if error_lines else str(e)
-                # Remove Code: and Message: parts that Azure SDK adds
-                if 'Code:' in main_error:
-                    main_error = main_error.split('Code:')[0].strip()
-                logging.warning(f"Error getting VNet details for resource ID {resource_id}: {main_error}")
-            continue
     
     return peered_vnets, accessible_resource_ids
 
 
-def get_vnet_topology_for_selected_subscriptions(subscription_ids: List[str], exclude_resource_ids: set = None) -> Dict[str, Any]:
-    """Collect all VNets and their details across selected subscriptions
+def _list_peering_resource_ids(network_client: NetworkManagementClient, vnet: Any, exclude_resource_ids: set) -> List[str]:
+    """List the remote VNet resource IDs peered with a VNet, leaving out excluded VNets"""
+    peerings = network_client.virtual_network_peerings.list(extract_resource_group(vnet.id), vnet.name)
+    # Skip peerings to excluded VNets
+    return [peer_id for peer_id in _remote_vnet_ids(peerings) if peer_id not in exclude_resource_ids]
+
+
+def _collect_vnets_for_subscription(subscription_id: str, graph_rows_by_subscription: Optional[Dict[str, List[Dict[str, Any]]]],
+                                    exclude_resource_ids: set) -> List[Dict[str, Any]]:
+    """Collect the virtual hubs and VNets of one subscription
     
-    Args:
-        subscription_ids: List of subscription IDs to query
-        exclude_resource_ids: Optional set of VNet resource IDs to exclude from topology
+    VNets come from the pre-fetched Resource Graph rows when available, otherwise from the Network API.
     """
-    network_data = {"vnets": []}
     vnet_candidates = []
-    exclude_resource_ids = exclude_resource_ids or set()
     
-    subscription_client = SubscriptionClient(get_credentials())
-
-    for subscription_id in subscription_ids:
-        logging.info(f"Processing Subscription: {subscription_id}")
-        network_client = NetworkManagementClient(get_credentials(), subscription_id)
-
-        # Get subscription name and tenant info
-        try:
-            subscription = subscription_client.subscriptions.get(subscription_id)
-            subscription_name = subscription.display_name
-            tenant_id = subscription.tenant_id
-            
-        except Exception as e:
-            error_msg = f"Could not access subscription {subscription_id}: {e}"
-            logging.error(error_msg)
-            sys.exit(1)
+    logging.info("Processing Subscription: %s", subscription_id)
+    network_client = _get_network_client(subscription_id)
 
-        # Detect Virtual WAN Hub if it exists - add to vnets array
-        try:
-            for vwan in network_client.virtual_wans.list():
-                try:
-                    # Correctly retrieve virtual hubs associated with the Virtual WAN
-                    hubs = network_client.virtual_hubs.list_by_resource_group(extract_resource_group(vwan.id))
-                    for hub in hubs:
-                        # Detect ExpressRoute or VPN based on hub properties (fallback to flags if needed)
-                        has_expressroute = hasattr(hub, "express_route_gateway") and hub.express_route_gateway is not None
-                        has_vpn_gateway = hasattr(hub, "vpn_gateway") and hub.vpn_gateway is not None
-                        has_firewall = hasattr(hub, "azure_firewall") and hub.azure_firewall is not None
-
-                        # Extract resource group from hub resource ID
-                        hub_resource_group = extract_resource_group(hub.id)
-                        
-                        # Construct resourcegroup_id from resource_id
-                        resourcegroup_id = f"/subscriptions/{subscription_id}/resourceGroups/{hub_resource_group}"
-                        
-                        # Construct Azure console hyperlink
-                        azure_console_url = f"https://portal.azure.com/#@{tenant_id}/resource{hub.id}"
-                        
-                        # Skip if excluded
-                        if hub.id in exclude_resource_ids:
-                            logging.info(f"Excluding Virtual Hub: {hub.name}")
-                            continue
-                        
-                        virtual_hub_info = {
-                            "name": hub.name,
-                            "address_space": hub.address_prefix,
-                            "type": "virtual_hub",
-                            "subnets": [],  # Virtual hubs don't have traditional subnets
-                              # Will be populated if needed
-                            "resource_id": hub.id,
-                            "tenant_id": tenant_id,
-                            "subscription_id": subscription_id,
-                            "subscription_name": subscription_name,
-                            "resourcegroup_id": resourcegroup_id,
-                            "resourcegroup_name": hub_resource_group,
-                            "azure_console_url": azure_console_url,
-                            "expressroute": "Yes" if has_expressroute else "No",
-                            "vpn_gateway": "Yes" if has_vpn_gateway else "No",
-                            "firewall": "Yes" if has_firewall else "No",
-                            "peering_resource_ids": [],  # Virtual hubs use different connectivity model
-                            "peerings_count": 0  # Virtual hubs use different connectivity model
-                        }
-                        vnet_candidates.append(virtual_hub_info)
-                except Exception as e:
-                    error_msg = f"Could not retrieve virtual hub details for {vwan.name} in subscription {subscription_id}: {e}"
-                    logging.error(error_msg)
-                    sys.exit(1)
-        except Exception as e:
-            error_msg = f"Could not list virtual WANs for subscription {subscription_id}: {e}"
-            logging.error(error_msg)
-            sys.exit(1)
+    # Get subscription name and tenant info
+    try:
+        subscription_name, tenant_id = _get_subscription_info(subscription_id)
+        
+    except Exception as e:
+        raise VNetCollectionError(f"Could not access subscription {subscription_id}: {e}") from e
 
-        # Process VNets
-        try:
-            for vnet in network_client.virtual_networks.list_all():
-                try:
-                    # Skip if excluded
-                    if vnet.id in exclude_resource_ids:
-                        logging.info(f"Excluding VNet: {vnet.name}")
-                        continue
+    # Detect Virtual WAN Hub if it exists - add to vnets array
+    try:
+        for vwan in network_client.virtual_wans.list():
+            try:
+                # Correctly retrieve virtual hubs associated with the Virtual WAN
+                hubs = network_client.virtual_hubs.list_by_resource_group(extract_resource_group(vwan.id))
+                for hub in hubs:
+                    # Detect ExpressRoute or VPN based on hub properties (fallback to flags if needed)
+                    has_expressroute = hasattr(hub, "express_route_gateway") and hub.express_route_gateway is not None
+                    has_vpn_gateway = hasattr(hub, "vpn_gateway") and hub.vpn_gateway is not None
+                    has_firewall = hasattr(hub, "azure_firewall") and hub.azure_firewall is not None
+
+                    # Extract resource group from hub resource ID
+                    hub_resource_group = extract_resource_group(hub.id)
                     
-                    resource_group_name = extract_resource_group(vnet.id)
-                    subnet_names = [subnet.name for subnet in vnet.subnets]
-
                     # Construct resourcegroup_id from resource_id
-                    resourcegroup_id = f"/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}"
+                    resourcegroup_id = f"/subscriptions/{subscription_id}/resourceGroups/{hub_resource_group}"
                     
                     # Construct Azure console hyperlink
-                    azure_console_url = f"https://portal.azure.com/#@{tenant_id}/resource{vnet.id}"
+                    azure_console_url = f"https://portal.azure.com/#@{tenant_id}/resource{hub.id}"
                     
-                    vnet_info = {
-                        "name": vnet.name,
-                        "address_space": vnet.address_space.address_prefixes[0],
-                        "subnets": [
-                            {
-                                "name": subnet.name,
-                                "address": (
-                                    subnet.address_prefixes[0]
-                                    if hasattr(subnet, "address_prefixes") and subnet.address_prefixes
-                                    else subnet.address_prefix or "N/A"
-                                ),
-                                "nsg": 'Yes' if subnet.network_security_group else 'No',
-                                "udr": 'Yes' if subnet.route_table else 'No'
-                            }
-                            for subnet in vnet.subnets
-                        ],
-                        
-                        "resource_id": vnet.id,
+                    # Skip if excluded
+                    if hub.id in exclude_resource_ids:
+                        logging.info("Excluding Virtual Hub: %s", hub.name)
+                        continue
+                    
+                    virtual_hub_info = {
+                        "name": hub.name,
+                        "address_space": hub.address_prefix,
+                        "type": "virtual_hub",
+                        "subnets": [],  # Virtual hubs don't have traditional subnets
+                          # Will be populated if needed
+                        "resource_id": hub.id,
                         "tenant_id": tenant_id,
                         "subscription_id": subscription_id,
                         "subscription_name": subscription_name,
                         "resourcegroup_id": resourcegroup_id,
-                        "resourcegroup_name": resource_group_name,
+                        "resourcegroup_name": hub_resource_group,
                         "azure_console_url": azure_console_url,
-                        "expressroute": "Yes" if "GatewaySubnet" in subnet_names else "No",
-                        "vpn_gateway": "Yes" if "GatewaySubnet" in subnet_names else "No",
-                        "firewall": "Yes" if "AzureFirewallSubnet" in subnet_names else "No"
+                        "expressroute": "Yes" if has_expressroute else "No",
+                        "vpn_gateway": "Yes" if has_vpn_gateway else "No",
+                        "firewall": "Yes" if has_firewall else "No",
+                        "peering_resource_ids": [],  # Virtual hubs use different connectivity model
+                        "peerings_count": 0  # Virtual hubs use different connectivity model
                     }
+                    vnet_candidates.append(virtual_hub_info)
+            except Exception as e:
+                raise VNetCollectionError(f"Could not retrieve virtual hub details for {vwan.name} in subscription {subscription_id}: {e}") from e
+    except VNetCollectionError:
+        raise
+    except Exception as e:
+        raise VNetCollectionError(f"Could not list virtual WANs for subscription {subscription_id}: {e}") from e
+
+    # Process VNets from the Resource Graph results when available. A row the graph cannot
+    # describe fully (e.g. a missing addressSpace) sends the subscription to the SDK path
+    if graph_rows_by_subscription is not None:
+        graph_vnets = []
+        for row in graph_rows_by_subscription.get(subscription_id.lower(), []):
+            # Skip if excluded
+            if row['id'] in exclude_resource_ids:
+                logging.info("Excluding VNet: %s", row['name'])
+                continue
+            
+            try:
+                vnet_info = _build_vnet_info_from_graph(row, subscription_id, subscription_name, tenant_id,
+                                                        extract_resource_group(row['id']))
+            except Exception as e:
+                logging.warning(f"Resource Graph returned incomplete data for VNet {row.get('name')} in subscription {subscription_id}, "
+                                f"falling back to per-subscription API calls: {e}")
+                graph_vnets = None
+                break
+            # Clean out excluded VNets from peering list
+            vnet_info["peering_resource_ids"] = [
+                peer_id for peer_id in vnet_info["peering_resource_ids"]
+                if peer_id not in exclude_resource_ids
+            ]
+            vnet_info["peerings_count"] = len(vnet_info["peering_resource_ids"])
+            graph_vnets.append(vnet_info)
+        if graph_vnets is not None:
+            vnet_candidates.extend(graph_vnets)
+            return vnet_candidates
+    
+    # Process VNets
+    try:
+        # Peerings take one extra call per VNet; they are submitted as soon as each VNet
+        # is listed, so peering calls overlap with fetching the remaining list_all pages.
+        # Peering calls are leaf tasks, so sharing one pool across subscriptions cannot deadlock
+        executor = _peering_executor()
+        vnets = []
+        peering_futures = []
+        try:
+            for vnet in network_client.virtual_networks.list_all():
+                # Skip if excluded
+                if vnet.id in exclude_resource_ids:
+                    logging.info("Excluding VNet: %s", vnet.name)
+                    continue
+                vnets.append(vnet)
+                peering_futures.append(
+                    executor.submit(_list_peering_resource_ids, network_client, vnet, exclude_resource_ids)
+                )
+            
+            for vnet, peering_future in zip(vnets, peering_futures):
+                try:
+                    resource_group_name = extract_resource_group(vnet.id)
+                    vnet_info = _build_vnet_info_from_sdk(vnet, subscription_id, subscription_name, tenant_id, resource_group_name)
 
-                    # Get peerings for this VNet - clean out excluded VNets from peering list
-                    peerings = network_client.virtual_network_peerings.list(resource_group_name, vnet.name)
-                    peering_resource_ids = []
-                    for peering in peerings:
-                        if peering.remote_virtual_network and peering.remote_virtual_network.id:
-                            peer_id = peering.remote_virtual_network.id
-                            # Skip peerings to excluded VNets
-                            if peer_id not in exclude_resource_ids:
-                                peering_resource_ids.append(peer_id)
-                    
+                    peering_resource_ids = peering_future.result()
                     vnet_info["peering_resource_ids"] = peering_resource_ids
                     vnet_info["peerings_count"] = len(peering_resource_ids)
                     vnet_candidates.append(vnet_info)
                     
                 except Exception as e:
-                    error_msg = f"Could not process VNet {vnet.name} in subscription {subscription_id}: {e}"
-                    logging.error(error_msg)
-                    sys.exit(1)
-                    
+                    raise VNetCollectionError(f"Could not process VNet {vnet.name} in subscription {subscription_id}: {e}") from e
+        finally:
+            # Don't leave this subscription's queued peering calls occupying the shared pool
+            for peering_future in peering_futures:
+                peering_future.cancel()
+                
+    except VNetCollectionError:
+        raise
+    except Exception as e:
+        raise VNetCollectionError(f"Could not retrieve VNets for subscription {subscription_id}: {e}") from e
+
+    return vnet_candidates
+
+
+def get_vnet_topology_for_selected_subscriptions(subscription_ids: List[str], exclude_resource_ids: set = None) -> Dict[str, Any]:
+    """Collect all VNets and their details across selected subscriptions
+    
+    Args:
+        subscription_ids: List of subscription IDs to query
+        exclude_resource_ids: Optional set of VNet resource IDs to exclude from topology
+    """
+    network_data = {"vnets": []}
+    vnet_candidates = []
+    exclude_resource_ids = exclude_resource_ids or set()
+    
+    # One Resource Graph query returns the VNets of every selected subscription together with
+    # their subnets and peerings; if it fails, VNets are listed per subscription instead
+    graph_rows_by_subscription = None
+    if subscription_ids:
+        try:
+            graph_rows_by_subscription = _query_vnets_in_subscriptions(subscription_ids)
         except Exception as e:
-            error_msg = f"Could not retrieve VNets for subscription {subscription_id}: {e}"
-            logging.error(error_msg)
+            logging.warning(f"Resource Graph query for VNets failed, falling back to per-subscription API calls: {e}")
+    
+    # Subscriptions are independent and latency-bound, so collect them concurrently;
+    # results are merged in subscription order to keep the output deterministic
+    if subscription_ids:
+        failures = []
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(subscription_ids))) as executor:
+            subscription_futures = [
+                executor.submit(_collect_vnets_for_subscription, subscription_id, graph_rows_by_subscription, exclude_resource_ids)
+                for subscription_id in subscription_ids
+            ]
+            for subscription_id, subscription_future in zip(subscription_ids, subscription_futures):
+                try:
+                    vnet_candidates.extend(subscription_future.result())
+                except VNetCollectionError as e:
+                    failures.append((subscription_id, e))
+        
+        # Report every failed subscription, not just the first one
+        if failures:
+            for subscription_id, error in failures:
+                logging.error("Failed to collect VNets for subscription %s: %s", subscription_id, error)
             sys.exit(1)
 
     # All VNets are equal - no hub detection needed
@@ -528,10 +804,8 @@ def get_vnet_topology_for_selected_subscriptions(subscription_ids: List[str], ex
 
 def list_and_select_subscriptions() -> List[str]:
     """List all subscriptions and allow user to select"""
-    subscription_client = SubscriptionClient(get_credentials())
-    subscriptions = list(subscription_client.subscriptions.list())
     # Sort subscriptions alphabetically by display_name to ensure consistent ordinals
-    subscriptions.sort(key=lambda sub: sub.display_name)
+    subscriptions = sorted(_list_all_subscriptions(), key=lambda sub: sub.display_name)
     
     for idx, subscription in enumerate(subscriptions):
         logging.info(f"[{idx}] {subscription.display_name} ({subscription.subscription_id})")
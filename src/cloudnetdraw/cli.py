@@ -7,7 +7,8 @@ import logging
 import sys
 import shutil
 import os
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 from . import __version__
 from .azure_client import initialize_credentials, get_vnet_topology_for_selected_subscriptions
@@ -16,6 +17,57 @@ from .utils import save_to_json
 from .config import Config
 
 
+@dataclass
+class ParsedQueryArgs:
+    """Query command arguments validated and split in a single pass"""
+    subscriptions: Tuple[str, ...]
+    vnets: Tuple[str, ...]
+    empty_file_args: List[str] = field(default_factory=list)
+    empty_args: List[str] = field(default_factory=list)
+    provided_args: List[str] = field(default_factory=list)
+
+
+def _split_csv(value: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-separated argument into its non-empty, stripped values"""
+    if not value:
+        return ()
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+def _parse_query_args(args: argparse.Namespace) -> ParsedQueryArgs:
+    """Validate query command arguments and normalize comma-separated values once"""
+    subscriptions_file = getattr(args, 'subscriptions_file', None)
+    parsed = ParsedQueryArgs(
+        subscriptions=_split_csv(args.subscriptions),
+        vnets=_split_csv(args.vnets)
+    )
+    
+    # File arguments should not be empty strings
+    for arg_name, arg_value in (
+        ('--output', args.output),
+        ('--subscriptions-file', subscriptions_file),
+        ('--config-file', getattr(args, 'config_file', None))
+    ):
+        if arg_value is not None and not arg_value.strip():
+            parsed.empty_file_args.append(arg_name)
+    
+    # Mutually exclusive arguments count as provided only if they hold a usable value;
+    # comma-separated ones must contain at least one identifier after parsing
+    for arg_name, arg_value, values in (
+        ('--subscriptions', args.subscriptions, parsed.subscriptions),
+        ('--subscriptions-file', subscriptions_file, None),
+        ('--vnets', args.vnets, parsed.vnets)
+    ):
+        if arg_value is None:
+            continue
+        if not arg_value.strip() or values == ():
+            parsed.empty_args.append(arg_name)
+        else:
+            parsed.provided_args.append(arg_name)
+    
+    return parsed
+
+
 def query_command(args: argparse.Namespace) -> None:
     """Execute the query command to collect VNet topology from Azure"""
     from .azure_client import (
@@ -23,17 +75,10 @@ def query_command(args: argparse.Namespace) -> None:
         get_subscriptions_non_interactive
     )
     
-    # Validate file arguments - they should not be empty strings
-    file_args = [
-        ('--output', args.output),
-        ('--subscriptions-file', getattr(args, 'subscriptions_file', None)),
-        ('--config-file', getattr(args, 'config_file', None))
-    ]
-    
-    empty_file_args = [arg_name for arg_name, arg_value in file_args if arg_value is not None and not arg_value.strip()]
+    parsed = _parse_query_args(args)
     
-    if empty_file_args:
-        logging.error(f"Empty file path provided for: {', '.join(empty_file_args)}")
+    if parsed.empty_file_args:
+        logging.error(f"Empty file path provided for: {', '.join(parsed.empty_file_args)}")
         logging.error("File arguments cannot be empty strings in non-interactive scenarios")
         logging.error("Either provide valid file paths or omit the arguments to use defaults")
         sys.exit(1)
@@ -41,78 +86,41 @@ def query_command(args: argparse.Namespace) -> None:
     # Initialize credentials based on service principal flag
     initialize_credentials(args.service_principal)
     
-    # Validate mutually exclusive arguments
-    exclusive_args = [
-        ('--subscriptions', args.subscriptions),
-        ('--subscriptions-file', args.subscriptions_file),
-        ('--vnets', args.vnets)
-    ]
-    
-    # Check for arguments that are provided (not None) and not empty
-    # For comma-separated arguments like vnets, we need to check if there are any valid values after parsing
-    provided_args = []
-    empty_args = []
-    
-    for arg_name, arg_value in exclusive_args:
-        if arg_value is not None:
-            if not arg_value.strip():
-                # Completely empty argument
-                empty_args.append(arg_name)
-            elif arg_name == '--vnets':
-                # Special handling for comma-separated vnets - check if any valid identifiers exist
-                vnet_identifiers = [vnet.strip() for vnet in arg_value.split(',') if vnet.strip()]
-                if not vnet_identifiers:
-                    empty_args.append(arg_name)
-                else:
-                    provided_args.append(arg_name)
-            elif arg_name == '--subscriptions':
-                # Special handling for comma-separated subscriptions - check if any valid values exist
-                subscription_values = [sub.strip() for sub in arg_value.split(',') if sub.strip()]
-                if not subscription_values:
-                    empty_args.append(arg_name)
-                else:
-                    provided_args.append(arg_name)
-            else:
-                # For other arguments (like --subscriptions-file), just check if not empty after strip
-                provided_args.append(arg_name)
-    
-    if empty_args:
-        logging.error(f"Empty values provided for: {', '.join(empty_args)}")
+    if parsed.empty_args:
+        logging.error(f"Empty values provided for: {', '.join(parsed.empty_args)}")
         logging.error("Empty argument values are not allowed in non-interactive scenarios like GitHub Actions")
         logging.error("Either provide valid values or omit the arguments entirely to use interactive mode")
         sys.exit(1)
     
-    if len(provided_args) > 1:
-        logging.error(f"The following arguments are mutually exclusive: {', '.join(provided_args)}")
+    if len(parsed.provided_args) > 1:
+        logging.error(f"The following arguments are mutually exclusive: {', '.join(parsed.provided_args)}")
         logging.error("Please specify only one of: --subscriptions, --subscriptions-file, or --vnets")
         logging.error("Use --help for more information about these options")
         sys.exit(1)
     
     # Parse and resolve exclude-vnets to resource IDs if provided
     exclude_resource_ids = set()
-    if hasattr(args, 'exclude_vnets') and args.exclude_vnets:
-        exclude_identifiers = [vnet.strip() for vnet in args.exclude_vnets.split(',') if vnet.strip()]
+    exclude_identifiers = _split_csv(args.exclude_vnets) if hasattr(args, 'exclude_vnets') else ()
+    if exclude_identifiers:
+        from .utils import parse_vnet_identifier
+        from .azure_client import is_subscription_id, resolve_subscription_names_to_ids, find_hub_vnet_using_resource_graph
         
-        if exclude_identifiers:
-            from .utils import parse_vnet_identifier
-            from .azure_client import is_subscription_id, resolve_subscription_names_to_ids, find_hub_vnet_using_resource_graph
-            
-            logging.info(f"Resolving {len(exclude_identifiers)} VNet(s) to exclude")
-            for exclude_identifier in exclude_identifiers:
-                try:
-                    # Use find_hub_vnet_using_resource_graph to resolve identifier to resource_id
-                    vnet_info = find_hub_vnet_using_resource_graph(exclude_identifier)
-                    if vnet_info and vnet_info.get('resource_id'):
-                        exclude_resource_ids.add(vnet_info['resource_id'])
-                        logging.info(f"Will exclude VNet: {vnet_info['name']} ({vnet_info['resource_id']})")
-                except Exception as e:
-                    logging.error(f"Could not resolve exclude VNet identifier '{exclude_identifier}': {e}")
-                    sys.exit(1)
+        logging.info(f"Resolving {len(exclude_identifiers)} VNet(s) to exclude")
+        for exclude_identifier in exclude_identifiers:
+            try:
+                # Use find_hub_vnet_using_resource_graph to resolve identifier to resource_id
+                vnet_info = find_hub_vnet_using_resource_graph(exclude_identifier)
+                if vnet_info and vnet_info.get('resource_id'):
+                    exclude_resource_ids.add(vnet_info['resource_id'])
+                    logging.info(f"Will exclude VNet: {vnet_info['name']} ({vnet_info['resource_id']})")
+            except Exception as e:
+                logging.error(f"Could not resolve exclude VNet identifier '{exclude_identifier}': {e}")
+                sys.exit(1)
     
     # Determine subscription selection mode
     if args.vnets:
-        # VNet filtering mode - parse comma-separated VNet identifiers
-        vnet_identifiers = [vnet.strip() for vnet in args.vnets.split(',') if vnet.strip()]
+        # VNet filtering mode - identifiers were already split during validation
+        vnet_identifiers = list(parsed.vnets)
         
         if not vnet_identifiers:
             logging.error("No valid VNet identifiers provided after parsing --vnets argument")
@@ -121,6 +129,7 @@ def query_command(args: argparse.Namespace) -> None:
             
         # Collect all subscriptions needed for the VNets
         all_subscriptions = set()
+        subscription_names = []
         
         from .utils import parse_vnet_identifier
         from .azure_client import is_subscription_id, resolve_subscription_names_to_ids
@@ -133,14 +142,17 @@ def query_command(args: argparse.Namespace) -> None:
                 # Check if it's a subscription name or ID and resolve if needed
                 if is_subscription_id(subscription_id):
                     all_subscriptions.add(subscription_id)
-                else:
-                    # It's a subscription name, resolve to ID
-                    resolved_subs = resolve_subscription_names_to_ids([subscription_id])
-                    all_subscriptions.update(resolved_subs)
+                elif subscription_id not in subscription_names:
+                    # It's a subscription name, resolved together with the others below
+                    subscription_names.append(subscription_id)
             except ValueError as e:
                 logging.error(f"Invalid VNet identifier format '{vnet_identifier}': {e}")
                 sys.exit(1)
         
+        # Resolve every subscription name in one pass over the subscription list
+        if subscription_names:
+            all_subscriptions.update(resolve_subscription_names_to_ids(subscription_names))
+        
         selected_subscriptions = list(all_subscriptions)
         logging.info(f"Filtering topology for hub VNets: {args.vnets}")
         topology = get_filtered_vnets_topology(vnet_identifiers, selected_subscriptions, exclude_resource_ids)
@@ -188,7 +200,7 @@ def hld_command(args: argparse.Namespace) -> None:
     from .diagram_generator import generate_hld_diagram
     
     logging.info("Starting HLD diagram generation...")
-    generate_hld_diagram(output_file, topology_file, config)
+    generate_hld_diagram(output_file, topology_file, config, compress=getattr(args, 'compress', False))
     logging.info("HLD diagram generation complete.")
     logging.info(f"HLD diagram saved to {output_file}")
 
@@ -220,7 +232,7 @@ def mld_command(args: argparse.Namespace) -> None:
     from .diagram_generator import generate_mld_diagram
     
     logging.info("Starting MLD diagram generation...")
-    generate_mld_diagram(output_file, topology_file, config)
+    generate_mld_diagram(output_file, topology_file, config, compress=getattr(args, 'compress', False))
     logging.info("MLD diagram generation complete.")
     logging.info(f"MLD diagram saved to {output_file}")
 
@@ -301,6 +313,8 @@ def create_parser() -> argparse.ArgumentParser:
                            help='Input topology JSON file (default: network_topology.json)')
     hld_parser.add_argument('-c', '--config-file',
                            help='Configuration file (uses bundled default if not specified)')
+    hld_parser.add_argument('-z', '--compress', action='store_true',
+                           help="Store the diagram in draw.io's compressed format to reduce output size")
     hld_parser.add_argument('-v', '--verbose', action='store_true',
                            help='Enable verbose logging')
     hld_parser.set_defaults(func=hld_command)
@@ -314,6 +328,8 @@ def create_parser() -> argparse.ArgumentParser:
                            help='Input topology JSON file (default: network_topology.json)')
     mld_parser.add_argument('-c', '--config-file',
                            help='Configuration file (uses bundled default if not specified)')
+    mld_parser.add_argument('-z', '--compress', action='store_true',
+                           help="Store the diagram in draw.io's compressed format to reduce output size")
     mld_parser.add_argument('-v', '--verbose', action='store_true',
                            help='Enable verbose logging')
     mld_parser.set_defaults(func=mld_command)
@@ -4,7 +4,13 @@ Loads YAML configuration and provides easy access to settings
 """
 import yaml
 import os
+from functools import cached_property
 from typing import Dict, Any, Tuple, List, Union
+# Prefer the libyaml C parser; PyYAML builds without it fall back to the pure-Python loader
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 try:
     from importlib.resources import files
 except ImportError:
@@ -16,7 +22,10 @@ class ConfigValidationError(Exception):
     pass
 
 class Config:
-    """Configuration manager for CloudNet Draw"""
+    """Configuration manager for CloudNet Draw
+    
+    Settings are read-only once loaded, so the accessor properties are cached per instance.
+    """
     
     # Expected configuration schema
     EXPECTED_SCHEMA = {
@@ -133,10 +142,24 @@ class Config:
         }
     }
     
+    # draw.io style templates, filled from a styling section with str.format_map
+    _VNET_STYLE_TEMPLATE = ("shape=rectangle;rounded=0;whiteSpace=wrap;html=1;"
+                            "strokeColor={border_color};fontColor={font_color};"
+                            "fillColor={fill_color};verticalAlign=top;align={text_align}")
+    _SUBNET_STYLE_TEMPLATE = ("shape=rectangle;rounded=0;whiteSpace=wrap;html=1;"
+                              "strokeColor={border_color};fontColor={font_color};"
+                              "fillColor={fill_color};align={text_align}")
+    
     def __init__(self, config_file: str = None):
         self.config_file = self._find_config_file(config_file)
         self._config = self._load_config()
         self._validate_config()
+        # Style strings depend only on the validated config, so format them once
+        self._vnet_style_strings = {
+            vnet_type: self._VNET_STYLE_TEMPLATE.format_map(style)
+            for vnet_type, style in (('hub', self.hub_style), ('spoke', self.spoke_style), ('non_peered', self.non_peered_style))
+        }
+        self._subnet_style_string = self._SUBNET_STYLE_TEMPLATE.format_map(self.subnet_style)
     
     def _find_config_file(self, config_file: str = None) -> str:
         """Find configuration file using hierarchical search strategy"""
@@ -177,7 +200,7 @@ class Config:
             raise FileNotFoundError(f"Configuration file {self.config_file} not found")
         
         with open(self.config_file, 'r') as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=_YamlLoader)
     
     def _validate_config(self) -> None:
         """Validate configuration against expected schema"""
@@ -232,79 +255,64 @@ class Config:
         else:
             raise ValueError(f"Invalid schema definition at {path}")
     
-    @property
+    @cached_property
     def hub_threshold(self) -> int:
         """Get the peering count threshold for hub classification"""
         return self._config['thresholds']['hub_peering_count']
     
-    @property
+    @cached_property
     def hub_style(self) -> Dict[str, str]:
         """Get hub VNet styling"""
         return self._config['styles']['hub']
     
-    @property
+    @cached_property
     def spoke_style(self) -> Dict[str, str]:
         """Get spoke VNet styling"""
         return self._config['styles']['spoke']
     
-    @property
+    @cached_property
     def non_peered_style(self) -> Dict[str, str]:
         """Get non-peered VNet styling"""
         return self._config['styles']['non_peered']
     
-    @property
+    @cached_property
     def subnet_style(self) -> Dict[str, str]:
         """Get subnet styling"""
         return self._config['subnet']
     
-    @property
+    @cached_property
     def layout(self) -> Dict[str, Any]:
         """Get layout settings"""
         return self._config['layout']
     
-    @property
+    @cached_property
     def edges(self) -> Dict[str, Any]:
         """Get edge/connection styling"""
         return self._config['edges']
     
-    @property
+    @cached_property
     def icons(self) -> Dict[str, Dict[str, Any]]:
         """Get icon settings"""
         return self._config['icons']
     
-    @property
+    @cached_property
     def icon_positioning(self) -> Dict[str, Any]:
         """Get icon positioning settings"""
         return self._config['icon_positioning']
     
-    @property
+    @cached_property
     def drawio(self) -> Dict[str, Any]:
         """Get draw.io specific settings"""
         return self._config['drawio']
     
     def get_vnet_style_string(self, vnet_type: str) -> str:
         """Get formatted style string for draw.io VNet elements"""
-        if vnet_type == 'hub':
-            style = self.hub_style
-        elif vnet_type == 'spoke':
-            style = self.spoke_style
-        elif vnet_type == 'non_peered':
-            style = self.non_peered_style
-        else:
-            style = self.hub_style  # Default to hub style
-        
-        return (f"shape=rectangle;rounded=0;whiteSpace=wrap;html=1;"
-                f"strokeColor={style['border_color']};"
-                f"fontColor={style['font_color']};"
-                f"fillColor={style['fill_color']};verticalAlign=top;align={style['text_align']}")
+        vnet_style_strings = self._vnet_style_strings
+        return vnet_style_strings.get(vnet_type, vnet_style_strings['hub'])  # Default to hub style
     
     def get_subnet_style_string(self) -> str:
         """Get formatted style string for subnet elements"""
-        subnet = self.subnet_style
-        return (f"shape=rectangle;rounded=0;whiteSpace=wrap;html=1;"
-                f"strokeColor={subnet['border_color']};"
-                f"fontColor={subnet['font_color']};"
-                f"fillColor={subnet['fill_color']};align={subnet['text_align']}")
+        return self._subnet_style_string
     
     def get_edge_style_string(self) -> str:
         """Get formatted style string for edge connections (spoke-to-spoke edges)"""
@@ -335,32 +343,32 @@ class Config:
         """Get draw.io canvas attributes"""
         return self.drawio['canvas']
     
-    @property
+    @cached_property
     def canvas_padding(self) -> int:
         """Get canvas padding value (CANVAS_PADDING constant)"""
         return self.layout['canvas']['padding']
     
-    @property
+    @cached_property
     def zone_spacing(self) -> int:
         """Get zone spacing value (ZONE_SPACING constant)"""
         return self.layout['zone']['spacing']
     
-    @property
+    @cached_property
     def vnet_width(self) -> int:
         """Get VNet width value (VNET_WIDTH constant)"""
         return self.layout['vnet']['width']
     
-    @property
+    @cached_property
     def vnet_spacing_x(self) -> int:
         """Get VNet horizontal spacing"""
         return self.layout['vnet']['spacing_x']
     
-    @property
+    @cached_property
     def vnet_spacing_y(self) -> int:
         """Get VNet vertical spacing"""
         return self.layout['vnet']['spacing_y']
     
-    @property
+    @cached_property
     def group_height_extra(self) -> int:
         """Get group extra height value (GROUP_HEIGHT_EXTRA constant)"""
         return self.drawio['group']['extra_height']
@@ -2,15 +2,35 @@
 Diagram generation functions for DrawIO XML output
 Handles unified HLD/MLD generation, VNet rendering, and XML structure
 """
+import base64
 import json
 import logging
 import sys
+import zlib
+from urllib.parse import quote
 from typing import Dict, List, Any, Optional
 
-from .layout import _classify_spoke_vnets, _create_layout_zones
-from .edge_system import EdgeClassifier, EdgeRenderer
-from .topology import create_vnet_id_mapping
-from .utils import generate_hierarchical_id
+from .layout import _classify_spoke_vnets, _create_layout_zones, _hub_identities
+from .edge_system import EdgeClassifier, EdgeRenderer, _xml_attr
+from .topology import create_layout_vnet_id_mapping
+from .utils import generate_hierarchical_id, hierarchical_id_base
+
+
+# VNet decorator icons in right-to-left order: (icon type, VNet flag field or None if always shown, ID suffix)
+_VNET_ICON_SPECS = (
+    ('vnet', None, 'vnet'),
+    ('expressroute', 'expressroute', 'expressroute'),
+    ('firewall', 'firewall', 'firewall'),
+    ('vpn_gateway', 'vpn_gateway', 'vpn'),
+)
+
+# Subnet icons in right-to-left order: (icon type, subnet flag field or None if always shown,
+# ID prefix, whether the icon uses the subnet icon y offset rather than the decorator one)
+_SUBNET_ICON_SPECS = (
+    ('subnet', None, 'subnet', True),
+    ('route_table', 'udr', 'udr', False),
+    ('nsg', 'nsg', 'nsg', False),
+)
 
 
 def _load_and_validate_topology(topology_file: str) -> List[Dict[str, Any]]:
@@ -44,9 +64,10 @@ def _classify_spokes_by_connection_type(vnets: List[Dict[str, Any]], hub_vnets:
     
     # Create set of hub resource IDs for quick lookup
     hub_resource_ids = {hub.get('resource_id') for hub in hub_vnets if hub.get('resource_id')}
+    hub_identities = _hub_identities(hub_vnets)
     
     for vnet in vnets:
-        if vnet in hub_vnets:
+        if id(vnet) in hub_identities:
             continue  # Skip hubs themselves
             
         peering_resource_ids = vnet.get('peering_resource_ids', [])
@@ -68,6 +89,13 @@ def _classify_spokes_by_connection_type(vnets: List[Dict[str, Any]], hub_vnets:
     return hub_connected_spokes, hubless_spokes, unpeered_vnets
 
 
+def _add_geometry(parent: Any, x: Any, y: Any, width: Any, height: Any) -> Any:
+    """Add an absolute mxGeometry child to a cell; coordinates may be numbers or pre-formatted strings"""
+    from lxml import etree
+    
+    return etree.SubElement(parent, "mxGeometry", x=str(x), y=str(y), width=str(width), height=str(height), **{"as": "geometry"})
+
+
 def _setup_xml_structure(config: Any) -> tuple:
     """Extract common XML document structure setup"""
     from lxml import etree
@@ -81,6 +109,9 @@ def _setup_xml_structure(config: Any) -> tuple:
         attrib=config.get_canvas_attributes(),
     )
     root = etree.SubElement(mxGraphModel, "root")
+    # mxfile and the cells created with SubElement(root, ...) share one lxml document.
+    # Edge and subnet cells are parsed from text into their own documents instead, and
+    # root.extend() moves them across; that move is cheaper than building them here.
 
     etree.SubElement(root, "mxCell", id="0")  # Root cell
     etree.SubElement(root, "mxCell", id="1", parent="0")  # Parent cell for all shapes
@@ -114,6 +145,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
     group_id = generate_hierarchical_id(vnet_data, 'group')
     
     # Build attributes dictionary with metadata - group objects should have empty labels
+    azure_console_url = vnet_data.get('azure_console_url', '')
     group_attrs = {
         "id": group_id,
         "label": "",  # Group objects have empty labels
@@ -123,8 +155,8 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
         "resourcegroup_id": vnet_data.get('resourcegroup_id', ''),
         "resourcegroup_name": vnet_data.get('resourcegroup_name', ''),
         "resource_id": vnet_data.get('resource_id', ''),
-        "azure_console_url": vnet_data.get('azure_console_url', ''),
-        "link": vnet_data.get('azure_console_url', '')
+        "azure_console_url": azure_console_url,
+        "link": azure_console_url
     }
     
     group_element = etree.SubElement(root, "object", attrib=group_attrs)
@@ -138,11 +170,7 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
         connectable="0" if not show_subnets else config.drawio['group']['connectable'],
         parent="1"
     )
-    etree.SubElement(
-        group_cell,
-        "mxGeometry",
-        attrib={"x": str(x_offset), "y": str(y_offset), "width": str(group_width), "height": str(group_height), "as": "geometry"},
-    )
+    _add_geometry(group_cell, x_offset, y_offset, group_width, group_height)
     
     # Choose default style based on mode
     if show_subnets:
@@ -163,8 +191,8 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
         "resourcegroup_id": vnet_data.get('resourcegroup_id', ''),
         "resourcegroup_name": vnet_data.get('resourcegroup_name', ''),
         "resource_id": vnet_data.get('resource_id', ''),
-        "azure_console_url": vnet_data.get('azure_console_url', ''),
-        "link": vnet_data.get('azure_console_url', '')
+        "azure_console_url": azure_console_url,
+        "link": azure_console_url
     }
     
     vnet_element = etree.SubElement(root, "object", attrib=vnet_attrs)
@@ -180,16 +208,13 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
     
     # Set VNet box geometry based on mode
     vnet_box_width = group_width if show_subnets else 400
-    etree.SubElement(
-        vnet_cell,
-        "mxGeometry",
-        attrib={"x": "0", "y": "0", "width": str(vnet_box_width), "height": str(vnet_height), "as": "geometry"},
-    )
+    _add_geometry(vnet_cell, "0", "0", vnet_box_width, vnet_height)
 
     # Add Virtual Hub icon if applicable
     if vnet_data.get("type") == "virtual_hub":
         if show_subnets:
             hub_icon_width, hub_icon_height = config.get_icon_size('virtual_hub')
+            hub_icon_positioning = config.icon_positioning['virtual_hub_icon']
             virtualhub_icon_id = generate_hierarchical_id(vnet_data, 'icon', 'virtualhub')
             virtual_hub_icon = etree.SubElement(
                 root,
@@ -199,16 +224,12 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                 vertex="1",
                 parent=group_id,
             )
-            etree.SubElement(
+            _add_geometry(
                 virtual_hub_icon,
-                "mxGeometry",
-                attrib={
-                    "x": str(config.icon_positioning['virtual_hub_icon']['offset_x']),
-                    "y": str(vnet_height + config.icon_positioning['virtual_hub_icon']['offset_y']),
-                    "width": str(hub_icon_width),
-                    "height": str(hub_icon_height),
-                    "as": "geometry"
-                },
+                hub_icon_positioning['offset_x'],
+                vnet_height + hub_icon_positioning['offset_y'],
+                hub_icon_width,
+                hub_icon_height,
             )
         else:
             virtualhub_icon_id = generate_hierarchical_id(vnet_data, 'icon', 'virtualhub')
@@ -220,229 +241,102 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
                 vertex="1",
                 parent=group_id,
             )
-            etree.SubElement(
-                virtual_hub_icon,
-                "mxGeometry",
-                attrib={"x": "-10", "y": str(vnet_height - 15), "width": "20", "height": "20", "as": "geometry"},
-            )
+            _add_geometry(virtual_hub_icon, "-10", vnet_height - 15, "20", "20")
     
     # Dynamic VNet icon positioning (top-right aligned)
     vnet_width = group_width if show_subnets else config.vnet_width
-    icon_y_offset = config.icon_positioning['vnet_icons']['y_offset']
-    right_margin = config.icon_positioning['vnet_icons']['right_margin']
-    icon_gap = config.icon_positioning['vnet_icons']['icon_gap']
-    
-    # Build list of VNet decorator icons to display (right to left order)
-    vnet_icons_to_render = []
-    
-    # VNet icon is always present (rightmost)
-    vnet_icon_width, vnet_icon_height = config.get_icon_size('vnet')
-    vnet_icons_to_render.append({
-        'type': 'vnet',
-        'width': vnet_icon_width,
-        'height': vnet_icon_height
-    })
-    
-    # ExpressRoute icon (if present)
-    if vnet_data.get("expressroute", "").lower() == "yes":
-        express_width, express_height = config.get_icon_size('expressroute')
-        vnet_icons_to_render.append({
-            'type': 'expressroute',
-            'width': express_width,
-            'height': express_height
-        })
-    
-    # Firewall icon (if present)
-    if vnet_data.get("firewall", "").lower() == "yes":
-        firewall_width, firewall_height = config.get_icon_size('firewall')
-        vnet_icons_to_render.append({
-            'type': 'firewall',
-            'width': firewall_width,
-            'height': firewall_height
-        })
-    
-    # VPN Gateway icon (if present, leftmost)
-    if vnet_data.get("vpn_gateway", "").lower() == "yes":
-        vpn_width, vpn_height = config.get_icon_size('vpn_gateway')
-        vnet_icons_to_render.append({
-            'type': 'vpn_gateway',
-            'width': vpn_width,
-            'height': vpn_height
-        })
-    
-    # Calculate positions from right to left
+    vnet_icon_positioning = config.icon_positioning['vnet_icons']
+    icon_y_offset = vnet_icon_positioning['y_offset']
+    right_margin = vnet_icon_positioning['right_margin']
+    icon_gap = vnet_icon_positioning['icon_gap']
+    
+    # VNet decorator icons, right to left: the VNet icon is always present, the rest follow their flags
     current_x = vnet_width - right_margin
-    for icon in vnet_icons_to_render:
-        current_x -= icon['width']
-        icon['x'] = current_x
+    for icon_type, flag_field, id_suffix in _VNET_ICON_SPECS:
+        if flag_field is not None and vnet_data.get(flag_field, "").lower() != "yes":
+            continue
         
-        # Create the icon element as child of VNet using hierarchical IDs
-        if icon['type'] == 'vnet':
-            icon_id = generate_hierarchical_id(vnet_data, 'icon', 'vnet')
-            icon_element = etree.SubElement(
-                root,
-                "mxCell",
-                id=icon_id,
-                style=f"shape=image;html=1;image={config.get_icon_path('vnet')};",
-                vertex="1",
-                parent=main_id,  # Parent to VNet main element
-            )
-        elif icon['type'] == 'expressroute':
-            icon_id = generate_hierarchical_id(vnet_data, 'icon', 'expressroute')
-            icon_element = etree.SubElement(
-                root,
-                "mxCell",
-                id=icon_id,
-                style=f"shape=image;html=1;image={config.get_icon_path('expressroute')};",
-                vertex="1",
-                parent=main_id,  # Parent to VNet main element
-            )
-        elif icon['type'] == 'firewall':
-            icon_id = generate_hierarchical_id(vnet_data, 'icon', 'firewall')
-            icon_element = etree.SubElement(
-                root,
-                "mxCell",
-                id=icon_id,
-                style=f"shape=image;html=1;image={config.get_icon_path('firewall')};",
-                vertex="1",
-                parent=main_id,  # Parent to VNet main element
-            )
-        elif icon['type'] == 'vpn_gateway':
-            icon_id = generate_hierarchical_id(vnet_data, 'icon', 'vpn')
-            icon_element = etree.SubElement(
-                root,
-                "mxCell",
-                id=icon_id,
-                style=f"shape=image;html=1;image={config.get_icon_path('vpn_gateway')};",
-                vertex="1",
-                parent=main_id,  # Parent to VNet main element
-            )
+        icon_width, icon_height = config.get_icon_size(icon_type)
+        current_x -= icon_width
         
-        etree.SubElement(
-            icon_element,
-            "mxGeometry",
-            attrib={
-                "x": str(icon['x']),
-                "y": str(icon_y_offset),
-                "width": str(icon['width']),
-                "height": str(icon['height']),
-                "as": "geometry"
-            },
+        # Create the icon element as child of VNet using hierarchical IDs
+        icon_element = etree.SubElement(
+            root,
+            "mxCell",
+            id=generate_hierarchical_id(vnet_data, 'icon', id_suffix),
+            style=f"shape=image;html=1;image={config.get_icon_path(icon_type)};",
+            vertex="1",
+            parent=main_id,  # Parent to VNet main element
         )
+        _add_geometry(icon_element, current_x, icon_y_offset, icon_width, icon_height)
         
         current_x -= icon_gap
 
     # Add subnets if in MLD mode and it's a regular VNet
-    if show_subnets and vnet_data.get("type") != "virtual_hub":
-        for subnet_index, subnet in enumerate(vnet_data.get("subnets", [])):
-            subnet_id = generate_hierarchical_id(vnet_data, 'subnet', str(subnet_index))
-            subnet_cell = etree.SubElement(
-                root,
-                "mxCell",
-                id=subnet_id,
-                style=config.get_subnet_style_string(),
-                vertex="1",
-                parent=main_id,
+    subnets = vnet_data.get("subnets", [])
+    if show_subnets and vnet_data.get("type") != "virtual_hub" and subnets:
+        # Config lookups are the same for every subnet, so resolve them once per VNet
+        subnet_layout = config.layout['subnet']
+        subnet_padding_x = subnet_layout['padding_x']
+        subnet_padding_y = subnet_layout['padding_y']
+        subnet_spacing_y = subnet_layout['spacing_y']
+        subnet_style = _xml_attr(config.get_subnet_style_string())
+        subnet_parent = _xml_attr(main_id)
+        # Every subnet and icon ID shares the VNet's hierarchical base, so build the prefixes once
+        base_id, separator = hierarchical_id_base(vnet_data)
+        subnet_id_prefix = _xml_attr(f"{base_id}{separator}subnet{separator}")
+        icon_id_prefix = _xml_attr(f"{base_id}{separator}icon{separator}")
+        # Geometry attributes that are the same for every subnet, formatted once
+        subnet_geometry_x = f'x="{subnet_padding_x}"'
+        subnet_geometry_size = f'width="{subnet_layout["width"]}" height="{subnet_layout["height"]}"'
+        subnet_right_edge = subnet_padding_x + subnet_layout['width']
+        subnet_icon_positioning = config.icon_positioning['subnet_icons']
+        subnet_icon_gap = subnet_icon_positioning['icon_gap']
+        subnet_icon_y_offset = subnet_icon_positioning['subnet_icon_y_offset']
+        decorator_icon_y_offset = subnet_icon_positioning['icon_y_offset']
+        
+        # Icon width, style and formatted size attributes, resolved on first use so configs
+        # without optional icons still work
+        icon_specs = {}
+        def icon_spec(icon_type):
+            if icon_type not in icon_specs:
+                icon_width, icon_height = config.get_icon_size(icon_type)
+                icon_style = _xml_attr(f"shape=image;html=1;image={config.get_icon_path(icon_type)};")
+                icon_specs[icon_type] = (icon_width, icon_style, f'width="{icon_width}" height="{icon_height}"')
+            return icon_specs[icon_type]
+        
+        # Subnet and icon cells are written as XML text and parsed once per VNet, which is
+        # several times cheaper than two SubElement calls per cell (same approach as EdgeRenderer)
+        fragments = []
+        for subnet_index, subnet in enumerate(subnets):
+            subnet_value = _xml_attr(f"{subnet['name']} {subnet['address']}")
+            subnet_y_offset = subnet_padding_y + subnet_index * subnet_spacing_y
+            fragments.append(
+                f'<mxCell id="{subnet_id_prefix}{subnet_index}" style="{subnet_style}" vertex="1" parent="{subnet_parent}" value="{subnet_value}">'
+                f'<mxGeometry {subnet_geometry_x} y="{subnet_y_offset}" {subnet_geometry_size} as="geometry"/>'
+                f'</mxCell>'
             )
-            subnet_cell.set("value", f"{subnet['name']} {subnet['address']}")
-            subnet_y_offset = config.layout['subnet']['padding_y'] + subnet_index * config.layout['subnet']['spacing_y']
-            etree.SubElement(subnet_cell, "mxGeometry", attrib={
-                "x": str(config.layout['subnet']['padding_x']),
-                "y": str(subnet_y_offset),
-                "width": str(config.layout['subnet']['width']),
-                "height": str(config.layout['subnet']['height']),
-                "as": "geometry"
-            })
-
-            # Add subnet icons
-            subnet_right_edge = config.layout['subnet']['padding_x'] + config.layout['subnet']['width']
-            icon_gap = config.icon_positioning['subnet_icons']['icon_gap']
-            
-            # Build list of icons to display (right to left order)
-            icons_to_render = []
-            
-            # Subnet icon is always present (rightmost)
-            subnet_width, subnet_height = config.get_icon_size('subnet')
-            icons_to_render.append({
-                'type': 'subnet',
-                'width': subnet_width,
-                'height': subnet_height,
-                'y_offset': config.icon_positioning['subnet_icons']['subnet_icon_y_offset']
-            })
-            
-            # UDR icon (if present)
-            if subnet.get("udr", "").lower() == "yes":
-                udr_width, udr_height = config.get_icon_size('route_table')
-                icons_to_render.append({
-                    'type': 'udr',
-                    'width': udr_width,
-                    'height': udr_height,
-                    'y_offset': config.icon_positioning['subnet_icons']['icon_y_offset']
-                })
-            
-            # NSG icon (if present, leftmost)
-            if subnet.get("nsg", "").lower() == "yes":
-                nsg_width, nsg_height = config.get_icon_size('nsg')
-                icons_to_render.append({
-                    'type': 'nsg',
-                    'width': nsg_width,
-                    'height': nsg_height,
-                    'y_offset': config.icon_positioning['subnet_icons']['icon_y_offset']
-                })
-            
-            # Calculate positions from right to left
+
+            # Subnet icon is always present (rightmost); UDR and NSG follow their flags, right to left
             current_x = subnet_right_edge
-            for icon in icons_to_render:
-                current_x -= icon['width']
-                icon['x'] = current_x
-                
-                # Create the icon element
-                icon_y = subnet_y_offset + icon['y_offset']
+            for icon_type, flag_field, id_prefix, uses_subnet_offset in _SUBNET_ICON_SPECS:
+                if flag_field is not None and subnet.get(flag_field, "").lower() != "yes":
+                    continue
                 
-                if icon['type'] == 'subnet':
-                    subnet_icon_id = generate_hierarchical_id(vnet_data, 'icon', f'subnet_{subnet_index}')
-                    icon_element = etree.SubElement(
-                        root,
-                        "mxCell",
-                        id=subnet_icon_id,
-                        style=f"shape=image;html=1;image={config.get_icon_path('subnet')};",
-                        vertex="1",
-                        parent=main_id,
-                    )
-                elif icon['type'] == 'udr':
-                    udr_icon_id = generate_hierarchical_id(vnet_data, 'icon', f'udr_{subnet_index}')
-                    icon_element = etree.SubElement(
-                        root,
-                        "mxCell",
-                        id=udr_icon_id,
-                        style=f"shape=image;html=1;image={config.get_icon_path('route_table')};",
-                        vertex="1",
-                        parent=main_id,
-                    )
-                elif icon['type'] == 'nsg':
-                    nsg_icon_id = generate_hierarchical_id(vnet_data, 'icon', f'nsg_{subnet_index}')
-                    icon_element = etree.SubElement(
-                        root,
-                        "mxCell",
-                        id=nsg_icon_id,
-                        style=f"shape=image;html=1;image={config.get_icon_path('nsg')};",
-                        vertex="1",
-                        parent=main_id,
-                    )
+                icon_width, icon_style, icon_size = icon_spec(icon_type)
+                icon_offset_y = subnet_icon_y_offset if uses_subnet_offset else decorator_icon_y_offset
+                current_x -= icon_width
                 
-                etree.SubElement(
-                    icon_element,
-                    "mxGeometry",
-                    attrib={
-                        "x": str(icon['x']),
-                        "y": str(icon_y),
-                        "width": str(icon['width']),
-                        "height": str(icon['height']),
-                        "as": "geometry"
-                    },
+                # Create the icon element
+                fragments.append(
+                    f'<mxCell id="{icon_id_prefix}{id_prefix}_{subnet_index}" style="{icon_style}" vertex="1" parent="{subnet_parent}">'
+                    f'<mxGeometry x="{current_x}" y="{subnet_y_offset + icon_offset_y}" {icon_size} as="geometry"/>'
+                    f'</mxCell>'
                 )
                 
-                current_x -= icon_gap
+                current_x -= subnet_icon_gap
+        
+        root.extend(etree.fromstring("<cells>" + "".join(fragments) + "</cells>"))
 
     # Track VNet position if positions dict provided (works for both HLD and MLD modes)
     if vnet_positions is not None:
@@ -471,7 +365,24 @@ def _add_vnet_with_optional_subnets(vnet_data, x_offset, y_offset, root, config,
     return group_height
 
 
-def generate_diagram(filename: str, topology_file: str, config: Any, render_mode: str = 'hld') -> None:
+def _compress_diagram(diagram) -> None:
+    """Replace the mxGraphModel child of a <diagram> with draw.io's compressed encoding.
+
+    draw.io stores a compressed page as base64 of the raw-deflated, URI-encoded
+    mxGraphModel XML, so the file stays a plain .drawio that draw.io opens directly.
+    """
+    from lxml import etree
+
+    model = diagram.find("mxGraphModel")
+    xml = etree.tostring(model, encoding="unicode")
+    deflater = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    data = deflater.compress(quote(xml, safe="~()*!.'").encode("ascii")) + deflater.flush()
+    diagram.remove(model)
+    diagram.text = base64.b64encode(data).decode("ascii")
+
+
+def generate_diagram(filename: str, topology_file: str, config: Any, render_mode: str = 'hld',
+                     compress: bool = False) -> None:
     """
     Unified diagram generation function that handles both HLD and MLD modes
     
@@ -480,6 +391,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
         topology_file: Input topology JSON file
         config: Configuration object
         render_mode: 'hld' for high-level (VNets only) or 'mld' for mid-level (VNets + subnets)
+        compress: Store the diagram in draw.io's compressed <diagram> encoding
     """
     from lxml import etree
     
@@ -514,6 +426,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
     if show_subnets:
         # MLD mode: dynamic spacing with padding for subnets
         spacing = 20  # Original MLD padding
+        group_extra_height = config.drawio['group']['extra_height']
     else:
         # HLD mode: fixed spacing
         spacing = 100
@@ -527,13 +440,15 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
     # Track zone bottoms for unpeered VNet placement
     zone_bottoms = []
     
+    # Style strings are identical for every spoke, so resolve them once
+    spoke_style = config.get_vnet_style_string('spoke')
+    
     # Draw each zone using direct arrays
     for zone_index, hub_vnet in enumerate(hub_vnets):
         zone_offset_x = zone_index * (zone_width + zone_spacing)
         
         # Draw hub
         hub_x = base_hub_x + zone_offset_x
-        hub_main_id = generate_hierarchical_id(hub_vnet, 'main')
         hub_actual_height = _add_vnet_with_optional_subnets(hub_vnet, hub_x, hub_y, root, config, show_subnets=show_subnets, vnet_positions=vnet_positions, hub_vnets=hub_vnets)
         
         # Get spokes for this zone using simple array access
@@ -550,54 +465,33 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
             left_spokes = []
             right_spokes = spokes
         
-        # Calculate hub VNet height for MLD mode
+        # Hub VNet height for MLD mode is the rendered group height minus its extra padding
         if show_subnets:
-            num_subnets = len(hub_vnet.get("subnets", []))
-            hub_vnet_height = config.layout['hub']['height'] if hub_vnet.get("type") == "virtual_hub" else config.layout['subnet']['padding_y'] + (num_subnets * config.layout['subnet']['spacing_y'])
+            hub_vnet_height = hub_actual_height - group_extra_height
             # Add vertical space between hub bottom and spoke tops (same as spacing between spokes)
-            current_y_right = hub_y + hub_vnet_height + spacing
-            current_y_left = hub_y + hub_vnet_height + spacing
+            first_spoke_y = hub_y + hub_vnet_height + spacing
         else:
             hub_height = 50
             # Add vertical space between hub bottom and spoke tops (same as spacing between spokes)
-            current_y_right = hub_y + hub_height + spacing
-            current_y_left = hub_y + hub_height + spacing
+            first_spoke_y = hub_y + hub_height + spacing
         
-        # Draw right spokes
-        for index, spoke in enumerate(right_spokes):
-            if show_subnets:
-                y_position = current_y_right
-            else:
-                # Add vertical space between hub bottom and first spoke, then normal spacing
-                y_position = hub_y + hub_height + spacing + index * spacing
-            x_position = base_right_x + zone_offset_x
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
-            
-            spoke_style = config.get_vnet_style_string('spoke')
-            vnet_height = _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style, vnet_positions=vnet_positions, hub_vnets=hub_vnets)
-            
-            # NOTE: Edge connections now handled by unified edge system
-            
-            if show_subnets:
-                current_y_right += vnet_height + spacing
-        
-        # Draw left spokes
-        for index, spoke in enumerate(left_spokes):
-            if show_subnets:
-                y_position = current_y_left
-            else:
-                # Add vertical space between hub bottom and first spoke, then normal spacing
-                y_position = hub_y + hub_height + spacing + index * spacing
-            x_position = base_left_x + zone_offset_x
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
-            
-            spoke_style = config.get_vnet_style_string('spoke')
-            vnet_height = _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style, vnet_positions=vnet_positions, hub_vnets=hub_vnets)
-            
-            # NOTE: Edge connections now handled by unified edge system
-            
-            if show_subnets:
-                current_y_left += vnet_height + spacing
+        # Draw right spokes, then left spokes; each column sits at a fixed x per zone.
+        # MLD stacks spokes by their actual heights, HLD spaces them evenly below the hub.
+        column_bottoms = []
+        for column_spokes, x_position in ((right_spokes, base_right_x + zone_offset_x),
+                                          (left_spokes, base_left_x + zone_offset_x)):
+            current_y = first_spoke_y
+            for index, spoke in enumerate(column_spokes):
+                y_position = current_y if show_subnets else first_spoke_y + index * spacing
+                
+                vnet_height = _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style, vnet_positions=vnet_positions, hub_vnets=hub_vnets)
+                
+                # NOTE: Edge connections now handled by unified edge system
+                
+                if show_subnets:
+                    current_y += vnet_height + spacing
+            column_bottoms.append(current_y)
+        current_y_right, current_y_left = column_bottoms
         
         # Track zone bottom for unpeered placement
         if show_subnets:
@@ -631,10 +525,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
         current_y_hubless = hub_y
         for index, spoke in enumerate(hubless_spokes):
             y_position = current_y_hubless + index * spacing
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
             
-            # Use spoke styling for hubless spokes
-            spoke_style = config.get_vnet_style_string('spoke')
             vnet_height = _add_vnet_with_optional_subnets(spoke, hubless_zone_x, y_position, root, config, show_subnets=show_subnets, style_override=spoke_style, vnet_positions=vnet_positions, hub_vnets=hub_vnets)
             
             if show_subnets:
@@ -659,6 +550,7 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
         unpeered_spacing = config.vnet_width + 50
         vnets_per_row = max(1, int(total_zones_width // unpeered_spacing))
         row_height = 120 if show_subnets else 70
+        nonpeered_style = config.get_vnet_style_string('non_peered')
         
         for index, spoke in enumerate(unpeered_vnets):
             row_number = index // vnets_per_row
@@ -666,32 +558,11 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
             
             x_position = base_left_x + (position_in_row * unpeered_spacing)
             y_position = unpeered_y + (row_number * row_height)
-            spoke_main_id = generate_hierarchical_id(spoke, 'main')
             
-            nonpeered_style = config.get_vnet_style_string('non_peered')
             _add_vnet_with_optional_subnets(spoke, x_position, y_position, root, config, show_subnets=show_subnets, style_override=nonpeered_style, vnet_positions=vnet_positions, hub_vnets=hub_vnets)
 
-    # Create simplified zones for backward compatibility with mapping function
-    zones = []
-    for hub_index, hub_vnet in enumerate(hub_vnets):
-        zones.append({
-            'hub': hub_vnet,
-            'hub_index': hub_index,
-            'spokes': zone_spokes[hub_index],
-            'non_peered': unpeered_vnets if hub_index == 0 else []
-        })
-    
-    # Add hubless zone if needed
-    if hubless_spokes:
-        zones.append({
-            'hub': None,  # No hub for hubless zone
-            'hub_index': len(hub_vnets),
-            'spokes': hubless_spokes,
-            'non_peered': []
-        })
-
     # Create VNet ID mapping for peering connections (include hubless spokes)
-    vnet_mapping = create_vnet_id_mapping(vnets, zones, unpeered_vnets)
+    vnet_mapping = create_layout_vnet_id_mapping(hub_vnets, zone_spokes, hubless_spokes, unpeered_vnets)
     
     # Use existing edge_classifier for edge processing
     edge_classification = edge_classifier.classify_all_edges()
@@ -703,17 +574,19 @@ def generate_diagram(filename: str, topology_file: str, config: Any, render_mode
     logging.info(f"Added {edge_classification.edge_count} peering connections using unified edge system")
 
     # Write to file
+    if compress:
+        _compress_diagram(mxfile.find("diagram"))
     tree = etree.ElementTree(mxfile)
     with open(filename, "wb") as f:
         tree.write(f, encoding="utf-8", xml_declaration=True, pretty_print=True)
     logging.info(f"Draw.io diagram generated and saved to {filename}")
 
 
-def generate_hld_diagram(filename: str, topology_file: str, config: Any) -> None:
+def generate_hld_diagram(filename: str, topology_file: str, config: Any, compress: bool = False) -> None:
     """Generate high-level diagram (VNets only) from topology JSON"""
-    generate_diagram(filename, topology_file, config, render_mode='hld')
+    generate_diagram(filename, topology_file, config, render_mode='hld', compress=compress)
 
 
-def generate_mld_diagram(filename: str, topology_file: str, config: Any) -> None:
+def generate_mld_diagram(filename: str, topology_file: str, config: Any, compress: bool = False) -> None:
     """Generate mid-level diagram (VNets + subnets) from topology JSON"""
-    generate_diagram(filename, topology_file, config, render_mode='mld')
\ No newline at end of file
+    generate_diagram(filename, topology_file, config, render_mode='mld', compress=compress)
\ No newline at end of file
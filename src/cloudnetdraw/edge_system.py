@@ -5,10 +5,21 @@ Eliminates edge duplication by processing JSON topology once and creating single
 import logging
 from dataclasses import dataclass
 from enum import Enum
+from html import escape
 from typing import Dict, List, Any, Set, Optional
 from lxml import etree
 
 
+# Attribute-value normalisation turns literal tabs and line breaks into spaces when the
+# text is parsed, so they are written as character references to survive the round trip
+_XML_ATTR_WHITESPACE = str.maketrans({'\t': '&#9;', '\n': '&#10;', '\r': '&#13;'})
+
+
+def _xml_attr(value: str) -> str:
+    """Escape a value for use inside a double-quoted XML attribute"""
+    return escape(value, quote=True).translate(_XML_ATTR_WHITESPACE)
+
+
 class EdgeType(Enum):
     """Types of edges in network topology - zone-based classification"""
     HUB_TO_HUB = "hub_to_hub"                          # Medium lines, inter-hub connections
@@ -72,18 +83,16 @@ class EdgeClassifier:
         """
         import logging
         
-        # Highly connected VNets (hubs) vs others, including explicitly specified hubs
-        hub_vnets = [vnet for vnet in self.vnets if
-                    vnet.get("peerings_count", 0) >= self.config.hub_threshold or
-                    vnet.get("is_explicit_hub", False)]
+        # Highly connected VNets (hubs) vs others, including explicitly specified hubs, in one pass
+        hub_threshold = self.config.hub_threshold
+        hub_vnets, spoke_vnets = [], []
+        for vnet in self.vnets:
+            is_hub = vnet.get("peerings_count", 0) >= hub_threshold or vnet.get("is_explicit_hub", False)
+            (hub_vnets if is_hub else spoke_vnets).append(vnet)
         
         # Sort hubs deterministically by resource_id to ensure consistent zone assignment
         hub_vnets.sort(key=lambda x: x.get('resource_id', ''))
         
-        spoke_vnets = [vnet for vnet in self.vnets if
-                      vnet.get("peerings_count", 0) < self.config.hub_threshold and
-                      not vnet.get("is_explicit_hub", False)]
-        
         # If no highly connected VNets, treat the first one as primary for layout
         if not hub_vnets and self.vnets:
             hub_vnets = [self.vnets[0]]
@@ -114,7 +123,7 @@ class EdgeClassifier:
     
     def _build_zone_mapping(self) -> Dict[str, int]:
         """Build mapping from VNet resource_id to zone index"""
-        from .topology import find_first_hub_zone
+        from .topology import build_hub_index_map, find_first_hub_zone
         
         vnet_to_zone = {}
         
@@ -125,10 +134,11 @@ class EdgeClassifier:
                 vnet_to_zone[hub_resource_id] = hub_index
         
         # Map spokes to zones based on first hub connection
+        hub_index_map = build_hub_index_map(self.hub_vnets)
         for spoke in self.spoke_vnets:
             spoke_resource_id = spoke.get('resource_id')
             if spoke_resource_id:
-                zone_index = find_first_hub_zone(spoke, self.hub_vnets)
+                zone_index = find_first_hub_zone(spoke, self.hub_vnets, hub_index_map)
                 vnet_to_zone[spoke_resource_id] = zone_index
         
         # VNets not in mapping are considered "no zone" (isolated/standalone)
@@ -248,7 +258,11 @@ class EdgeClassifier:
                     continue
                 
                 # Create normalized pair to avoid duplicates using resource IDs
-                pair_key = tuple(sorted([source_resource_id, target_resource_id]))
+                # (a single comparison, no list allocation and sort per peering)
+                if source_resource_id < target_resource_id:
+                    pair_key = (source_resource_id, target_resource_id)
+                else:
+                    pair_key = (target_resource_id, source_resource_id)
                 if pair_key in processed_pairs:
                     continue
                     
@@ -421,54 +435,41 @@ class EdgeRenderer:
             ]
             return waypoints
     
-    def _render_single_edge(self, edge: PeeringEdge) -> None:
-        """Render single edge with appropriate styling"""
+    def _render_single_edge(self, edge: PeeringEdge) -> Optional[str]:
+        """Render single edge with appropriate styling as an mxCell XML fragment"""
         source_id = self.vnet_mapping.get(edge.source_resource_id)
         target_id = self.vnet_mapping.get(edge.target_resource_id)
         
         if not source_id or not target_id:
             logging.warning(f"Missing VNet mapping for edge {edge.source_vnet_name} ↔ {edge.target_vnet_name}")
-            return
+            return None
             
         # Get style based on edge type
         style = self._get_edge_style(edge.edge_type)
         
-        # Create DrawIO edge element
-        edge_element = etree.SubElement(
-            self.root,
-            "mxCell",
-            id=f"unified_edge_{self.edge_counter}",
-            edge="1",
-            source=source_id,
-            target=target_id,
-            style=style,
-            parent="1"
-        )
-        
-        # Add geometry with waypoints for hub-to-spoke connections
-        geometry = etree.SubElement(edge_element, "mxGeometry",
-                                   attrib={"relative": "1", "as": "geometry"})
-        
         # Add waypoints for hub-to-spoke connections (both same and different zone)
+        waypoints = []
         if edge.edge_type in [EdgeType.HUB_TO_SPOKE_SAME_ZONE, EdgeType.HUB_TO_SPOKE_DIFF_ZONE] and self.vnet_positions:
             waypoints = self._calculate_hub_to_spoke_waypoints(edge)
-            if waypoints:
-                array = etree.SubElement(geometry, "Array", attrib={"as": "points"})
-                for waypoint in waypoints:
-                    etree.SubElement(array, "mxPoint",
-                                   attrib={"x": str(waypoint["x"]), "y": str(waypoint["y"])})
         
         # Add waypoints for spoke-to-spoke-same-zone connections
         elif edge.edge_type == EdgeType.SPOKE_TO_SPOKE_SAME_ZONE and self.vnet_positions:
             waypoints = self._calculate_spoke_to_spoke_waypoints(edge)
-            if waypoints:
-                array = etree.SubElement(geometry, "Array", attrib={"as": "points"})
-                for waypoint in waypoints:
-                    etree.SubElement(array, "mxPoint",
-                                   attrib={"x": str(waypoint["x"]), "y": str(waypoint["y"])})
+        
+        # Create DrawIO edge element with geometry (and waypoints, if any)
+        if waypoints:
+            points = "".join(f'<mxPoint x="{waypoint["x"]}" y="{waypoint["y"]}"/>' for waypoint in waypoints)
+            geometry = f'<mxGeometry relative="1" as="geometry"><Array as="points">{points}</Array></mxGeometry>'
+        else:
+            geometry = '<mxGeometry relative="1" as="geometry"/>'
+        
+        fragment = (f'<mxCell id="unified_edge_{self.edge_counter}" edge="1" '
+                    f'source="{_xml_attr(source_id)}" target="{_xml_attr(target_id)}" '
+                    f'style="{_xml_attr(style)}" parent="1">{geometry}</mxCell>')
         
         self.edge_counter += 1
         logging.debug(f"Rendered {edge.edge_type.value} edge: {edge.source_vnet_name} ↔ {edge.target_vnet_name}")
+        return fragment
     
     def render_all_edges(self, edge_classification: EdgeClassification) -> None:
         """
@@ -477,7 +478,15 @@ class EdgeRenderer:
         """
         logging.info(f"Rendering {edge_classification.edge_count} edges...")
         
-        for edge in edge_classification.all_edges:
-            self._render_single_edge(edge)
+        # Build all edges as XML text and parse them in one go rather than
+        # paying the lxml element-construction cost per edge
+        fragments = [fragment for fragment in map(self._render_single_edge, edge_classification.all_edges) if fragment]
+        if not fragments:
+            return
+        
+        # The parsed edges live in their own document; a single extend() moves them all
+        # into the diagram tree in one linear pass
+        wrapper = etree.fromstring("<edges>" + "".join(fragments) + "</edges>")
+        self.root.extend(wrapper)
         
         logging.info(f"Successfully rendered {edge_classification.edge_count} edges")
\ No newline at end of file
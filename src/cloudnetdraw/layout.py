@@ -5,16 +5,25 @@ Handles VNet classification, zone creation, and edge routing
 import logging
 from typing import Dict, List, Any, Tuple
 
-from .topology import find_first_hub_zone, get_hub_connections_for_spoke
+from .topology import build_hub_index_map, find_first_hub_zone
+
+
+def _hub_identities(hub_vnets: List[Dict[str, Any]]) -> set:
+    """Return the id() of every hub, for O(1) "is this VNet a hub" checks
+    
+    Hubs are the same dict objects as in the VNet list, so identity avoids deep dict comparisons.
+    """
+    return {id(hub) for hub in hub_vnets}
 
 
 def _classify_spoke_vnets(vnets: List[Dict[str, Any]], hub_vnets: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Extract common spoke VNet classification logic"""
     spoke_vnets_classified = []
     unpeered_vnets = []
+    hub_identities = _hub_identities(hub_vnets)
     
     for vnet in vnets:
-        if vnet in hub_vnets:
+        if id(vnet) in hub_identities:
             continue  # Skip hubs
         elif vnet.get("peering_resource_ids"):
             spoke_vnets_classified.append(vnet)
@@ -28,8 +37,9 @@ def _create_layout_zones(hub_vnets: List[Dict[str, Any]], spoke_vnets_classified
     """Extract common zone assignment logic"""
     # Direct zone assignment using simple arrays
     zone_spokes = [[] for _ in hub_vnets]
+    hub_index_map = build_hub_index_map(hub_vnets)
     for spoke in spoke_vnets_classified:
-        zone_index = find_first_hub_zone(spoke, hub_vnets)
+        zone_index = find_first_hub_zone(spoke, hub_vnets, hub_index_map)
         zone_spokes[zone_index].append(spoke)
     
     return zone_spokes
@@ -50,14 +60,23 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets):
     edge_counter = 1000  # Start high to avoid conflicts with existing edge IDs
     processed_peerings = set()  # Track processed peering relationships to avoid duplicates
     
-    # Create resource ID to VNet name mapping for reliable peering resolution
-    resource_id_to_name = {vnet['resource_id']: vnet['name'] for vnet in vnets if 'resource_id' in vnet}
-    
-    # Create VNet name to resource ID mapping for symmetry validation
-    vnet_name_to_resource_id = {vnet['name']: vnet['resource_id'] for vnet in vnets if 'name' in vnet and 'resource_id' in vnet}
+    # Build both lookups in one pass: resource ID to VNet name for reliable peering resolution,
+    # and VNet name to VNet for symmetry validation (first VNet wins on duplicate names)
+    resource_id_to_name = {}
+    name_to_vnet = {}
+    for vnet in vnets:
+        if 'resource_id' in vnet:
+            resource_id_to_name[vnet['resource_id']] = vnet['name']
+        if 'name' in vnet:
+            name_to_vnet.setdefault(vnet['name'], vnet)
     
     # Use pre-classified hub data to ensure consistency with layout phase
     hub_vnet_names = {hub.get('name') for hub in hub_vnets}
+    edge_style = config.get_edge_style_string()
+    # Per-edge log records are only built when their level is enabled
+    root_logger = logging.getLogger()
+    log_info = root_logger.isEnabledFor(logging.INFO)
+    log_debug = root_logger.isEnabledFor(logging.DEBUG)
     
     for vnet in vnets:
         if 'resource_id' not in vnet:
@@ -76,6 +95,17 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets):
             
             if not target_vnet_name or target_vnet_name == source_vnet_name:
                 continue  # Skip if target VNet not found or self-reference
+            
+            # Create a deterministic peering key using resource IDs; the reverse direction of an
+            # already handled peering is skipped before any further lookups
+            if source_resource_id < peering_resource_id:
+                peering_key = (source_resource_id, peering_resource_id)
+            else:
+                peering_key = (peering_resource_id, source_resource_id)
+            
+            if peering_key in processed_peerings:
+                continue  # Skip if this peering relationship has already been processed
+            processed_peerings.add(peering_key)
                 
             target_id = vnet_mapping.get(peering_resource_id)
             if not target_id:
@@ -88,28 +118,20 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets):
             
             # Skip hub-to-spoke connections (already drawn as thick layout edges)
             if (source_is_hub and not target_is_hub) or (target_is_hub and not source_is_hub):
-                logging.debug(f"Skipping hub-to-spoke edge: {source_vnet_name} ↔ {target_vnet_name} (already drawn as layout edge)")
+                if log_debug:
+                    logging.debug("Skipping hub-to-spoke edge: %s ↔ %s (already drawn as layout edge)", source_vnet_name, target_vnet_name)
                 continue
             
-            # Create a deterministic peering key to avoid duplicates using resource IDs
-            peering_key = tuple(sorted([source_resource_id, peering_resource_id]))
-            
-            if peering_key in processed_peerings:
-                continue  # Skip if this peering relationship has already been processed
-            
             # Check for bidirectional peering (informational only)
-            source_resource_id = vnet_name_to_resource_id.get(source_vnet_name)
-            target_vnet = next((v for v in vnets if v.get('name') == target_vnet_name), None)
+            target_vnet = name_to_vnet.get(target_vnet_name)
             
-            if target_vnet and source_resource_id:
+            if target_vnet:
                 target_peering_resource_ids = target_vnet.get('peering_resource_ids', [])
-                if source_resource_id not in target_peering_resource_ids:
-                    logging.debug(f"Asymmetric peering detected: {source_vnet_name} peers to {target_vnet_name}, but {target_vnet_name} does not peer back to {source_vnet_name}")
+                if log_debug and source_resource_id not in target_peering_resource_ids:
+                    logging.debug("Asymmetric peering detected: %s peers to %s, but %s does not peer back to %s",
+                                  source_vnet_name, target_vnet_name, target_vnet_name, source_vnet_name)
                     # Continue to draw the edge anyway - asymmetric peering is normal in Azure
             
-            # Mark this peering relationship as processed
-            processed_peerings.add(peering_key)
-            
             # Create edge for spoke-to-spoke or hub-to-hub connections
             edge = etree.SubElement(
                 root,
@@ -118,15 +140,16 @@ def add_peering_edges(vnets, vnet_mapping, root, config, hub_vnets):
                 edge="1",
                 source=source_id,
                 target=target_id,
-                style=config.get_edge_style_string(),
+                style=edge_style,
                 parent="1",
             )
             
             # Add basic geometry (draw.io will auto-route)
-            edge_geometry = etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
+            etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
             
             edge_counter += 1
-            logging.info(f"Added bidirectional peering edge: {source_vnet_name} ({source_id}) ↔ {target_vnet_name} ({target_id})")
+            if log_info:
+                logging.info("Added bidirectional peering edge: %s (%s) ↔ %s (%s)", source_vnet_name, source_id, target_vnet_name, target_id)
 
 
 def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: List[Dict[str, Any]],
@@ -136,6 +159,16 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
     
     edge_counter = 3000  # Start high to avoid conflicts
     
+    # Index hubs by resource ID once instead of rescanning the hub list for every spoke
+    hub_index_map = build_hub_index_map(hub_vnets)
+    # Each hub's peerings as a set, so the reverse-peering check is O(1) per spoke
+    hub_peering_sets = [set(hub.get('peering_resource_ids', [])) for hub in hub_vnets]
+    cross_zone_edge_style = config.get_cross_zone_edge_style()
+    # Per-edge log records are only built when their level is enabled
+    root_logger = logging.getLogger()
+    log_info = root_logger.isEnabledFor(logging.INFO)
+    log_debug = root_logger.isEnabledFor(logging.DEBUG)
+    
     logging.info("Adding cross-zone connectivity edges for multi-hub spokes with bidirectional verification...")
     
     for zone in zones:
@@ -146,9 +179,15 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
             spoke_resource_id = spoke.get('resource_id')
             if not spoke_name or not spoke_resource_id:
                 continue
+            
+            # Spokes that were never drawn can't carry a cross-zone edge
+            spoke_id = vnet_mapping.get(spoke_resource_id)
+            if not spoke_id:
+                continue
                 
-            # Find ALL hubs this spoke connects to
-            connected_hub_indices = get_hub_connections_for_spoke(spoke, hub_vnets)
+            # Find ALL hubs this spoke connects to (sorted to keep hub order deterministic)
+            connected_hub_indices = sorted({hub_index for peering_id in spoke.get('peering_resource_ids', [])
+                                            for hub_index in hub_index_map.get(peering_id, ())})
             
             # Create edges to OTHER hubs (not the assigned zone hub) with bidirectional verification
             for hub_index in connected_hub_indices:
@@ -160,17 +199,13 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
                     if not target_hub_resource_id:
                         continue
                     
-                    # Verify bidirectional peering: spoke peers to hub AND hub peers back to spoke
-                    spoke_peering_ids = spoke.get('peering_resource_ids', [])
-                    hub_peering_ids = target_hub.get('peering_resource_ids', [])
-                    
-                    if (target_hub_resource_id in spoke_peering_ids and
-                        spoke_resource_id in hub_peering_ids):
+                    # Verify bidirectional peering: the spoke peers to the hub by construction of
+                    # connected_hub_indices, so only the hub's peering back to the spoke is checked
+                    if spoke_resource_id in hub_peering_sets[hub_index]:
                         
-                        spoke_id = vnet_mapping.get(spoke_resource_id)
                         target_hub_id = vnet_mapping.get(target_hub_resource_id)
                         
-                        if spoke_id and target_hub_id:
+                        if target_hub_id:
                             # Create cross-zone edge with distinct styling
                             edge = etree.SubElement(
                                 root,
@@ -179,14 +214,16 @@ def add_cross_zone_connectivity_edges(zones: List[Dict[str, Any]], hub_vnets: Li
                                 edge="1",
                                 source=spoke_id,
                                 target=target_hub_id,
-                                style=config.get_cross_zone_edge_style(),
+                                style=cross_zone_edge_style,
                                 parent="1",
                             )
                             
                             # Add basic geometry (draw.io will auto-route)
-                            edge_geometry = etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
+                            etree.SubElement(edge, "mxGeometry", attrib={"relative": "1", "as": "geometry"})
                             
                             edge_counter += 1
-                            logging.info(f"Added verified bidirectional cross-zone edge: {spoke_name} ↔ {target_hub_name} (zone {zone_hub_index} → zone {hub_index})")
-                    else:
-                        logging.debug(f"Skipping cross-zone edge {spoke_name} → {target_hub_name}: peering not bidirectional")
\ No newline at end of file
+                            if log_info:
+                                logging.info("Added verified bidirectional cross-zone edge: %s ↔ %s (zone %d → zone %d)",
+                                             spoke_name, target_hub_name, zone_hub_index, hub_index)
+                    elif log_debug:
+                        logging.debug("Skipping cross-zone edge %s → %s: peering not bidirectional", spoke_name, target_hub_name)
\ No newline at end of file
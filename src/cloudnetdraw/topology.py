@@ -4,7 +4,8 @@ Handles filtering, peering analysis, and VNet classification logic
 """
 import logging
 import sys
-from typing import Dict, List, Any
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional
 
 from .azure_client import find_hub_vnet_using_resource_graph, find_peered_vnets
 
@@ -23,6 +24,11 @@ def get_filtered_vnet_topology(hub_vnet_identifier: str, subscription_ids: List[
     # Get peering resource IDs from the hub VNet
     hub_peering_resource_ids = hub_vnet.get('peering_resource_ids', [])
     
+    # An island hub has nothing to resolve, so skip the peer lookup entirely
+    if not hub_peering_resource_ids:
+        logging.info(f"Hub VNet {hub_vnet['name']} has no peerings; filtered topology contains only the hub")
+        return {"vnets": [hub_vnet]}
+    
     logging.info(f"Looking for {len(hub_peering_resource_ids)} directly peered VNets using resource IDs")
     
     # Use direct API calls to get peered VNets efficiently using exact resource IDs
@@ -49,10 +55,13 @@ def get_filtered_vnets_topology(vnet_identifiers: List[str], subscription_ids: L
         exclude_resource_ids: Optional set of VNet resource IDs to exclude from topology
     """
     
-    all_vnets = {}  # Use dict to avoid duplicates by resource_id
-    exclude_resource_ids = exclude_resource_ids or set()
+    all_vnets = {}  # Keyed by lower-cased resource_id; Azure resource IDs are case-insensitive
+    # Exclusions are matched case-insensitively too, so they agree with the dedup keys
+    excluded = {resource_id.lower() for resource_id in exclude_resource_ids or ()}
+    hub_peerings = []  # (hub_vnet, non-excluded peering resource IDs) per selected hub
     
-    for vnet_identifier in vnet_identifiers:
+    # An identifier listed more than once only needs one lookup
+    for vnet_identifier in dict.fromkeys(vnet_identifiers):
         # Find the hub VNet
         hub_vnet = find_hub_vnet_using_resource_graph(vnet_identifier)
         if not hub_vnet:
@@ -61,46 +70,60 @@ def get_filtered_vnets_topology(vnet_identifiers: List[str], subscription_ids: L
         
         # Check if this hub is excluded
         hub_resource_id = hub_vnet.get('resource_id')
-        if hub_resource_id in exclude_resource_ids:
+        if hub_resource_id and hub_resource_id.lower() in excluded:
             logging.info(f"Skipping excluded hub VNet: {hub_vnet['name']}")
             continue
         
         logging.info(f"Found hub VNet: {hub_vnet['name']} in subscription {hub_vnet['subscription_name']}")
         
         # Add hub VNet to collection using resource_id as key to avoid duplicates
-        if hub_resource_id and hub_resource_id not in all_vnets:
-            all_vnets[hub_resource_id] = hub_vnet
+        if hub_resource_id and hub_resource_id.lower() not in all_vnets:
+            all_vnets[hub_resource_id.lower()] = hub_vnet
         
         # Get peering resource IDs from the hub VNet, excluding any in the exclude set
         hub_peering_resource_ids = [
             peer_id for peer_id in hub_vnet.get('peering_resource_ids', [])
-            if peer_id not in exclude_resource_ids
+            if peer_id.lower() not in excluded
+        ]
+        hub_peerings.append((hub_vnet, hub_peering_resource_ids))
+    
+    # Resolve the peers of every hub in one batched lookup instead of one lookup per hub
+    all_peering_resource_ids = list(dict.fromkeys(
+        peer_id for _, hub_peering_resource_ids in hub_peerings for peer_id in hub_peering_resource_ids
+    ))
+    if all_peering_resource_ids:
+        logging.info(f"Looking for {len(all_peering_resource_ids)} directly peered VNets using resource IDs for {len(hub_peerings)} hub VNets")
+        directly_peered_vnets, accessible_resource_ids = find_peered_vnets(all_peering_resource_ids)
+    else:
+        directly_peered_vnets, accessible_resource_ids = [], []
+    accessible_resource_id_set = set(accessible_resource_ids)
+    
+    for hub_vnet, hub_peering_resource_ids in hub_peerings:
+        hub_resource_id = hub_vnet.get('resource_id')
+        accessible_peering_resource_ids = [
+            peer_id for peer_id in hub_peering_resource_ids
+            if peer_id in accessible_resource_id_set
         ]
-        
-        logging.info(f"Looking for {len(hub_peering_resource_ids)} directly peered VNets using resource IDs for {hub_vnet['name']}")
-        
-        # Use direct API calls to get peered VNets efficiently using exact resource IDs
-        directly_peered_vnets, accessible_peering_resource_ids = find_peered_vnets(hub_peering_resource_ids)
         
         # Update hub VNet to only include accessible (and non-excluded) peering resource IDs
-        if hub_resource_id in all_vnets:
-            all_vnets[hub_resource_id]["peering_resource_ids"] = accessible_peering_resource_ids
-            all_vnets[hub_resource_id]["peerings_count"] = len(accessible_peering_resource_ids)
-        
-        # Add peered VNets to collection using resource_id as key to avoid duplicates
-        for peered_vnet in directly_peered_vnets:
-            peered_resource_id = peered_vnet.get('resource_id')
-            if peered_resource_id and peered_resource_id not in all_vnets and peered_resource_id not in exclude_resource_ids:
-                # Clean peering references to excluded VNets
-                peered_vnet["peering_resource_ids"] = [
-                    peer_id for peer_id in peered_vnet.get('peering_resource_ids', [])
-                    if peer_id not in exclude_resource_ids
-                ]
-                peered_vnet["peerings_count"] = len(peered_vnet["peering_resource_ids"])
-                all_vnets[peered_resource_id] = peered_vnet
+        if hub_resource_id and hub_resource_id.lower() in all_vnets:
+            all_vnets[hub_resource_id.lower()]["peering_resource_ids"] = accessible_peering_resource_ids
+            all_vnets[hub_resource_id.lower()]["peerings_count"] = len(accessible_peering_resource_ids)
         
         logging.info(f"Hub VNet {hub_vnet['name']} has {len(accessible_peering_resource_ids)} accessible peerings out of {len(hub_vnet.get('peering_resource_ids', []))} total peering relationships")
     
+    # Add peered VNets to collection using resource_id as key to avoid duplicates
+    for peered_vnet in directly_peered_vnets:
+        peered_resource_id = peered_vnet.get('resource_id')
+        if peered_resource_id and peered_resource_id.lower() not in all_vnets and peered_resource_id.lower() not in excluded:
+            # Clean peering references to excluded VNets
+            peered_vnet["peering_resource_ids"] = [
+                peer_id for peer_id in peered_vnet.get('peering_resource_ids', [])
+                if peer_id.lower() not in excluded
+            ]
+            peered_vnet["peerings_count"] = len(peered_vnet["peering_resource_ids"])
+            all_vnets[peered_resource_id.lower()] = peered_vnet
+    
     # Convert dict back to list
     filtered_vnets = list(all_vnets.values())
     logging.info(f"Combined filtered topology contains {len(filtered_vnets)} unique VNets: {[v['name'] for v in filtered_vnets]}")
@@ -108,26 +131,48 @@ def get_filtered_vnets_topology(vnet_identifiers: List[str], subscription_ids: L
     return {"vnets": filtered_vnets}
 
 
-def get_hub_connections_for_spoke(spoke_vnet: Dict[str, Any], hub_vnets: List[Dict[str, Any]]) -> List[int]:
-    """Find ALL hubs this spoke connects to (for cross-zone edge generation)"""
-    spoke_peering_resource_ids = spoke_vnet.get('peering_resource_ids', [])
-    connected_hub_indices = []
-    
+def build_hub_index_map(hub_vnets: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Map each hub resource ID to the indices it occupies in hub_vnets, for O(1) peering lookups"""
+    hub_index_map = {}
     for hub_index, hub_vnet in enumerate(hub_vnets):
         hub_resource_id = hub_vnet.get('resource_id')
-        if hub_resource_id and hub_resource_id in spoke_peering_resource_ids:
-            connected_hub_indices.append(hub_index)
+        if hub_resource_id:
+            hub_index_map.setdefault(hub_resource_id, []).append(hub_index)
+    return hub_index_map
+
+
+def get_hub_connections_for_spoke(spoke_vnet: Dict[str, Any], hub_vnets: List[Dict[str, Any]],
+                                  hub_index_map: Optional[Dict[str, List[int]]] = None) -> List[int]:
+    """Find ALL hubs this spoke connects to (for cross-zone edge generation)
     
-    return connected_hub_indices
+    Pass a precomputed build_hub_index_map(hub_vnets) when calling this for many spokes.
+    """
+    if hub_index_map is None:
+        hub_index_map = build_hub_index_map(hub_vnets)
+    
+    connected_hub_indices = set()
+    for peering_resource_id in spoke_vnet.get('peering_resource_ids', []):
+        connected_hub_indices.update(hub_index_map.get(peering_resource_id, ()))
+    
+    return sorted(connected_hub_indices)
 
 
-def find_first_hub_zone(spoke_vnet: Dict[str, Any], hub_vnets: List[Dict[str, Any]]) -> int:
-    """Find first hub zone this spoke connects to (simplified logic)"""
-    spoke_peering_ids = spoke_vnet.get('peering_resource_ids', [])
-    for hub_index, hub in enumerate(hub_vnets):
-        if hub.get('resource_id') in spoke_peering_ids:
-            return hub_index
-    return 0  # Default to first zone
+def find_first_hub_zone(spoke_vnet: Dict[str, Any], hub_vnets: List[Dict[str, Any]],
+                        hub_index_map: Optional[Dict[str, List[int]]] = None) -> int:
+    """Find first hub zone this spoke connects to (simplified logic)
+    
+    Pass a precomputed build_hub_index_map(hub_vnets) when calling this for many spokes.
+    """
+    if hub_index_map is None:
+        hub_index_map = build_hub_index_map(hub_vnets)
+    
+    # Lowest hub index wins, matching the hub order rather than the peering order
+    first_hub_index = None
+    for peering_resource_id in spoke_vnet.get('peering_resource_ids', []):
+        hub_indices = hub_index_map.get(peering_resource_id)
+        if hub_indices and (first_hub_index is None or hub_indices[0] < first_hub_index):
+            first_hub_index = hub_indices[0]
+    return first_hub_index if first_hub_index is not None else 0  # Default to first zone
 
 
 def determine_hub_for_spoke(spoke_vnet: Dict[str, Any], hub_vnets: List[Dict[str, Any]]) -> str:
@@ -146,47 +191,31 @@ def create_vnet_id_mapping(vnets: List[Dict[str, Any]], zones: List[Dict[str, An
     falls back to synthetic IDs for backward compatibility (tests).
     Handles hubless zones where hub is None.
     """
-    from .utils import generate_hierarchical_id
-    
     mapping = {}
     
     # Check if we have Azure metadata available in the data
     has_azure_metadata = False
     # Find first zone with a hub to check metadata
     for zone in zones:
-        if zone.get('hub'):
-            hub_data = zone['hub']
+        hub_data = zone.get('hub')
+        if hub_data:
             has_azure_metadata = bool(hub_data.get('subscription_name') and hub_data.get('resourcegroup_name'))
             break
     
     if has_azure_metadata:
-        # Production mode: Use hierarchical Azure-based IDs
-        # Map hub VNets to hierarchical main IDs using resource_id as key
-        for zone in zones:
-            if zone.get('hub') and 'resource_id' in zone['hub']:
-                group_id = generate_hierarchical_id(zone['hub'], 'group')
-                mapping[zone['hub']['resource_id']] = group_id
-        
-        # Map spoke VNets to hierarchical main IDs using resource_id as key
-        for zone_index, zone in enumerate(zones):
-            peered_spokes = zone['spokes']
-            
-            for spoke in peered_spokes:
-                if 'resource_id' in spoke:
-                    group_id = generate_hierarchical_id(spoke, 'group')
-                    mapping[spoke['resource_id']] = group_id
-        
-        # Map non-peered VNets to hierarchical main IDs using resource_id as key
-        for nonpeered in all_non_peered:
-            if 'resource_id' in nonpeered:
-                group_id = generate_hierarchical_id(nonpeered, 'group')
-                mapping[nonpeered['resource_id']] = group_id
+        # Production mode: hierarchical Azure-based IDs don't depend on layout position,
+        # so hubs, spokes and non-peered VNets are mapped in one pass keyed by resource_id
+        # (same order as the layout, so later entries still win on duplicate IDs)
+        hubs = [zone['hub'] for zone in zones if zone.get('hub')]
+        spokes = [spoke for zone in zones for spoke in zone['spokes']]
+        mapping = _hierarchical_vnet_id_mapping(chain(hubs, spokes, all_non_peered))
     else:
         # Test/backward compatibility mode: Use original synthetic IDs with resource_id as key, fallback to name
         # Map hub VNets (skip hubless zones)
         for zone in zones:
-            if zone.get('hub'):  # Only process zones with hubs
-                hub_key = zone['hub'].get('resource_id') or zone['hub'].get('name')
+            hub = zone.get('hub')
+            if hub:  # Only process zones with hubs
+                hub_key = hub.get('resource_id') or hub.get('name')
                 if hub_key:
                     mapping[hub_key] = f"hub_{zone['hub_index']}"
         
@@ -231,4 +260,37 @@ def create_vnet_id_mapping(vnets: List[Dict[str, Any]], zones: List[Dict[str, An
             if nonpeered_key:
                 mapping[nonpeered_key] = f"nonpeered_spoke{i}"
     
-    return mapping
\ No newline at end of file
+    return mapping
+
+
+def _hierarchical_vnet_id_mapping(vnets: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """Map resource IDs to hierarchical group IDs; later VNets win on duplicate resource IDs"""
+    from .utils import generate_hierarchical_id
+    
+    return {
+        vnet['resource_id']: generate_hierarchical_id(vnet, 'group')
+        for vnet in vnets
+        if 'resource_id' in vnet
+    }
+
+
+def create_layout_vnet_id_mapping(hub_vnets: List[Dict[str, Any]], zone_spokes: List[List[Dict[str, Any]]],
+                                  hubless_spokes: List[Dict[str, Any]], all_non_peered: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Create the VNet ID mapping straight from the diagram layout arrays
+    
+    Equivalent to create_vnet_id_mapping over one zone per hub (holding zone_spokes[i])
+    plus a trailing hubless zone, but only builds those zone dicts for the synthetic-ID
+    fallback; hierarchical IDs are mapped directly from the arrays.
+    """
+    if hub_vnets and hub_vnets[0].get('subscription_name') and hub_vnets[0].get('resourcegroup_name'):
+        return _hierarchical_vnet_id_mapping(
+            chain(hub_vnets, chain.from_iterable(zone_spokes), hubless_spokes, all_non_peered)
+        )
+    
+    zones = [
+        {'hub': hub_vnet, 'hub_index': hub_index, 'spokes': zone_spokes[hub_index]}
+        for hub_index, hub_vnet in enumerate(hub_vnets)
+    ]
+    if hubless_spokes:
+        zones.append({'hub': None, 'hub_index': len(hub_vnets), 'spokes': hubless_spokes})
+    return create_vnet_id_mapping([], zones, all_non_peered)
@@ -4,6 +4,7 @@ Contains helper functions for ID generation, file operations, and parsing
 """
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 
 
@@ -16,12 +17,10 @@ def parse_vnet_identifier(vnet_identifier: str) -> Tuple[Optional[str], Optional
     """Parse VNet identifier (resource ID or subscription/resource_group/vnet_name) and return (subscription_id, resource_group, vnet_name)"""
     if vnet_identifier.startswith('/'):
         # Resource ID format: /subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Network/virtualNetworks/{vnet}
+        # A single split is cheaper than a regex match plus group lookups
         parts = vnet_identifier.split('/')
         if len(parts) >= 9 and parts[1] == 'subscriptions' and parts[3] == 'resourceGroups' and parts[5] == 'providers' and parts[6] == 'Microsoft.Network' and parts[7] == 'virtualNetworks':
-            subscription_id = parts[2]
-            resource_group = parts[4]
-            vnet_name = parts[8]
-            return subscription_id, resource_group, vnet_name
+            return parts[2], parts[4], parts[8]
         else:
             raise ValueError(f"Invalid VNet resource ID format: {vnet_identifier}")
     elif '/' in vnet_identifier:
@@ -64,63 +63,47 @@ def generate_hierarchical_id(vnet_data: Dict[str, Any], element_type: str, suffi
         Hierarchical ID in format: subscription.resourcegroup.vnet[.element_type[.suffix]]
         Falls back to simple vnet-based ID if Azure metadata is missing (for tests)
     """
-    # Extract and sanitize Azure resource components
-    subscription_name = vnet_data.get('subscription_name', '').replace('.', '_')
-    resourcegroup_name = vnet_data.get('resourcegroup_name', '').replace('.', '_')
-    vnet_name = vnet_data.get('name', '').replace('.', '_')
+    base_id, separator = hierarchical_id_base(vnet_data)
+    
+    # Add element type if specified ('main' never takes a suffix)
+    if element_type == 'group':
+        return base_id
+    if suffix is not None and element_type != 'main':
+        return f"{base_id}{separator}{element_type}{separator}{suffix}"
+    return f"{base_id}{separator}{element_type}"
+
+
+def hierarchical_id_base(vnet_data: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the (base_id, separator) pair that every hierarchical ID of a VNet starts with
+    
+    Callers generating many element IDs for one VNet can resolve this once and append
+    f"{separator}{element_type}{separator}{suffix}" themselves.
+    """
+    return _hierarchical_base_id(
+        vnet_data.get('subscription_name', ''), vnet_data.get('resourcegroup_name', ''), vnet_data.get('name', '')
+    )
+
+
+@lru_cache(maxsize=4096)
+def _hierarchical_base_id(subscription_name: str, resourcegroup_name: str, vnet_name: str) -> Tuple[str, str]:
+    """Return (base_id, separator) for a VNet, computed once per distinct name triple
+    
+    With full Azure metadata the base is subscription.resourcegroup.vnet joined by '.';
+    otherwise it falls back to the bare VNet name joined by '_' (for tests).
+    """
+    vnet_name = vnet_name.replace('.', '_')
     
     # Check if we have sufficient metadata for hierarchical IDs
     if not subscription_name or not resourcegroup_name:
-        # Fallback to simple ID for test scenarios or missing metadata
-        if element_type == 'group':
-            return vnet_name
-        elif element_type == 'main':
-            return f"{vnet_name}_main"
-        elif element_type == 'subnet':
-            if suffix is not None:
-                return f"{vnet_name}_subnet_{suffix}"
-            else:
-                return f"{vnet_name}_subnet"
-        elif element_type == 'icon':
-            if suffix is not None:
-                return f"{vnet_name}_icon_{suffix}"
-            else:
-                return f"{vnet_name}_icon"
-        else:
-            # Fallback for unknown element types
-            if suffix is not None:
-                return f"{vnet_name}_{element_type}_{suffix}"
-            else:
-                return f"{vnet_name}_{element_type}"
+        return vnet_name, '_'
     
-    # Build hierarchical base ID with full Azure metadata
-    base_id = f"{subscription_name}.{resourcegroup_name}.{vnet_name}"
-    
-    # Add element type if specified
-    if element_type == 'group':
-        return base_id
-    elif element_type == 'main':
-        return f"{base_id}.main"
-    elif element_type == 'subnet':
-        if suffix is not None:
-            return f"{base_id}.subnet.{suffix}"
-        else:
-            return f"{base_id}.subnet"
-    elif element_type == 'icon':
-        if suffix is not None:
-            return f"{base_id}.icon.{suffix}"
-        else:
-            return f"{base_id}.icon"
-    else:
-        # Fallback for unknown element types
-        if suffix is not None:
-            return f"{base_id}.{element_type}.{suffix}"
-        else:
-            return f"{base_id}.{element_type}"
+    return f"{subscription_name.replace('.', '_')}.{resourcegroup_name.replace('.', '_')}.{vnet_name}", '.'
 
 
 def save_to_json(data: Dict[str, Any], filename: str = "network_topology.json") -> None:
     """Save the data to a JSON file"""
+    # Serialize once and write one buffer; json.dump issues a write per token
+    payload = json.dumps(data, indent=4)
     with open(filename, "w") as f:
-        json.dump(data, f, indent=4)
+        f.write(payload)
     logging.info(f"Network topology saved to {filename}")
\ No newline at end of file
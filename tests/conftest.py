@@ -15,7 +15,24 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def resource_graph_batch_unavailable(request):
+    """Keep batched Resource Graph lookups offline so Azure SDK mocks drive the per-VNet fallback
+    
+    Tests that exercise the batched lookups themselves are marked with `resource_graph`.
+    """
+    if request.node.get_closest_marker('resource_graph'):
+        yield
+        return
+    error = Exception("Resource Graph unavailable in tests")
+    with patch('cloudnetdraw.azure_client._query_vnets_by_resource_ids', side_effect=error), \
+         patch('cloudnetdraw.azure_client._query_vnets_in_subscriptions', side_effect=error):
+        yield
+
+
+# Static data fixtures are built once per session and shared between tests, so treat
+# them as read-only; deepcopy one before mutating it in a test
+@pytest.fixture(scope="session")
 def sample_config_dict():
     """Basic configuration dictionary for testing"""
     return {
@@ -145,11 +162,11 @@ styles:
     text_align: "left"
 """
     with patch('builtins.open', mock_open(read_data=yaml_content)), \
-         patch('yaml.safe_load', return_value=sample_config_dict):
+         patch('yaml.load', return_value=sample_config_dict):
         yield
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_vnets():
     """Sample VNet data for testing"""
     return [
@@ -223,7 +240,7 @@ def sample_vnets():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_topology(sample_vnets):
     """Complete topology data structure"""
     return {
@@ -239,7 +256,7 @@ def mock_azure_credentials():
     return mock_creds
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_subscription_list():
     """Mock subscription list from Azure"""
     return [
@@ -289,7 +306,7 @@ def mock_file_operations():
         yield mock_file
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_azure_env_vars():
     """Sample environment variables for Azure authentication"""
     return {
@@ -306,7 +323,7 @@ def mock_azure_env(sample_azure_env_vars):
         yield
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def virtual_hub_vnet():
     """Sample Virtual Hub VNet for testing"""
     return {
@@ -323,7 +340,7 @@ def virtual_hub_vnet():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_topology():
     """Large topology for performance testing"""
     vnets = []
@@ -401,7 +418,7 @@ def subscription_id_data(request):
 
 
 # VNet Filtering specific fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_hub_vnet():
     """Mock hub VNet for VNet filtering tests"""
     return {
@@ -423,7 +440,7 @@ def mock_hub_vnet():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_spoke_vnets():
     """Mock spoke VNets for VNet filtering tests"""
     return [
@@ -461,7 +478,7 @@ def mock_spoke_vnets():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_virtual_hub():
     """Mock Virtual WAN hub for testing"""
     return {
@@ -481,7 +498,7 @@ def mock_virtual_hub():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_filtered_topology(mock_hub_vnet, mock_spoke_vnets):
     """Complete filtered topology for testing"""
     return {
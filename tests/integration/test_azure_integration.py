@@ -20,6 +20,7 @@ from tests.fixtures.azure_api_responses.vnet_responses import (
     VNET_ERROR_RESPONSES,
     MALFORMED_VNET_RESPONSE
 )
+from cloudnetdraw.azure_client import _client_options
 
 
 class TestSubscriptionEnumeration:
@@ -55,7 +56,7 @@ class TestSubscriptionEnumeration:
             )
         
         # Verify subscription client was called
-        mock_subscription_client.assert_called_once_with(mock_credentials)
+        mock_subscription_client.assert_called_once_with(mock_credentials, **_client_options())
         mock_client_instance.subscriptions.list.assert_called_once()
         
         # Verify correct IDs were returned
@@ -112,6 +113,25 @@ class TestSubscriptionEnumeration:
                 subscription_names
             )
     
+    @patch('cloudnetdraw.azure_client.SubscriptionClient')
+    def test_resolve_unknown_subscription_name_lists_once(self, mock_subscription_client):
+        """Test an unknown name reports the available subscriptions from the same listing."""
+        mock_client_instance = MagicMock()
+        mock_subscription_client.return_value = mock_client_instance
+        
+        mock_sub = MagicMock()
+        mock_sub.display_name = "Production Subscription"
+        mock_sub.subscription_id = "12345678-1234-1234-1234-123456789012"
+        mock_client_instance.subscriptions.list.return_value = [mock_sub]
+        
+        from cloudnetdraw import azure_client
+        
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=MagicMock()), \
+             pytest.raises(SystemExit):
+            azure_client.resolve_subscription_names_to_ids(["Non-existent Subscription"])
+        
+        mock_client_instance.subscriptions.list.assert_called_once()
+    
     @patch('cloudnetdraw.azure_client.SubscriptionClient')
     def test_subscription_resolution_api_error(self, mock_subscription_client):
         """Test handling of API errors when resolving subscription names."""
@@ -200,7 +220,7 @@ class TestVNetDiscoveryAcrossSubscriptions:
             vnets = azure_client.get_vnet_topology_for_selected_subscriptions([subscription_id])
         
         # Verify network client was called correctly
-        mock_network_client.assert_called_once_with(mock_credentials, subscription_id)
+        mock_network_client.assert_called_once_with(mock_credentials, subscription_id, **_client_options())
         mock_client_instance.virtual_networks.list_all.assert_called_once()
         
         # Verify VNets were discovered
@@ -264,7 +284,7 @@ class TestVNetDiscoveryAcrossSubscriptions:
         
         # Verify network client was called for each subscription
         assert mock_network_client.call_count == 2
-        calls = [call(mock_credentials, sub_id) for sub_id in subscription_ids]
+        calls = [call(mock_credentials, sub_id, **_client_options()) for sub_id in subscription_ids]
         mock_network_client.assert_has_calls(calls, any_order=True)
         
         # Verify VNets were discovered from all subscriptions
@@ -334,7 +354,7 @@ class TestVNetDiscoveryAcrossSubscriptions:
     @patch('cloudnetdraw.azure_client.NetworkManagementClient')
     def test_discover_vnets_mixed_subscriptions_normal_operation(self, mock_network_client, mock_subscription_client):
         """Test VNet discovery when some subscriptions have VNets and others don't - should be normal."""
-        def mock_network_client_side_effect(credentials, subscription_id):
+        def mock_network_client_side_effect(credentials, subscription_id, **kwargs):
             mock_client_instance = MagicMock()
             if subscription_id == "12345678-1234-1234-1234-123456789012":
                 # First subscription has VNets
@@ -904,7 +924,7 @@ class TestNetworkPartitionScenarios:
     @patch('cloudnetdraw.azure_client.NetworkManagementClient')
     def test_partial_subscription_failure(self, mock_network_client):
         """Test handling when some subscriptions fail while others succeed."""
-        def side_effect(credentials, subscription_id):
+        def side_effect(credentials, subscription_id, **kwargs):
             if subscription_id == "12345678-1234-1234-1234-123456789012":
                 # First subscription succeeds
                 mock_instance = MagicMock()
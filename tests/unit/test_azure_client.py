@@ -169,6 +169,104 @@ class TestVNetTopologyCollection:
             assert hub['subnets'] == []  # Virtual hubs don't have traditional subnets
             assert hub['peerings_count'] == 0
 
+    @pytest.mark.resource_graph
+    def test_get_vnet_topology_from_resource_graph(self, mock_azure_credentials):
+        """Test topology collection reads VNets and peerings from one Resource Graph query"""
+        mock_subscription_client = Mock()
+        mock_subscription = Mock()
+        mock_subscription.display_name = 'Test Subscription'
+        mock_subscription.tenant_id = 'tenant-123'
+        mock_subscription_client.subscriptions.get.return_value = mock_subscription
+
+        mock_network_client = Mock()
+        mock_network_client.virtual_wans.list.return_value = []
+
+        vnet_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/spoke-vnet'
+        hub_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/hub-vnet'
+        excluded_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/excluded-vnet'
+        mock_response = Mock()
+        mock_response.skip_token = None
+        mock_response.data = [
+            {
+                'id': vnet_id,
+                'name': 'spoke-vnet',
+                'subscriptionId': 'sub-1',
+                'addressSpace': ['10.1.0.0/16'],
+                'subnets': [{'name': 'AzureFirewallSubnet', 'properties': {'addressPrefix': '10.1.0.0/26'}}],
+                'peerings': [
+                    {'properties': {'remoteVirtualNetwork': {'id': hub_id}}},
+                    {'properties': {'remoteVirtualNetwork': {'id': excluded_id}}}
+                ]
+            },
+            {
+                'id': excluded_id,
+                'name': 'excluded-vnet',
+                'subscriptionId': 'sub-1',
+                'addressSpace': ['10.2.0.0/16']
+            }
+        ]
+        mock_graph_client = Mock()
+        mock_graph_client.resources.return_value = mock_response
+
+        with patch('cloudnetdraw.azure_client.SubscriptionClient', return_value=mock_subscription_client), \
+             patch('cloudnetdraw.azure_client.NetworkManagementClient', return_value=mock_network_client), \
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_graph_client):
+            
+            initialize_credentials()
+            result = get_vnet_topology_for_selected_subscriptions(['sub-1'], {excluded_id})
+            
+            mock_graph_client.resources.assert_called_once()
+            mock_network_client.virtual_networks.list_all.assert_not_called()
+            mock_network_client.virtual_network_peerings.list.assert_not_called()
+            assert len(result['vnets']) == 1
+            vnet = result['vnets'][0]
+            assert vnet['name'] == 'spoke-vnet'
+            assert vnet['resourcegroup_name'] == 'rg-1'
+            assert vnet['subscription_name'] == 'Test Subscription'
+            assert vnet['firewall'] == 'Yes'
+            assert vnet['peering_resource_ids'] == [hub_id]
+            assert vnet['peerings_count'] == 1
+
+    def test_get_vnet_topology_graph_row_without_address_space_uses_sdk(self, mock_azure_credentials):
+        """Test a Resource Graph row without addressSpace falls back to the SDK for that subscription"""
+        mock_subscription_client = Mock()
+        mock_subscription = Mock()
+        mock_subscription.display_name = 'Test Subscription'
+        mock_subscription.tenant_id = 'tenant-123'
+        mock_subscription_client.subscriptions.get.return_value = mock_subscription
+
+        vnet_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/spoke-vnet'
+        mock_vnet = Mock()
+        mock_vnet.name = 'spoke-vnet'
+        mock_vnet.id = vnet_id
+        mock_vnet.address_space.address_prefixes = ['10.1.0.0/16']
+        mock_vnet.subnets = []
+
+        mock_network_client = Mock()
+        mock_network_client.virtual_wans.list.return_value = []
+        mock_network_client.virtual_networks.list_all.return_value = [mock_vnet]
+        mock_network_client.virtual_network_peerings.list.return_value = []
+
+        mock_response = Mock()
+        mock_response.skip_token = None
+        mock_response.data = [
+            {'id': vnet_id, 'name': 'spoke-vnet', 'subscriptionId': 'sub-1', 'addressSpace': None}
+        ]
+        mock_graph_client = Mock()
+        mock_graph_client.resources.return_value = mock_response
+
+        with patch('cloudnetdraw.azure_client.SubscriptionClient', return_value=mock_subscription_client), \
+             patch('cloudnetdraw.azure_client.NetworkManagementClient', return_value=mock_network_client), \
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_graph_client):
+            
+            initialize_credentials()
+            result = get_vnet_topology_for_selected_subscriptions(['sub-1'])
+            
+            mock_network_client.virtual_networks.list_all.assert_called_once()
+            assert len(result['vnets']) == 1
+            assert result['vnets'][0]['name'] == 'spoke-vnet'
+            assert result['vnets'][0]['address_space'] == '10.1.0.0/16'
+
     def test_get_vnet_topology_multiple_subscriptions(self, mock_azure_credentials):
         """Test topology collection from multiple subscriptions"""
         mock_subscription_client = Mock()
@@ -188,7 +286,7 @@ class TestVNetTopologyCollection:
         mock_subscription_client.subscriptions.get.side_effect = mock_get_subscription
 
         # Mock network clients for each subscription
-        def mock_network_client(credentials, subscription_id):
+        def mock_network_client(credentials, subscription_id, **kwargs):
             mock_client = Mock()
             
             if subscription_id == 'sub-1':
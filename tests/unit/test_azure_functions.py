@@ -5,14 +5,14 @@ import pytest
 import os
 import sys
 from unittest.mock import patch, MagicMock, Mock
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 
 from cloudnetdraw.azure_client import (
     find_hub_vnet_using_resource_graph, find_peered_vnets,
     get_vnet_topology_for_selected_subscriptions,
     get_subscriptions_non_interactive, resolve_subscription_names_to_ids,
     read_subscriptions_from_file, get_sp_credentials, initialize_credentials,
-    get_credentials
+    get_credentials, _client_options, VNetCollectionError
 )
 from cloudnetdraw.topology import get_filtered_vnet_topology
 
@@ -32,13 +32,79 @@ class TestFindHubVnetUsingResourceGraph:
         """Test exception handling in find_hub_vnet_using_resource_graph"""
         mock_credentials = MagicMock()
         mock_resource_graph_client = MagicMock()
-        mock_resource_graph_client.resources.side_effect = Exception("API Error")
+        mock_resource_graph_client.resources.side_effect = HttpResponseError("API Error")
         
         with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
-             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_resource_graph_client):
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_resource_graph_client), \
+             patch('cloudnetdraw.azure_client._list_all_subscriptions', return_value=()):
             
             result = find_hub_vnet_using_resource_graph("rg-1/test-vnet")
             assert result is None
+    
+    def test_find_hub_vnet_unexpected_error_propagates(self):
+        """Test that non-Azure errors are not swallowed into a None result"""
+        mock_credentials = MagicMock()
+        mock_resource_graph_client = MagicMock()
+        mock_resource_graph_client.resources.side_effect = KeyError("subscriptionId")
+        
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_resource_graph_client), \
+             patch('cloudnetdraw.azure_client._list_all_subscriptions', return_value=()), \
+             pytest.raises(KeyError):
+            find_hub_vnet_using_resource_graph("rg-1/test-vnet")
+    
+    def test_find_hub_vnet_escapes_query_values(self):
+        """Test that quotes in the identifier cannot break out of the KQL string literals"""
+        mock_credentials = MagicMock()
+        mock_resource_graph_client = MagicMock()
+        mock_resource_graph_client.resources.side_effect = HttpResponseError("API Error")
+        
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_resource_graph_client):
+            find_hub_vnet_using_resource_graph("sub-1/rg-1/it's-vnet")
+        
+        query = mock_resource_graph_client.resources.call_args[0][0].query
+        assert "where name =~ 'it\\'s-vnet'" in query
+    
+    def test_find_hub_vnet_from_projected_row(self):
+        """Test the hub is built from the projected Resource Graph row without Network API calls"""
+        mock_credentials = MagicMock()
+        mock_subscription_client = MagicMock()
+        mock_subscription = MagicMock()
+        mock_subscription.display_name = 'Test Subscription'
+        mock_subscription.tenant_id = 'tenant-1'
+        mock_subscription_client.subscriptions.get.return_value = mock_subscription
+        
+        hub_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/hub-vnet'
+        spoke_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/spoke-vnet'
+        mock_response = MagicMock()
+        mock_response.data = [{
+            'id': hub_id,
+            'name': 'hub-vnet',
+            'resourceGroup': 'rg-1',
+            'subscriptionId': 'sub-1',
+            'addressSpace': ['10.0.0.0/16'],
+            'subnets': [{'name': 'AzureFirewallSubnet', 'properties': {'addressPrefix': '10.0.1.0/26'}}],
+            'peerings': [{'properties': {'remoteVirtualNetwork': {'id': spoke_id}}}]
+        }]
+        mock_graph_client = MagicMock()
+        mock_graph_client.resources.return_value = mock_response
+        mock_network_client_cls = MagicMock()
+        
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
+             patch('cloudnetdraw.azure_client.SubscriptionClient', return_value=mock_subscription_client), \
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_graph_client), \
+             patch('cloudnetdraw.azure_client.NetworkManagementClient', mock_network_client_cls):
+            
+            hub = find_hub_vnet_using_resource_graph("sub-1/rg-1/hub-vnet")
+        
+        mock_network_client_cls.assert_not_called()
+        assert hub['resource_id'] == hub_id
+        assert hub['address_space'] == '10.0.0.0/16'
+        assert hub['firewall'] == 'Yes'
+        assert hub['is_explicit_hub'] is True
+        assert hub['peering_resource_ids'] == [spoke_id]
+        assert hub['peerings_count'] == 1
 
 
 class TestFindPeeredVnets:
@@ -133,13 +199,97 @@ class TestFindPeeredVnets:
             assert peered_vnets == []  # Should return empty list on exception
             assert accessible_resource_ids == []  # Should return empty list for accessible resource IDs
 
+    @pytest.mark.resource_graph
+    def test_find_peered_vnets_resource_graph_batch(self):
+        """Test find_peered_vnets resolves VNets from one Resource Graph query without per-VNet calls"""
+        mock_credentials = MagicMock()
+        mock_subscription_client = MagicMock()
+        mock_subscription = MagicMock()
+        mock_subscription.display_name = 'Test Subscription'
+        mock_subscription.tenant_id = 'tenant-1'
+        mock_subscription_client.subscriptions.get.return_value = mock_subscription
+        
+        vnet_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/spoke-vnet'
+        remote_id = '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/hub-vnet'
+        mock_response = MagicMock()
+        mock_response.skip_token = None
+        mock_response.data = [{
+            'id': vnet_id,
+            'name': 'spoke-vnet',
+            'resourceGroup': 'rg-1',
+            'subscriptionId': 'sub-1',
+            'addressSpace': ['10.1.0.0/16'],
+            'subnets': [
+                {'name': 'default', 'properties': {'addressPrefix': '10.1.0.0/24', 'routeTable': {'id': 'rt'}}},
+                {'name': 'GatewaySubnet', 'properties': {'addressPrefixes': ['10.1.1.0/27']}}
+            ],
+            'peerings': [
+                {'properties': {'remoteVirtualNetwork': {'id': remote_id}}}
+            ]
+        }]
+        mock_graph_client = MagicMock()
+        mock_graph_client.resources.return_value = mock_response
+        mock_network_client_cls = MagicMock()
+        
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
+             patch('cloudnetdraw.azure_client.SubscriptionClient', return_value=mock_subscription_client), \
+             patch('cloudnetdraw.azure_client.ResourceGraphClient', return_value=mock_graph_client), \
+             patch('cloudnetdraw.azure_client.NetworkManagementClient', mock_network_client_cls):
+            
+            peered_vnets, accessible_resource_ids = find_peered_vnets([vnet_id, vnet_id])
+        
+        mock_graph_client.resources.assert_called_once()
+        mock_network_client_cls.assert_not_called()
+        assert accessible_resource_ids == [vnet_id]
+        assert len(peered_vnets) == 1
+        vnet = peered_vnets[0]
+        assert vnet['name'] == 'spoke-vnet'
+        assert vnet['address_space'] == '10.1.0.0/16'
+        assert vnet['subnets'][0] == {'name': 'default', 'address': '10.1.0.0/24', 'nsg': 'No', 'udr': 'Yes'}
+        assert vnet['subnets'][1]['address'] == '10.1.1.0/27'
+        assert vnet['expressroute'] == 'Yes'
+        assert vnet['peering_resource_ids'] == [remote_id]
+        assert vnet['peerings_count'] == 1
+        assert vnet['azure_console_url'] == f"https://portal.azure.com/#@tenant-1/resource{vnet_id}"
+
+    def test_find_peered_vnets_fetches_subscription_once(self):
+        """Test find_peered_vnets looks up each subscription only once"""
+        mock_credentials = MagicMock()
+        mock_subscription_client = MagicMock()
+        mock_subscription = MagicMock()
+        mock_subscription.display_name = 'Test Subscription'
+        mock_subscription_client.subscriptions.get.return_value = mock_subscription
+        
+        mock_network_client = MagicMock()
+        mock_network_client.virtual_networks.get.side_effect = lambda rg, name: MagicMock(
+            id=f'/subscriptions/sub-1/resourceGroups/{rg}/providers/Microsoft.Network/virtualNetworks/{name}',
+            subnets=[]
+        )
+        mock_network_client.virtual_network_peerings.list.return_value = []
+        
+        resource_ids = [
+            f'/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/vnet-{i}'
+            for i in range(3)
+        ]
+        
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
+             patch('cloudnetdraw.azure_client.SubscriptionClient', return_value=mock_subscription_client), \
+             patch('cloudnetdraw.azure_client.NetworkManagementClient', return_value=mock_network_client) as mock_network_cls:
+            
+            peered_vnets, accessible_resource_ids = find_peered_vnets(resource_ids)
+        
+        assert accessible_resource_ids == resource_ids
+        assert len(peered_vnets) == 3
+        mock_subscription_client.subscriptions.get.assert_called_once_with('sub-1')
+        mock_network_cls.assert_called_once_with(mock_credentials, 'sub-1', **_client_options())
+
 
 class TestGetFilteredVnetTopology:
     """Test get_filtered_vnet_topology function"""
     
     def test_get_filtered_vnet_topology_hub_not_found(self):
         """Test get_filtered_vnet_topology when hub VNet is not found"""
-        with patch('cloudnetdraw.azure_client.find_hub_vnet_using_resource_graph', return_value=None), \
+        with patch('cloudnetdraw.topology.find_hub_vnet_using_resource_graph', return_value=None), \
              pytest.raises(SystemExit) as exc_info:
             get_filtered_vnet_topology("rg-1/nonexistent-vnet", ["sub-1"])
         
@@ -169,6 +319,22 @@ class TestGetFilteredVnetTopology:
             assert len(result['vnets']) == 2  # Hub + 1 spoke
             assert result['vnets'][0]['name'] == 'hub-vnet'
             assert result['vnets'][1]['name'] == 'spoke-vnet'
+    
+    def test_get_filtered_vnet_topology_island_hub(self):
+        """Test a hub without peerings skips the peered VNet lookup"""
+        mock_hub_vnet = {
+            'name': 'hub-vnet',
+            'subscription_name': 'Test Subscription',
+            'peering_resource_ids': []
+        }
+        
+        with patch('cloudnetdraw.topology.find_hub_vnet_using_resource_graph', return_value=mock_hub_vnet), \
+             patch('cloudnetdraw.topology.find_peered_vnets') as mock_find_peered:
+            
+            result = get_filtered_vnet_topology("rg-1/hub-vnet", ["sub-1"])
+        
+        mock_find_peered.assert_not_called()
+        assert result == {'vnets': [mock_hub_vnet]}
 
 
 class TestGetVnetTopologyForSelectedSubscriptions:
@@ -257,6 +423,42 @@ class TestGetVnetTopologyForSelectedSubscriptions:
         
         assert exc_info.value.code == 1
 
+    def test_get_vnet_topology_does_not_recollect_throttled_subscription(self):
+        """Test a throttling error that outlasts the SDK retries is not retried again per subscription"""
+        mock_credentials = MagicMock()
+        mock_subscription_client = MagicMock()
+        mock_subscription = MagicMock()
+        mock_subscription.display_name = 'Test Subscription'
+        mock_subscription_client.subscriptions.get.return_value = mock_subscription
+
+        error_response = MagicMock()
+        error_response.status_code = 429
+        mock_network_client = MagicMock()
+        mock_network_client.virtual_wans.list.side_effect = HttpResponseError("Too many requests", response=error_response)
+
+        with patch('cloudnetdraw.azure_client.get_credentials', return_value=mock_credentials), \
+             patch('cloudnetdraw.azure_client.SubscriptionClient', return_value=mock_subscription_client), \
+             patch('cloudnetdraw.azure_client.NetworkManagementClient', return_value=mock_network_client), \
+             pytest.raises(SystemExit) as exc_info:
+            get_vnet_topology_for_selected_subscriptions(["sub-1"])
+
+        assert exc_info.value.code == 1
+        mock_network_client.virtual_wans.list.assert_called_once()
+
+    def test_get_vnet_topology_reports_every_failed_subscription(self, caplog):
+        """Test all failing subscriptions are logged before exiting once"""
+        def collect(subscription_id, graph_rows_by_subscription, exclude_resource_ids):
+            raise VNetCollectionError(f"boom in {subscription_id}")
+
+        with patch('cloudnetdraw.azure_client._query_vnets_in_subscriptions', return_value={}), \
+             patch('cloudnetdraw.azure_client._collect_vnets_for_subscription', side_effect=collect), \
+             pytest.raises(SystemExit) as exc_info:
+            get_vnet_topology_for_selected_subscriptions(["sub-1", "sub-2"])
+
+        assert exc_info.value.code == 1
+        assert "boom in sub-1" in caplog.text
+        assert "boom in sub-2" in caplog.text
+
 
 class TestCredentialsAndSubscriptionHandling:
     """Test credential and subscription handling functions"""
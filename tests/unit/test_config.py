@@ -220,11 +220,21 @@ class TestConfig:
             # Test group height extra
             assert config.group_height_extra == 20
 
+    def test_properties_cached_per_instance(self, sample_config_dict, mock_config_file):
+        """Test accessor properties are resolved once and then read from the instance"""
+        with patch('os.path.exists', return_value=True):
+            config = Config('config.yaml')
+            
+            assert 'layout' not in config.__dict__
+            assert config.layout is config.layout
+            assert config.__dict__['layout'] is sample_config_dict['layout']
+            assert config.vnet_width == config.__dict__['vnet_width'] == 400
+
     def test_config_file_path_resolution_same_directory(self, sample_config_dict):
         """Test config file resolution from same directory"""
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=sample_config_dict):
+             patch('yaml.load', return_value=sample_config_dict):
             config = Config('config.yaml')
             assert config.config_file == 'config.yaml'
 
@@ -233,7 +243,7 @@ class TestConfig:
         config_path = '/path/to/custom/config.yaml'
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=sample_config_dict):
+             patch('yaml.load', return_value=sample_config_dict):
             config = Config(config_path)
             assert config.config_file == config_path
 
@@ -242,7 +252,7 @@ class TestConfig:
         config_path = '../configs/test.yaml'
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=sample_config_dict):
+             patch('yaml.load', return_value=sample_config_dict):
             config = Config(config_path)
             assert config.config_file == config_path
 
@@ -257,7 +267,7 @@ class TestConfig:
         
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=incomplete_config):
+             patch('yaml.load', return_value=incomplete_config):
             # Should raise ConfigValidationError during initialization
             with pytest.raises(ConfigValidationError, match="Missing required key 'styles'"):
                 Config('config.yaml')
@@ -368,7 +378,7 @@ class TestConfig:
         
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=custom_config):
+             patch('yaml.load', return_value=custom_config):
             config = Config('config.yaml')
             
             assert config.hub_threshold == 5
@@ -421,7 +431,7 @@ class TestConfigValidation:
         for invalid_config in invalid_configs:
             with patch('os.path.exists', return_value=True), \
                  patch('builtins.open', mock_open()), \
-                 patch('yaml.safe_load', return_value=invalid_config):
+                 patch('yaml.load', return_value=invalid_config):
                 with pytest.raises(ConfigValidationError):
                     Config('config.yaml')
 
@@ -444,7 +454,7 @@ class TestConfigValidation:
 
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=invalid_config):
+             patch('yaml.load', return_value=invalid_config):
             with pytest.raises(ConfigValidationError, match="Missing required key 'hub'"):
                 Config('config.yaml')
 
@@ -473,7 +483,7 @@ class TestConfigValidation:
 
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=invalid_config):
+             patch('yaml.load', return_value=invalid_config):
             with pytest.raises(ConfigValidationError, match="Expected int.*got str"):
                 Config('config.yaml')
 
@@ -527,7 +537,7 @@ class TestConfigValidation:
 
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=invalid_config):
+             patch('yaml.load', return_value=invalid_config):
             with pytest.raises(ConfigValidationError, match="Missing required field 'height' in icon 'vnet' at icons.vnet"):
                 Config('config.yaml')
 
@@ -580,7 +590,7 @@ class TestConfigValidation:
 
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=invalid_config):
+             patch('yaml.load', return_value=invalid_config):
             with pytest.raises(ConfigValidationError, match="Expected int for 'width' in icon 'vnet'.*got str"):
                 Config('config.yaml')
 
@@ -631,7 +641,7 @@ class TestConfigValidation:
 
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=config_with_float):
+             patch('yaml.load', return_value=config_with_float):
             # Should not raise exception - floats are allowed for y_offset
             config = Config('config.yaml')
             assert config.icon_positioning['vnet_icons']['y_offset'] == 3.5
@@ -667,6 +677,6 @@ class TestConfigValidation:
 
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open()), \
-             patch('yaml.safe_load', return_value=invalid_config):
+             patch('yaml.load', return_value=invalid_config):
             with pytest.raises(ConfigValidationError, match="Expected int at layout.hub.spacing_x, got str"):
                 Config('config.yaml')
\ No newline at end of file
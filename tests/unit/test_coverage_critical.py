@@ -209,6 +209,27 @@ class TestQueryCommandValidation:
             query_command(mock_args)
         assert exc_info.value.code == 1
 
+    def test_parse_query_args_single_pass(self):
+        """Test query argument parsing splits comma-separated values and classifies arguments once"""
+        import argparse
+        from cloudnetdraw.cli import _parse_query_args
+
+        args = argparse.Namespace(
+            output="",
+            subscriptions=" sub-a , ,sub-b ",
+            subscriptions_file=None,
+            config_file=None,
+            vnets=" , "
+        )
+
+        parsed = _parse_query_args(args)
+
+        assert parsed.subscriptions == ("sub-a", "sub-b")
+        assert parsed.vnets == ()
+        assert parsed.empty_file_args == ["--output"]
+        assert parsed.empty_args == ["--vnets"]
+        assert parsed.provided_args == ["--subscriptions"]
+
 class TestHierarchicalIdGeneration:
     """Test hierarchical ID generation fallback logic"""
 
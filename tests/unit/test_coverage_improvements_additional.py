@@ -70,7 +70,8 @@ class TestAdditionalCoverageImprovements:
             result = find_hub_vnet_using_resource_graph("test-sub/test-rg/test-vnet")
             
             # Verify the query was called with subscription ID filter
-            assert mock_resource_graph_client.resources.call_count == 2
+            # The diagnostic query only runs when the lookup finds nothing
+            assert mock_resource_graph_client.resources.call_count == 1
             query_request = mock_resource_graph_client.resources.call_args_list[0][0][0]
             assert "subscriptionId =~ 'test-sub'" in query_request.query
             assert result is not None
@@ -1,10 +1,14 @@
 """
 Unit tests for diagram generation logic
 """
+import base64
+import json
 import pytest
+import zlib
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from lxml import etree
 from pathlib import Path
+from urllib.parse import unquote
 
 # Import functions under test
 from cloudnetdraw.diagram_generator import (
@@ -115,6 +119,16 @@ class TestXMLGeneration:
         assert cells[0].get("id") == "0"
         assert cells[1].get("id") == "1"
 
+    def test_setup_xml_structure_single_document(self):
+        """Test the generator's root cell container belongs to the mxfile document"""
+        from cloudnetdraw.config import Config
+        from cloudnetdraw.diagram_generator import _setup_xml_structure
+        
+        mxfile, root = _setup_xml_structure(Config())
+        
+        assert root.getroottree().getroot() is mxfile
+        assert [cell.get("id") for cell in root] == ["0", "1"]
+
     def test_vnet_element_creation(self):
         """Test VNet element creation"""
         mxfile, root = self.create_basic_xml_structure()
@@ -277,6 +291,67 @@ class TestHLDGeneration:
             assert args[0] == 'network_hld.drawio'
             assert args[1] == 'network_topology.json'
 
+    def test_hld_generation_compressed(self, sample_topology, tmp_path):
+        """Test compressed HLD output decodes back to the uncompressed mxGraphModel"""
+        from cloudnetdraw.config import Config
+        
+        topology_file = tmp_path / 'topology.json'
+        topology_file.write_text(json.dumps(sample_topology))
+        plain_file = tmp_path / 'network_hld.drawio'
+        compressed_file = tmp_path / 'network_hld_compressed.drawio'
+        
+        generate_hld_diagram(str(plain_file), str(topology_file), Config())
+        generate_hld_diagram(str(compressed_file), str(topology_file), Config(), compress=True)
+        
+        diagram = etree.parse(str(compressed_file)).getroot().find('diagram')
+        assert diagram.find('mxGraphModel') is None
+        inflated = zlib.decompress(base64.b64decode(diagram.text), -15)
+        model = etree.fromstring(unquote(inflated.decode('ascii')))
+        
+        parser = etree.XMLParser(remove_blank_text=True)
+        expected = etree.parse(str(plain_file), parser).getroot().find('diagram/mxGraphModel')
+        assert etree.tostring(model) == etree.tostring(expected)
+
+    def test_hld_edges_resolve_with_whitespace_in_vnet_name(self, tmp_path):
+        """Test edge endpoints still match cell IDs when a VNet name contains a tab or newline"""
+        from cloudnetdraw.config import Config
+        
+        def vnet(name, peers):
+            return {
+                'name': name,
+                'address_space': '10.0.0.0/16',
+                'subnets': [],
+                'resource_id': f'/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/{name}',
+                'subscription_name': 'Test Subscription',
+                'resourcegroup_name': 'rg-1',
+                'peering_resource_ids': [
+                    f'/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/{peer}'
+                    for peer in peers
+                ],
+                'peerings_count': len(peers),
+                'expressroute': 'No',
+                'vpn_gateway': 'No',
+                'firewall': 'No'
+            }
+        
+        spokes = ['spoke\tone', 'spoke\ntwo', 'spoke-three']
+        topology = {'vnets': [vnet('hub\tvnet', spokes)] + [vnet(spoke, ['hub\tvnet']) for spoke in spokes]}
+        topology['vnets'][0]['is_explicit_hub'] = True
+        topology_file = tmp_path / 'topology.json'
+        topology_file.write_text(json.dumps(topology))
+        output_file = tmp_path / 'network_hld.drawio'
+        
+        generate_hld_diagram(str(output_file), str(topology_file), Config())
+        
+        root = etree.parse(str(output_file)).getroot()
+        cell_ids = {element.get('id') for element in root.iter('mxCell', 'object')}
+        edges = root.findall('.//mxCell[@edge="1"]')
+        assert edges
+        for edge in edges:
+            assert edge.get('source') in cell_ids
+            assert edge.get('target') in cell_ids
+        assert 'Test Subscription.rg-1.hub\tvnet' in cell_ids
+
 
 class TestMLDGeneration:
     """Test Mid-Level Diagram generation"""
@@ -352,6 +427,35 @@ class TestMLDGeneration:
             assert args[0] == 'network_mld.drawio'
             assert args[1] == 'network_topology.json'
 
+    def test_mld_subnet_cells_keep_whitespace(self, tmp_path):
+        """Test subnet values and IDs keep tabs from subnet and VNet names"""
+        from cloudnetdraw.config import Config
+        
+        topology = {'vnets': [{
+            'name': 'app\tvnet',
+            'address_space': '10.0.0.0/16',
+            'subnets': [{'name': 'web\tsubnet', 'address': '10.0.0.0/24', 'nsg': 'Yes', 'udr': 'Yes'}],
+            'resource_id': '/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Network/virtualNetworks/app-vnet',
+            'subscription_name': 'Test Subscription',
+            'resourcegroup_name': 'rg-1',
+            'peering_resource_ids': [],
+            'peerings_count': 0,
+            'expressroute': 'No',
+            'vpn_gateway': 'No',
+            'firewall': 'No'
+        }]}
+        topology_file = tmp_path / 'topology.json'
+        topology_file.write_text(json.dumps(topology))
+        output_file = tmp_path / 'network_mld.drawio'
+        
+        generate_mld_diagram(str(output_file), str(topology_file), Config())
+        
+        root = etree.parse(str(output_file)).getroot()
+        cells = {cell.get('id'): cell for cell in root.iter('mxCell')}
+        subnet_cell = cells['Test Subscription.rg-1.app\tvnet.subnet.0']
+        assert subnet_cell.get('value') == 'web\tsubnet 10.0.0.0/24'
+        assert 'Test Subscription.rg-1.app\tvnet.icon.nsg_0' in cells
+
 
 class TestDiagramErrorHandling:
     """Test error handling in diagram generation"""
@@ -410,6 +410,16 @@ class TestDrawIOMetadataValidation:
         main_id = generate_hierarchical_id(vnet_without_metadata, 'main')
         assert main_id == "test-vnet_main", f"Expected test-vnet_main, got {main_id}"
 
+    def test_hierarchical_id_base_matches_generated_ids(self, sample_vnet_with_full_metadata):
+        """Test that IDs built from the shared base match generate_hierarchical_id"""
+        from cloudnetdraw.utils import hierarchical_id_base
+        
+        for vnet_data in (sample_vnet_with_full_metadata, {'name': 'test-vnet'}):
+            base_id, separator = hierarchical_id_base(vnet_data)
+            assert base_id == generate_hierarchical_id(vnet_data, 'group')
+            assert f"{base_id}{separator}subnet{separator}3" == generate_hierarchical_id(vnet_data, 'subnet', '3')
+            assert f"{base_id}{separator}icon{separator}nsg_3" == generate_hierarchical_id(vnet_data, 'icon', 'nsg_3')
+
     def test_full_diagram_metadata_validation_hld(self, sample_vnet_with_full_metadata, sample_spoke_vnet_with_metadata, mock_config):
         """Test metadata validation in a complete HLD diagram"""
         topology = {
@@ -6,8 +6,12 @@ from unittest.mock import Mock, patch
 
 # Import functions under test
 from cloudnetdraw.topology import (
+    build_hub_index_map,
     determine_hub_for_spoke,
-    create_vnet_id_mapping
+    create_vnet_id_mapping,
+    create_layout_vnet_id_mapping,
+    find_first_hub_zone,
+    get_hub_connections_for_spoke
 )
 from cloudnetdraw.utils import extract_vnet_name_from_resource_id
 
@@ -126,6 +130,17 @@ class TestHubDetermination:
         result = determine_hub_for_spoke(spoke_vnet, hub_vnets)
         assert result == 'hub_0'
 
+    def test_find_first_hub_zone_uses_hub_order(self):
+        """Test the lowest hub index wins regardless of the spoke's peering order"""
+        hub_vnets = [{'name': 'hub1', 'resource_id': 'hub1-id'}, {'name': 'hub2', 'resource_id': 'hub2-id'}]
+        spoke_vnet = {'name': 'spoke1', 'peering_resource_ids': ['hub2-id', 'other-id', 'hub1-id']}
+        hub_index_map = build_hub_index_map(hub_vnets)
+        
+        assert find_first_hub_zone(spoke_vnet, hub_vnets) == 0
+        assert find_first_hub_zone(spoke_vnet, hub_vnets, hub_index_map) == 0
+        assert find_first_hub_zone({'peering_resource_ids': ['other-id']}, hub_vnets, hub_index_map) == 0
+        assert get_hub_connections_for_spoke(spoke_vnet, hub_vnets, hub_index_map) == [0, 1]
+
 
 class TestVnetNameExtractionFromResourceId:
     """Test VNet name extraction from resource ID functionality"""
@@ -408,4 +423,27 @@ class TestVNetIdMapping:
         # Should still create mapping for existing VNets
         assert result['hub1'] == 'hub_0'
         assert result['spoke1'] == 'right_spoke0_0'
-        assert result['missing-spoke'] == 'right_spoke0_1'  # Still gets mapped
\ No newline at end of file
+        assert result['missing-spoke'] == 'right_spoke0_1'  # Still gets mapped
+
+    @pytest.mark.parametrize("metadata", [
+        {},
+        {'subscription_name': 'sub', 'resourcegroup_name': 'rg', 'tenant_id': 't', 'subscription_id': 's'},
+    ])
+    def test_create_layout_vnet_id_mapping_matches_zone_mapping(self, metadata):
+        """Test layout mapping matches create_vnet_id_mapping over the equivalent zones"""
+        def vnet(name):
+            return {'name': name, 'resource_id': f'/subscriptions/s/resourceGroups/rg/providers/Microsoft.Network/virtualNetworks/{name}', **metadata}
+        
+        hub_vnets = [vnet('hub1'), vnet('hub2')]
+        zone_spokes = [[vnet(f'spoke{i}') for i in range(8)], [vnet('spoke8')]]
+        hubless_spokes = [vnet('hubless1')]
+        all_non_peered = [vnet('isolated1')]
+        zones = [
+            {'hub': hub_vnets[0], 'hub_index': 0, 'spokes': zone_spokes[0]},
+            {'hub': hub_vnets[1], 'hub_index': 1, 'spokes': zone_spokes[1]},
+            {'hub': None, 'hub_index': 2, 'spokes': hubless_spokes},
+        ]
+        
+        result = create_layout_vnet_id_mapping(hub_vnets, zone_spokes, hubless_spokes, all_non_peered)
+        
+        assert result == create_vnet_id_mapping([], zones, all_non_peered)
\ No newline at end of file
@@ -39,6 +39,7 @@ class TestSubscriptionIdValidation:
         ("", False),  # Empty string
         ("12345678-1234-1234-1234", False),  # Missing segment
         ("12345678-1234-1234-1234-123456789012-extra", False),  # Extra segment
+        ("12345678-1234-1234-1234-123456789012\n", False),  # Trailing newline
     ])
     def test_is_subscription_id(self, subscription_id, expected):
         """Test subscription ID validation with various formats"""
@@ -10,6 +10,7 @@ import uuid
 import sys
 import argparse
 import itertools
+from collections import Counter
 from typing import Dict, List, Any, Tuple, Optional, Set
 
 
@@ -48,13 +49,15 @@ def generate_vnet(name: str, subscription_id: str, resource_group: str, location
     }
 
 
-def add_bidirectional_peering(vnet_peerings: Dict[str, List[str]], 
+def add_bidirectional_peering(vnet_peerings: Dict[str, Dict[str, None]], 
                              resource_id_a: str, resource_id_b: str) -> None:
-    """Add bidirectional peering between two VNets by resource ID"""
-    if resource_id_b not in vnet_peerings[resource_id_a]:
-        vnet_peerings[resource_id_a].append(resource_id_b)
-    if resource_id_a not in vnet_peerings[resource_id_b]:
-        vnet_peerings[resource_id_b].append(resource_id_a)
+    """Add bidirectional peering between two VNets by resource ID
+    
+    Each VNet's peerings are kept as dict keys: an insertion-ordered set, so adding an
+    existing peering is an O(1) no-op and the generated order stays reproducible.
+    """
+    vnet_peerings[resource_id_a][resource_id_b] = None
+    vnet_peerings[resource_id_b][resource_id_a] = None
 
 
 def get_decorator_combinations() -> List[Tuple[str, str, str]]:
@@ -228,7 +231,7 @@ def create_azure_realistic_topology(total_vnets: int, centralization: int, conne
         all_resource_ids.append(isolated_resource_id)
     
     for resource_id in all_resource_ids:
-        vnet_peerings[resource_id] = []
+        vnet_peerings[resource_id] = {}
     
     # Phase 5: Connect spokes to primary hubs
     for spoke in all_spokes:
@@ -278,7 +281,7 @@ def create_azure_realistic_topology(total_vnets: int, centralization: int, conne
     # Create hub VNets
     for hub in hubs:
         hub_name = hub['name']
-        peering_list = vnet_peerings[hub['resource_id']]
+        peering_list = list(vnet_peerings[hub['resource_id']])
         
         expressroute, vpn_gateway, firewall = decorator_combinations[combo_index % len(decorator_combinations)]
         combo_index += 1
@@ -290,7 +293,7 @@ def create_azure_realistic_topology(total_vnets: int, centralization: int, conne
     # Create spoke VNets
     for spoke in all_spokes:
         spoke_name = spoke['name']
-        peering_list = vnet_peerings[spoke['resource_id']]
+        peering_list = list(vnet_peerings[spoke['resource_id']])
         
         expressroute, vpn_gateway, firewall = decorator_combinations[combo_index % len(decorator_combinations)]
         combo_index += 1
@@ -303,7 +306,7 @@ def create_azure_realistic_topology(total_vnets: int, centralization: int, conne
     for cluster in standalone_clusters:
         for cluster_vnet in cluster:
             cluster_name = cluster_vnet['name']
-            peering_list = vnet_peerings[cluster_vnet['resource_id']]
+            peering_list = list(vnet_peerings[cluster_vnet['resource_id']])
             
             expressroute, vpn_gateway, firewall = decorator_combinations[combo_index % len(decorator_combinations)]
             combo_index += 1
@@ -421,7 +424,7 @@ def classify_edge_types(vnets: List[Dict[str, Any]]) -> Dict[str, int]:
     return edge_counts
 
 
-def ensure_all_edge_types(vnets: List[Dict[str, Any]], vnet_peerings: Dict[str, List[str]]) -> None:
+def ensure_all_edge_types(vnets: List[Dict[str, Any]], vnet_peerings: Dict[str, Dict[str, None]]) -> None:
     """Ensure all 6 EdgeTypes are present by adding strategic connections"""
     
     # Get current edge type counts
@@ -472,9 +475,8 @@ def ensure_all_edge_types(vnets: List[Dict[str, Any]], vnet_peerings: Dict[str,
                 same_zone_spokes = [s for s in spoke_vnets if vnet_to_zone.get(s['resource_id']) == hub_zone]
                 if same_zone_spokes:
                     spoke = same_zone_spokes[0]
-                    # Check if not already connected
-                    if spoke['resource_id'] not in vnet_peerings[hub['resource_id']]:
-                        add_bidirectional_peering(vnet_peerings, hub['resource_id'], spoke['resource_id'])
+                    # Adding an existing peering is a no-op
+                    add_bidirectional_peering(vnet_peerings, hub['resource_id'], spoke['resource_id'])
                     break
                     
         elif edge_type == 'HUB_TO_SPOKE_DIFF_ZONE' and len(hub_vnets) >= 2 and spoke_vnets:
@@ -521,13 +523,14 @@ def ensure_all_edge_types(vnets: List[Dict[str, Any]], vnet_peerings: Dict[str,
                 add_bidirectional_peering(vnet_peerings, no_zone_vnet['resource_id'], spoke['resource_id'])
 
 
-def update_vnet_peering_counts(vnets: List[Dict[str, Any]], vnet_peerings: Dict[str, List[str]]) -> None:
+def update_vnet_peering_counts(vnets: List[Dict[str, Any]], vnet_peerings: Dict[str, Dict[str, None]]) -> None:
     """Update peering_resource_ids and peerings_count in VNet objects"""
     for vnet in vnets:
         resource_id = vnet['resource_id']
         if resource_id in vnet_peerings:
-            vnet['peering_resource_ids'] = vnet_peerings[resource_id]
-            vnet['peerings_count'] = len(vnet_peerings[resource_id])
+            peering_list = list(vnet_peerings[resource_id])
+            vnet['peering_resource_ids'] = peering_list
+            vnet['peerings_count'] = len(peering_list)
 
 
 def parse_arguments():
@@ -621,10 +624,13 @@ def main():
         # Calculate statistics
         vnets = topology['vnets']
         total_vnets = len(vnets)
-        hub_count = len([v for v in vnets if 'connectivity-hub' in v['name']])
-        spoke_count = len([v for v in vnets if 'app-spoke' in v['name']])
-        cluster_count = len([v for v in vnets if 'cluster-' in v['name']])
-        isolated_count = len([v for v in vnets if 'isolated' in v['name']])
+        # One pass keyed on the generated name prefix; a substring test would also match
+        # e.g. an isolated VNet whose name happened to contain 'app-spoke'
+        kind_counts = Counter(v['name'].split('-', 1)[0] for v in vnets)
+        hub_count = kind_counts['connectivity']
+        spoke_count = kind_counts['app']
+        cluster_count = kind_counts['cluster']
+        isolated_count = kind_counts['isolated']
         
         total_edges = sum(len(v['peering_resource_ids']) for v in vnets) // 2
         
@@ -4,11 +4,15 @@ Comprehensive validation script for CloudNet Draw sample topologies
 Validates JSON topology files and their corresponding DrawIO diagrams for duplicate edges
 """
 
+import contextlib
+import functools
+import io
 import json
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 import os
 import sys
-from typing import Dict, List, Tuple, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple, Set
 import re
 
 
@@ -16,12 +20,63 @@ def load_json_topology(filepath: str) -> Dict:
     """Load and parse JSON topology file"""
     try:
         with open(filepath, 'r') as f:
-            return json.load(f)
+            topology = json.load(f)
     except Exception as e:
         print(f"ERROR: Failed to load {filepath}: {e}")
         return {}
+    
+    intern_resource_ids(topology)
+    return topology
+
 
+def intern_resource_ids(topology: Dict) -> None:
+    """Intern VNet and peering resource IDs in place
+    
+    json.load creates a new string for every occurrence of a resource ID. Interning makes each
+    ID (here and in the DrawIO parsers) a single shared object, so the pair sets compared
+    between JSON and DrawIO hold fewer strings and their equality checks are identity hits.
+    """
+    vnets = topology.get('vnets') if isinstance(topology, dict) else None
+    if not isinstance(vnets, list):
+        return
+    
+    for vnet in vnets:
+        if not isinstance(vnet, dict):
+            continue
+        resource_id = vnet.get('resource_id')
+        if isinstance(resource_id, str):
+            vnet['resource_id'] = sys.intern(resource_id)
+        peering_resource_ids = vnet.get('peering_resource_ids')
+        if isinstance(peering_resource_ids, list):
+            vnet['peering_resource_ids'] = [
+                sys.intern(peering_resource_id) if isinstance(peering_resource_id, str) else peering_resource_id
+                for peering_resource_id in peering_resource_ids
+            ]
+
+
+def memoize_by_file_state(parse: Callable) -> Callable:
+    """Cache a file parser's result keyed by (path, mtime, size)
+    
+    Each diagram is read by several checks; this parses it once and reparses only if the
+    file changes on disk. Two entries cover the HLD and MLD of the topology being validated.
+    Parsed results are shared, so callers must not mutate them.
+    """
+    @functools.lru_cache(maxsize=2)
+    def parse_file_state(filepath: str, mtime_ns: int, size: int):
+        return parse(filepath)
+    
+    @functools.wraps(parse)
+    def wrapper(filepath: str):
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return parse(filepath)  # Let the parser report the missing/unreadable file
+        return parse_file_state(filepath, stat.st_mtime_ns, stat.st_size)
+    
+    return wrapper
 
+
+@memoize_by_file_state
 def parse_drawio_edges(filepath: str) -> List[Tuple[str, str]]:
     """Parse DrawIO XML file and extract edge connections"""
     try:
@@ -45,6 +100,7 @@ def parse_drawio_edges(filepath: str) -> List[Tuple[str, str]]:
         return []
 
 
+@memoize_by_file_state
 def parse_drawio_vnets(filepath: str) -> List[Dict[str, str]]:
     """Parse DrawIO XML file and extract VNet information using XML IDs as primary identifiers"""
     try:
@@ -58,7 +114,7 @@ def parse_drawio_vnets(filepath: str) -> List[Dict[str, str]]:
         for element in root.iter():
             if element.tag == 'object':
                 element_id = element.get('id', '')
-                resource_id = element.get('resource_id', '')
+                resource_id = sys.intern(element.get('resource_id', ''))
                 label = element.get('label', '')
                 
                 # Only include group containers with resource_id (avoid inner .main duplicates)
@@ -127,47 +183,38 @@ def extract_vnet_name_from_label(label: str) -> str:
     return ""
 
 
+@memoize_by_file_state
 def parse_drawio_edge_endpoints(filepath: str) -> List[Tuple[str, str, str, str]]:
     """Parse DrawIO XML file and extract edge information using XML IDs and resource_ids"""
     try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        # Build mapping from XML IDs to resource_ids
+        # Mapping from XML IDs to resource_ids
         id_to_resource_id = {}
-        
-        for element in root.iter():
-            if element.tag == 'object':
+        # Edge XML ID pairs in document order; an edge may reference an object that appears
+        # later in the file, so endpoints are resolved once the whole file has been read
+        edge_xml_ids = []
+        
+        # Single streaming pass over the cells only: each one is handled on its end event and then cleared
+        for _, element in ET.iterparse(filepath, tag=('object', 'mxCell')):
+            tag = element.tag
+            if tag == 'object':
                 element_id = element.get('id', '')
-                resource_id = element.get('resource_id', '')
+                resource_id = sys.intern(element.get('resource_id', ''))
                 
                 # Map XML ID to resource_id if available
                 if element_id and resource_id:
                     id_to_resource_id[element_id] = resource_id
-        
-        edges = []
-        edge_styles = {}  # Track edge styles for validation
-        
-        # Find all edge elements and resolve their endpoints using XML IDs
-        for element in root.iter():
-            if element.tag == 'mxCell' and element.get('edge') == '1':
+            elif tag == 'mxCell' and element.get('edge') == '1':
                 source_xml_id = element.get('source')
                 target_xml_id = element.get('target')
-                edge_style = element.get('style', '')
-                
                 if source_xml_id and target_xml_id:
-                    source_resource_id = id_to_resource_id.get(source_xml_id, '')
-                    target_resource_id = id_to_resource_id.get(target_xml_id, '')
-                    
-                    # Store edge style for analysis using resource_ids
-                    if source_resource_id and target_resource_id:
-                        edge_key = tuple(sorted([source_resource_id, target_resource_id]))
-                        edge_styles[edge_key] = edge_style
-                    
-                    # Return XML IDs and resource_ids for validation
-                    edges.append((source_xml_id, target_xml_id, source_resource_id, target_resource_id))
-        
-        return edges
+                    edge_xml_ids.append((source_xml_id, target_xml_id))
+            element.clear()
+        
+        # Return XML IDs and resource_ids for validation
+        return [
+            (source_xml_id, target_xml_id, id_to_resource_id.get(source_xml_id, ''), id_to_resource_id.get(target_xml_id, ''))
+            for source_xml_id, target_xml_id in edge_xml_ids
+        ]
     except Exception as e:
         print(f"ERROR: Failed to parse edge endpoints from {filepath}: {e}")
         return []
@@ -179,17 +226,14 @@ def get_json_peering_relationships(topology: Dict) -> Set[Tuple[str, str]]:
         return set()
     
     peering_pairs = set()
-    vnets = topology['vnets']
-    
-    for vnet in vnets:
+    for vnet in topology['vnets']:
         vnet_resource_id = vnet.get('resource_id', '')
-        peering_resource_ids = vnet.get('peering_resource_ids', [])
-        
-        for peering_resource_id in peering_resource_ids:
-            if peering_resource_id and vnet_resource_id != peering_resource_id:
-                # Create normalized pair using resource_ids (always sort to avoid duplicates)
-                pair = tuple(sorted([vnet_resource_id, peering_resource_id]))
-                peering_pairs.add(pair)
+        # Normalized pairs using resource_ids (smaller ID first to avoid duplicates)
+        peering_pairs.update(
+            (vnet_resource_id, peering_resource_id) if vnet_resource_id < peering_resource_id else (peering_resource_id, vnet_resource_id)
+            for peering_resource_id in vnet.get('peering_resource_ids', [])
+            if peering_resource_id and vnet_resource_id != peering_resource_id
+        )
     
     return peering_pairs
 
@@ -213,23 +257,22 @@ def count_json_peering_relationships(topology: Dict) -> int:
     if not topology or 'vnets' not in topology:
         return 0
     
-    peering_pairs = set()
-    vnets = topology['vnets']
-    
-    # Create mapping from resource_id to VNet for lookups
-    resource_id_to_vnet = {vnet.get('resource_id'): vnet for vnet in vnets if vnet.get('resource_id')}
-    
-    for vnet in vnets:
+    # Single walk over the VNets: collect known resource_ids and every peering, then keep
+    # only peerings whose target exists once all resource_ids have been seen
+    resource_ids = set()
+    pending_pairs = []
+    for vnet in topology['vnets']:
         vnet_resource_id = vnet.get('resource_id', '')
-        peering_resource_ids = vnet.get('peering_resource_ids', [])
-        
-        for peering_resource_id in peering_resource_ids:
-            # Only count if the target VNet exists in our topology
-            if peering_resource_id in resource_id_to_vnet:
-                # Create normalized pair (always sort to avoid duplicates)
-                pair = tuple(sorted([vnet_resource_id, peering_resource_id]))
-                peering_pairs.add(pair)
-    
+        if vnet_resource_id:
+            resource_ids.add(vnet_resource_id)
+        pending_pairs.extend((vnet_resource_id, peering_resource_id) for peering_resource_id in vnet.get('peering_resource_ids', []))
+    
+    # Normalized pairs (smaller ID first to avoid duplicates)
+    peering_pairs = {
+        (vnet_resource_id, peering_resource_id) if vnet_resource_id < peering_resource_id else (peering_resource_id, vnet_resource_id)
+        for vnet_resource_id, peering_resource_id in pending_pairs
+        if peering_resource_id in resource_ids
+    }
     return len(peering_pairs)
 
 
@@ -298,9 +341,10 @@ def count_hub_spoke_cross_zone_edges(topology: Dict) -> Tuple[int, int]:
     return hub_spoke_edges, cross_zone_edges
 
 
-def validate_endpoint_consistency(json_file: str, drawio_file: str) -> bool:
+def validate_endpoint_consistency(json_file: str, drawio_file: str, topology: Dict = None) -> bool:
     """Validate that endpoints match between JSON and DrawIO files using resource_id as primary key"""
-    topology = load_json_topology(json_file)
+    if topology is None:
+        topology = load_json_topology(json_file)
     if not topology:
         return False
     
@@ -398,9 +442,10 @@ def validate_endpoint_consistency(json_file: str, drawio_file: str) -> bool:
     return validation_passed
 
 
-def validate_multi_hub_connections(json_file: str, drawio_file: str) -> bool:
+def validate_multi_hub_connections(json_file: str, drawio_file: str, topology: Dict = None) -> bool:
     """Validate multi-hub spoke connections are properly represented using resource_id indexing"""
-    topology = load_json_topology(json_file)
+    if topology is None:
+        topology = load_json_topology(json_file)
     if not topology:
         return False
     
@@ -470,9 +515,10 @@ def validate_multi_hub_connections(json_file: str, drawio_file: str) -> bool:
     return validation_passed
 
 
-def validate_json_duplicate_peerings(json_file: str) -> bool:
+def validate_json_duplicate_peerings(json_file: str, topology: Dict = None) -> bool:
     """Check for duplicate peerings in JSON topology"""
-    topology = load_json_topology(json_file)
+    if topology is None:
+        topology = load_json_topology(json_file)
     if not topology:
         return False
     
@@ -524,7 +570,7 @@ def validate_json_duplicate_peerings(json_file: str) -> bool:
 
 def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str = None) -> bool:
     """Comprehensive validation of topology file and its corresponding diagrams"""
-    # Load JSON topology
+    # Load JSON topology once and share it with every check below
     topology = load_json_topology(json_file)
     if not topology:
         return False
@@ -538,20 +584,20 @@ def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str =
     validation_passed = True
     
     # Check for duplicate peerings in JSON
-    if not validate_json_duplicate_peerings(json_file):
+    if not validate_json_duplicate_peerings(json_file, topology):
         validation_passed = False
     
     # Enhanced validation for endpoint consistency
     if hld_file and os.path.exists(hld_file):
-        if not validate_endpoint_consistency(json_file, hld_file):
+        if not validate_endpoint_consistency(json_file, hld_file, topology):
             validation_passed = False
-        if not validate_multi_hub_connections(json_file, hld_file):
+        if not validate_multi_hub_connections(json_file, hld_file, topology):
             validation_passed = False
     
     if mld_file and os.path.exists(mld_file):
-        if not validate_endpoint_consistency(json_file, mld_file):
+        if not validate_endpoint_consistency(json_file, mld_file, topology):
             validation_passed = False
-        if not validate_multi_hub_connections(json_file, mld_file):
+        if not validate_multi_hub_connections(json_file, mld_file, topology):
             validation_passed = False
     
     # Validate HLD file if provided
@@ -578,21 +624,23 @@ def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str =
             print(f"ERROR: {base_name} VNet count mismatch - JSON: {json_vnet_count}, HLD: {drawio_vnet_count}")
             validation_passed = False
         
-        # 2. Validate VNet resource_ids match (using resource_ids as primary keys)
-        missing_in_drawio = json_resource_ids - drawio_resource_ids
-        extra_in_drawio = drawio_resource_ids - json_resource_ids
-        
-        if missing_in_drawio:
-            # Extract names for error reporting only
-            missing_names = {extract_vnet_name_from_id(rid) for rid in missing_in_drawio}
-            print(f"ERROR: {base_name} VNets missing in HLD: {missing_names}")
-            validation_passed = False
-        
-        if extra_in_drawio:
-            # Extract names for error reporting only
-            extra_names = {extract_vnet_name_from_id(rid) for rid in extra_in_drawio}
-            print(f"ERROR: {base_name} Extra VNets in HLD: {extra_names}")
-            validation_passed = False
+        # 2. Validate VNet resource_ids match (using resource_ids as primary keys).
+        # Set equality is checked first so the diffs are only built on mismatch.
+        if json_resource_ids != drawio_resource_ids:
+            missing_in_drawio = json_resource_ids - drawio_resource_ids
+            extra_in_drawio = drawio_resource_ids - json_resource_ids
+            
+            if missing_in_drawio:
+                # Extract names for error reporting only
+                missing_names = {extract_vnet_name_from_id(rid) for rid in missing_in_drawio}
+                print(f"ERROR: {base_name} VNets missing in HLD: {missing_names}")
+                validation_passed = False
+            
+            if extra_in_drawio:
+                # Extract names for error reporting only
+                extra_names = {extract_vnet_name_from_id(rid) for rid in extra_in_drawio}
+                print(f"ERROR: {base_name} Extra VNets in HLD: {extra_names}")
+                validation_passed = False
         
         # 3. Validate edge count matches
         if len(json_peering_relationships) != len(drawio_peering_relationships):
@@ -600,16 +648,17 @@ def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str =
             validation_passed = False
         
         # 4. Validate peering relationships match
-        missing_peerings = json_peering_relationships - drawio_peering_relationships
-        extra_peerings = drawio_peering_relationships - json_peering_relationships
-        
-        if missing_peerings:
-            print(f"ERROR: {base_name} Peerings missing in HLD: {missing_peerings}")
-            validation_passed = False
-        
-        if extra_peerings:
-            print(f"ERROR: {base_name} Extra peerings in HLD: {extra_peerings}")
-            validation_passed = False
+        if json_peering_relationships != drawio_peering_relationships:
+            missing_peerings = json_peering_relationships - drawio_peering_relationships
+            extra_peerings = drawio_peering_relationships - json_peering_relationships
+            
+            if missing_peerings:
+                print(f"ERROR: {base_name} Peerings missing in HLD: {missing_peerings}")
+                validation_passed = False
+            
+            if extra_peerings:
+                print(f"ERROR: {base_name} Extra peerings in HLD: {extra_peerings}")
+                validation_passed = False
     
     # Validate MLD file if provided
     if mld_file and os.path.exists(mld_file):
@@ -635,21 +684,23 @@ def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str =
             print(f"ERROR: {base_name} VNet count mismatch - JSON: {json_vnet_count}, MLD: {drawio_vnet_count}")
             validation_passed = False
         
-        # 2. Validate VNet resource_ids match (using resource_ids as primary keys)
-        missing_in_drawio = json_resource_ids - drawio_resource_ids
-        extra_in_drawio = drawio_resource_ids - json_resource_ids
-        
-        if missing_in_drawio:
-            # Extract names for error reporting only
-            missing_names = {extract_vnet_name_from_id(rid) for rid in missing_in_drawio}
-            print(f"ERROR: {base_name} VNets missing in MLD: {missing_names}")
-            validation_passed = False
-        
-        if extra_in_drawio:
-            # Extract names for error reporting only
-            extra_names = {extract_vnet_name_from_id(rid) for rid in extra_in_drawio}
-            print(f"ERROR: {base_name} Extra VNets in MLD: {extra_names}")
-            validation_passed = False
+        # 2. Validate VNet resource_ids match (using resource_ids as primary keys).
+        # Set equality is checked first so the diffs are only built on mismatch.
+        if json_resource_ids != drawio_resource_ids:
+            missing_in_drawio = json_resource_ids - drawio_resource_ids
+            extra_in_drawio = drawio_resource_ids - json_resource_ids
+            
+            if missing_in_drawio:
+                # Extract names for error reporting only
+                missing_names = {extract_vnet_name_from_id(rid) for rid in missing_in_drawio}
+                print(f"ERROR: {base_name} VNets missing in MLD: {missing_names}")
+                validation_passed = False
+            
+            if extra_in_drawio:
+                # Extract names for error reporting only
+                extra_names = {extract_vnet_name_from_id(rid) for rid in extra_in_drawio}
+                print(f"ERROR: {base_name} Extra VNets in MLD: {extra_names}")
+                validation_passed = False
         
         # 3. Validate edge count matches
         if len(json_peering_relationships) != len(drawio_peering_relationships):
@@ -657,16 +708,17 @@ def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str =
             validation_passed = False
         
         # 4. Validate peering relationships match
-        missing_peerings = json_peering_relationships - drawio_peering_relationships
-        extra_peerings = drawio_peering_relationships - json_peering_relationships
-        
-        if missing_peerings:
-            print(f"ERROR: {base_name} Peerings missing in MLD: {missing_peerings}")
-            validation_passed = False
-        
-        if extra_peerings:
-            print(f"ERROR: {base_name} Extra peerings in MLD: {extra_peerings}")
-            validation_passed = False
+        if json_peering_relationships != drawio_peering_relationships:
+            missing_peerings = json_peering_relationships - drawio_peering_relationships
+            extra_peerings = drawio_peering_relationships - json_peering_relationships
+            
+            if missing_peerings:
+                print(f"ERROR: {base_name} Peerings missing in MLD: {missing_peerings}")
+                validation_passed = False
+            
+            if extra_peerings:
+                print(f"ERROR: {base_name} Extra peerings in MLD: {extra_peerings}")
+                validation_passed = False
     
     # Print validation result
     if validation_passed:
@@ -683,6 +735,14 @@ def validate_topology_file(json_file: str, hld_file: str = None, mld_file: str =
     return validation_passed
 
 
+def validate_topology_file_captured(json_file: str, hld_file: str = None, mld_file: str = None) -> Tuple[bool, str]:
+    """Run validate_topology_file and return its result together with the report it printed"""
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        passed = validate_topology_file(json_file, hld_file, mld_file)
+    return passed, report.getvalue()
+
+
 def get_file_mappings() -> List[Tuple[str, str, str]]:
     """Get dynamic file mappings for JSON, HLD, and MLD files"""
     # Get the directory where this script is located
@@ -690,14 +750,20 @@ def get_file_mappings() -> List[Tuple[str, str, str]]:
     examples_dir = os.path.join(script_dir, '..', 'examples')  # This script is in utils, examples is one level up
     mappings = []
     
-    # Find all JSON files
-    json_files = [f for f in os.listdir(examples_dir) if f.endswith('.json')]
+    # One directory scan: JSON files come from the entries, and diagram existence is a
+    # set lookup instead of a stat per candidate (missing diagrams map to None)
+    with os.scandir(examples_dir) as entries:
+        file_names = {entry.name for entry in entries if entry.is_file()}
     
-    for json_file in json_files:
+    for json_file in sorted(file_names):
+        if not json_file.endswith('.json'):
+            continue
         base_name = json_file.replace('.json', '')
         json_path = os.path.join(examples_dir, json_file)
-        hld_path = os.path.join(examples_dir, f"{base_name}_hld.drawio")
-        mld_path = os.path.join(examples_dir, f"{base_name}_mld.drawio")
+        hld_name = f"{base_name}_hld.drawio"
+        mld_name = f"{base_name}_mld.drawio"
+        hld_path = os.path.join(examples_dir, hld_name) if hld_name in file_names else None
+        mld_path = os.path.join(examples_dir, mld_name) if mld_name in file_names else None
         
         mappings.append((json_path, hld_path, mld_path))
     
@@ -775,16 +841,27 @@ def main():
     
     all_valid = True
     
-    for json_file, hld_file, mld_file in file_mappings:
-        if not os.path.exists(json_file):
-            if not args.quiet:
-                print(f"ERROR: JSON file not found: {json_file}")
-            all_valid = False
-            continue
+    # Topologies are independent, so they are validated in worker processes. Each worker's
+    # report is captured and printed in file order, so the output matches a serial run.
+    sys.stdout.flush()  # Forked workers must not inherit (and re-flush) pending output
+    with ProcessPoolExecutor(max_workers=min(len(file_mappings), os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(validate_topology_file_captured, json_file, hld_file, mld_file) if os.path.exists(json_file) else None
+            for json_file, hld_file, mld_file in file_mappings
+        ]
+        
+        for (json_file, _, _), future in zip(file_mappings, futures):
+            if future is None:
+                if not args.quiet:
+                    print(f"ERROR: JSON file not found: {json_file}")
+                all_valid = False
+                continue
             
-        # Validate the topology file and its diagrams
-        if not validate_topology_file(json_file, hld_file, mld_file):
-            all_valid = False
+            # Validate the topology file and its diagrams
+            passed, report = future.result()
+            print(report, end='')
+            if not passed:
+                all_valid = False
     
     if not all_valid:
         print("VALIDATION FAILED: Some files have errors")